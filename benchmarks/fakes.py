@@ -0,0 +1,150 @@
+"""Offline stand-ins for Supabase and Redis used by the benchmarks."""
+
+import json
+import random
+import sqlite3
+import threading
+from types import SimpleNamespace
+
+FIRST_NAMES = [
+    "John", "Jake", "DJ", "Derrick", "Marcus", "Tyler", "Jalen", "Caleb", "Bryce", "Trey",
+    "Kendrick", "Malik", "Jordan", "Cameron", "Isaiah", "Elijah", "Xavier", "Devin", "Kensly", "Amari",
+]  # fmt: skip
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Davis", "Miller", "Wilson", "Moore", "Taylor",
+    "Anderson", "Thomas", "Jackson", "White", "Harris", "Martin", "Thompson", "Robinson", "Ladour-Foustin", "O'Neal",
+]  # fmt: skip
+SUFFIXES = ["", "", "", "", " Jr.", " III", ", Jr"]
+POSITIONS = ["QB", "RB", "WR", "TE", "OT", "IOL", "DL", "EDGE", "LB", "CB", "S", "ATH", "Edge", "OL"]
+STATUSES = ["committed", "signed", "enrolled", None]
+
+
+def recruits(count: int, seed: int = 0) -> list[SimpleNamespace]:
+    """Generate recruits shaped like cfb_cli's, with realistic name collisions."""
+    rng = random.Random(seed)  # noqa: S311
+    players = []
+    for i in range(count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}{i}{rng.choice(SUFFIXES)}"
+        players.append(
+            SimpleNamespace(
+                name=name,
+                position=rng.choice(POSITIONS),
+                hometown=f"Town {rng.randrange(500)}, AL",
+                stars=rng.randint(2, 5),
+                rating=round(rng.uniform(0.8, 1.0), 4),
+                status=rng.choice(STATUSES),
+                player_url=f"https://247sports.com/player/{i}",
+            )
+        )
+    return players
+
+
+class FakeSupabase:
+    """
+    SQLite-backed stand-in for the supabase-py client.
+
+    Supports the PostgREST calls db.py makes against recruits and portal
+    tables: select/eq/gt/in_/order/limit reads, upsert on (team_id,
+    entry_id) and filtered deletes. Rows round-trip through JSON like they
+    would over HTTP.
+    """
+
+    def __init__(self):
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._lock = threading.Lock()
+        self._tables: set[str] = set()
+
+    def table(self, name: str) -> "_Query":
+        with self._lock:
+            if name not in self._tables:
+                self._conn.execute(
+                    f'CREATE TABLE "{name}" (team_id TEXT, entry_id TEXT, data TEXT, PRIMARY KEY (team_id, entry_id))'
+                )
+                self._tables.add(name)
+        return _Query(self, name)
+
+
+class _Query:
+    # Table and column names are interpolated into SQL (hence the S608 noqa markers), but they only ever come from
+    # cfb_tracker's own db calls; every row value is bound as a ? parameter.
+
+    def __init__(self, client: FakeSupabase, table: str):
+        self._client = client
+        self._table = table
+        self._action = "select"
+        self._columns: list[str] | None = None
+        self._rows: list[dict] = []
+        self._where: list[tuple[str, object]] = []
+        self._order: str | None = None
+        self._limit: int | None = None
+
+    def select(self, columns: str = "*") -> "_Query":
+        self._columns = None if columns == "*" else [c.strip() for c in columns.split(",")]
+        return self
+
+    def upsert(self, rows: list[dict], on_conflict: str = "") -> "_Query":
+        self._action = "upsert"
+        self._rows = json.loads(json.dumps(rows, default=str))
+        return self
+
+    def delete(self) -> "_Query":
+        self._action = "delete"
+        return self
+
+    def eq(self, column: str, value) -> "_Query":
+        self._where.append((f"{column} = ?", value))
+        return self
+
+    def gt(self, column: str, value) -> "_Query":
+        self._where.append((f"{column} > ?", value))
+        return self
+
+    def in_(self, column: str, values: list) -> "_Query":
+        clause = f"{column} IN (SELECT value FROM json_each(?))"  # noqa: S608
+        self._where.append((clause, json.dumps(list(values))))
+        return self
+
+    def order(self, column: str) -> "_Query":
+        self._order = column
+        return self
+
+    def limit(self, count: int) -> "_Query":
+        self._limit = count
+        return self
+
+    def _sql_where(self) -> tuple[str, list]:
+        if not self._where:
+            return "", []
+        return " WHERE " + " AND ".join(clause for clause, _ in self._where), [value for _, value in self._where]
+
+    def execute(self) -> SimpleNamespace:
+        conn = self._client._conn
+        where, params = self._sql_where()
+        with self._client._lock:
+            if self._action == "upsert":
+                conn.executemany(
+                    f'INSERT OR REPLACE INTO "{self._table}" VALUES (?, ?, ?)',  # noqa: S608
+                    [(row["team_id"], row["entry_id"], json.dumps(row)) for row in self._rows],
+                )
+                return SimpleNamespace(data=self._rows)
+            if self._action == "delete":
+                conn.execute(f'DELETE FROM "{self._table}"{where}', params)  # noqa: S608
+                return SimpleNamespace(data=[])
+            sql = f'SELECT data FROM "{self._table}"{where}'  # noqa: S608
+            if self._order:
+                sql += f" ORDER BY {self._order}"
+            if self._limit is not None:
+                sql += f" LIMIT {int(self._limit)}"
+            rows = [json.loads(data) for (data,) in conn.execute(sql, params)]
+        if self._columns is not None:
+            rows = [{c: row.get(c) for c in self._columns} for row in rows]
+        return SimpleNamespace(data=json.loads(json.dumps(rows)))
+
+
+def fake_redis():
+    """An in-process Redis from fakeredis, or None when it is not installed."""
+    try:
+        import fakeredis
+    except ImportError:
+        return None
+    return fakeredis.FakeStrictRedis()
@@ -0,0 +1,223 @@
+"""
+Offline benchmarks for the sync pipeline.
+
+Drives the normalizer, sync_table, enqueue_event and the worker's message
+builder over generated rosters, against a SQLite stand-in for Supabase and
+fakeredis for RQ, and reports throughput and peak traced memory.
+
+    python benchmarks/run.py --sizes 100,1000,10000,100000
+    python benchmarks/run.py --save baseline.json
+    python benchmarks/run.py --compare baseline.json --tolerance 0.25
+
+--compare exits non-zero when any benchmark's throughput drops more than
+the tolerance below the baseline. Queue benchmarks are skipped when
+fakeredis is not installed.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+# Keep state in memory, never reach for real services and keep output readable
+os.environ.update({"STATE_PATH": ":memory:", "SUPABASE_URL": "", "REDIS_URL": "", "TEAM": "Bench Tigers"})
+logging.disable(logging.CRITICAL)
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fakes import FakeSupabase, fake_redis, recruits  # noqa: E402
+
+from cfb_tracker import db, normalizer, state  # noqa: E402
+from cfb_tracker import queue as queue_module  # noqa: E402
+from cfb_tracker.fetcher import _normalize_players, _recruit_to_dict  # noqa: E402
+from cfb_tracker.sync import sync_table  # noqa: E402
+from cfb_tracker.worker import _build_message  # noqa: E402
+
+TEAM = "Bench Tigers"
+CHANGE_RATE = 0.01
+
+# A benchmark's setup builds its input untimed and returns (prepare, run):
+# prepare runs untimed before every timed call of run
+Step = Callable[[], object]
+Benchmark = Callable[[int], tuple[Step, Step]]
+
+
+def _noop() -> None:
+    pass
+
+
+def _records(size: int) -> list[dict]:
+    return [_recruit_to_dict(r, i, pos) for r, i, pos in _normalize_players(recruits(size))]
+
+
+def _fresh_backends() -> None:
+    db._client = FakeSupabase()
+    state.reset()
+
+
+def _changed(records: list[dict]) -> list[dict]:
+    """Copy of records with CHANGE_RATE of them flipped to decommitted."""
+    step = max(1, int(1 / CHANGE_RATE))
+    return [{**r, "status": "decommitted"} if i % step == 0 else r for i, r in enumerate(records)]
+
+
+def bench_normalize_batch(size: int) -> tuple[Step, Step]:
+    players = recruits(size)
+    names, positions = [p.name for p in players], [p.position for p in players]
+
+    def run():
+        return normalizer.normalize_batch(names, positions)
+
+    return normalizer.clear_caches, run
+
+
+def bench_generate_id(size: int) -> tuple[Step, Step]:
+    names = [p.name for p in recruits(size)]
+
+    def run():
+        return [normalizer.generate_id(name) for name in names]
+
+    return normalizer.clear_caches, run
+
+
+def bench_sync_initial(size: int) -> tuple[Step, Step]:
+    records = _records(size)
+
+    def run():
+        return sync_table("recruits", records, team_id=TEAM)
+
+    return _fresh_backends, run
+
+
+def bench_sync_update(size: int) -> tuple[Step, Step]:
+    records = _records(size)
+    changed = _changed(records)
+
+    def prepare():
+        _fresh_backends()
+        sync_table("recruits", records, team_id=TEAM)
+
+    def run():
+        return sync_table("recruits", changed, team_id=TEAM)
+
+    return prepare, run
+
+
+def bench_enqueue_event(size: int) -> tuple[Step, Step]:
+    redis = fake_redis()
+    records = _records(size)
+
+    def prepare():
+        redis.flushall()
+        queue_module._queue = queue_module.Queue("social-posts", connection=redis)
+        queue_module._redis_available = True
+
+    def run():
+        return [queue_module.enqueue_event("new_player", "recruits", record, team=TEAM) for record in records]
+
+    return prepare, run
+
+
+def bench_build_message(size: int) -> tuple[Step, Step]:
+    records = _records(size)
+    payloads = [
+        queue_module.build_payload("status_change", "recruits", r, "committed", r["status"], TEAM) for r in records
+    ]
+
+    def run():
+        return [_build_message(p["event_type"], p["table"], p["team"], p["player"], p) for p in payloads]
+
+    return _noop, run
+
+
+BENCHMARKS: dict[str, Benchmark] = {
+    "normalizer.normalize_batch": bench_normalize_batch,
+    "normalizer.generate_id": bench_generate_id,
+    "sync.initial": bench_sync_initial,
+    "sync.update": bench_sync_update,
+    "queue.enqueue_event": bench_enqueue_event,
+    "worker.build_message": bench_build_message,
+}
+NEEDS_REDIS = {"queue.enqueue_event"}
+
+
+def measure(benchmark: Benchmark, size: int, repeat: int) -> dict:
+    """Best-of-repeat wall time, then one traced run for peak memory."""
+    prepare, run = benchmark(size)
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        prepare()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    prepare()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": round(best, 6),
+        "per_second": round(size / best, 1) if best else None,
+        "peak_mib": round(peak / 2**20, 2),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Benchmarks whose throughput fell more than tolerance below the baseline."""
+    regressions = []
+    for key, result in results.items():
+        before = baseline.get(key, {}).get("per_second")
+        if before and result["per_second"] < before * (1 - tolerance):
+            regressions.append(f"{key}: {result['per_second']:,.0f}/s vs baseline {before:,.0f}/s")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,10000", help="comma-separated roster sizes")
+    parser.add_argument("--only", help="comma-separated benchmark names (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark; the best is kept")
+    parser.add_argument("--save", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON from --save to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed throughput drop (fraction)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    has_redis = fake_redis() is not None
+
+    results: dict[str, dict] = {}
+    print(f"{'benchmark':<28} {'size':>8} {'seconds':>10} {'items/s':>12} {'peak MiB':>9}")
+    for name in names:
+        if name in NEEDS_REDIS and not has_redis:
+            print(f"{name:<28} skipped (pip install fakeredis)")
+            continue
+        for size in sizes:
+            result = measure(BENCHMARKS[name], size, args.repeat)
+            results[f"{name}[{size}]"] = result
+            print(
+                f"{name:<28} {size:>8} {result['seconds']:>10.4f} {result['per_second']:>12,.0f} "
+                f"{result['peak_mib']:>9.2f}"
+            )
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2) + "\n")
+    if args.compare:
+        regressions = compare(results, json.loads(Path(args.compare).read_text()), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,177 @@
+"""Hold social post events per team so flips cancel out and bursts become digests."""
+
+import json
+import logging
+from datetime import timedelta
+
+from redis.exceptions import WatchError
+from rq import Queue
+
+from cfb_tracker.config import config
+
+logger = logging.getLogger(__name__)
+
+FLUSH_FUNC = "cfb_tracker.coalesce.flush_team"
+
+
+def _buffer_key(team: str) -> str:
+    return f"cfb-tracker:coalesce:{team}"
+
+
+def _scheduled_key(team: str) -> str:
+    return f"cfb-tracker:coalesce-scheduled:{team}"
+
+
+def _slot(payload: dict) -> str:
+    """Buffer slot of an event: one per player, with field updates held apart from status events."""
+    kind = "update" if payload["event_type"] == "player_updated" else "status"
+    return f"{payload['table']}:{payload['player'].get('entry_id')}:{kind}"
+
+
+def merge(pending: dict | None, incoming: dict) -> dict | None:
+    """
+    Net effect of a held event followed by a newer one for the same player.
+
+    A status flip back to where it started, a player added then removed
+    (or removed then re-listed) and field changes that revert all cancel
+    out. A new player whose status changes is still one new player.
+    Otherwise the newer event wins.
+
+    Returns:
+        dict | None: Event to hold, or None when nothing is left to post
+    """
+    if pending is None:
+        return incoming
+    first, last = pending["event_type"], incoming["event_type"]
+    if {first, last} == {"new_player", "player_removed"}:
+        return None
+    if first == "new_player" and last == "status_change":
+        return {**pending, "player": incoming["player"], "status": incoming.get("new_status")}
+    if first == last == "status_change":
+        if pending.get("old_status") == incoming.get("new_status"):
+            return None
+        return {**incoming, "old_status": pending.get("old_status")}
+    if first == last == "player_updated":
+        changes = dict(pending.get("changes") or {})
+        for field, change in (incoming.get("changes") or {}).items():
+            old = changes[field]["old"] if field in changes else change["old"]
+            if old == change["new"]:
+                changes.pop(field, None)
+            else:
+                changes[field] = {"old": old, "new": change["new"]}
+        return {**incoming, "changes": changes} if changes else None
+    return incoming
+
+
+def _merge_into_buffer(connection, key: str, events: list[dict]) -> list[str]:
+    """
+    Merge events into a team's buffer as one read-modify-write.
+
+    The buffer is WATCHed while the held events are read and merged, so a
+    take() that lands in between aborts the write and the merge is retried
+    against the emptied buffer instead of writing taken events back.
+
+    Returns:
+        list[str]: Slots whose events cancelled out
+    """
+    slots = list(dict.fromkeys(_slot(event) for event in events))
+    with connection.pipeline() as pipe:
+        while True:
+            try:
+                pipe.watch(key)
+                raw = pipe.hmget(key, slots)
+                held = {slot: json.loads(value) if value else None for slot, value in zip(slots, raw)}
+                for event in events:
+                    held[_slot(event)] = merge(held[_slot(event)], event)
+
+                updates = {slot: json.dumps(event, default=str) for slot, event in held.items() if event is not None}
+                cancelled = [slot for slot, event in held.items() if event is None]
+                pipe.multi()
+                if updates:
+                    pipe.hset(key, mapping=updates)
+                if cancelled:
+                    pipe.hdel(key, *cancelled)
+                pipe.execute()
+            except WatchError:
+                logger.debug("Coalesce buffer changed while merging - retrying", extra={"key": key})
+                continue
+            return cancelled
+
+
+def hold(flush_queue: Queue, payloads: list[dict]) -> None:
+    """
+    Buffer events in Redis until their team's coalescing window closes.
+
+    Events are merged per player as they arrive, atomically with respect to
+    take(). The first event held for a team schedules flush_team on
+    flush_queue COALESCE_WINDOW_SECONDS later; workers must run with
+    --with-scheduler.
+
+    Args:
+        flush_queue: Queue whose connection holds the buffer and that runs the flush job
+        payloads: Built social post payloads
+    """
+    connection = flush_queue.connection
+    by_team: dict[str, list[dict]] = {}
+    for payload in payloads:
+        by_team.setdefault(payload["team"], []).append(payload)
+
+    for team, events in by_team.items():
+        cancelled = _merge_into_buffer(connection, _buffer_key(team), events)
+
+        window = config.COALESCE_WINDOW_SECONDS
+        # The flag outlives the window so a lost flush job is rescheduled eventually
+        if connection.set(_scheduled_key(team), 1, nx=True, ex=window * 2 + 60):
+            flush_queue.enqueue_in(timedelta(seconds=window), FLUSH_FUNC, team, job_timeout="5m")
+        logger.info(
+            "Holding social post events",
+            extra={"team": team, "events": len(events), "cancelled": len(cancelled)},
+        )
+
+
+def take(connection, team: str) -> list[dict]:
+    """Atomically remove and return every event held for a team."""
+    pipe = connection.pipeline()
+    pipe.hgetall(_buffer_key(team))
+    pipe.delete(_buffer_key(team))
+    pipe.delete(_scheduled_key(team))
+    raw, _, _ = pipe.execute()
+    return [json.loads(value) for value in raw.values()]
+
+
+def digest_payload(team: str, payloads: list[dict]) -> dict:
+    """Payload of a single digest post covering several of a team's events."""
+    return {"event_type": "digest", "table": "digest", "team": team, "events": payloads}
+
+
+def flush_team(team: str) -> dict:
+    """
+    RQ job: release a team's held events once its coalescing window closes.
+
+    COALESCE_DIGEST_MIN_EVENTS or more events go out as one digest job,
+    fewer as individual jobs. Events that fail to enqueue are held again.
+
+    Returns:
+        dict: {"released": count, "digest": whether a digest was sent}
+    """
+    from cfb_tracker import queue
+
+    if not queue.is_available() and not queue.init_queue():
+        raise RuntimeError("Redis unavailable - cannot release coalesced events")
+
+    payloads = sorted(take(queue.flush_queue().connection, team), key=queue.priority_rank)
+    if not payloads:
+        return {"released": 0, "digest": False}
+
+    digest = 0 < config.COALESCE_DIGEST_MIN_EVENTS <= len(payloads)
+    batch = queue.EventBatch(coalesce=False)
+    for payload in [digest_payload(team, payloads)] if digest else payloads:
+        batch.add_payload(payload)
+    results = batch.flush()
+
+    if not all(results):
+        failed = payloads if digest else [p for p, ok in zip(payloads, results) if not ok]
+        logger.warning("Failed to release coalesced events - holding them again", extra={"team": team})
+        hold(queue.flush_queue(), failed)
+    logger.info("Released coalesced events", extra={"team": team, "events": len(payloads), "digest": digest})
+    return {"released": len(payloads), "digest": digest}
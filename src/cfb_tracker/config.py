@@ -10,17 +10,96 @@ class Config(BaseSettings):
     SUPABASE_KEY: str | None = None
     RECRUITS_TABLE: str = "recruits"
     PORTAL_TABLE: str = "portal"
+    # Rows per read request - must not exceed the PostgREST max-rows setting
+    DB_PAGE_SIZE: int = 1000
+    # Write batching - upserts split by rows and JSON bytes, deletes by id count
+    # (keeps the in_() filter under URL limits), chunks sent concurrently
+    DB_WRITE_CHUNK_ROWS: int = 500
+    DB_WRITE_CHUNK_BYTES: int = 1_000_000
+    DB_DELETE_CHUNK_SIZE: int = 200
+    DB_WRITE_CONCURRENCY: int = 4
+    DB_WRITE_RETRIES: int = 3
+    DB_RETRY_BACKOFF_SECONDS: float = 0.5
+    # Write only the changed columns of updated rows instead of full records
+    SYNC_CHANGED_COLUMNS_ONLY: bool = False
+    # Diff and write each table in one transaction via the sync_team_table RPC
+    # (supabase/migrations) instead of read + upsert + delete round-trips.
+    # Ignored when OUTBOX_ENABLED is set
+    SYNC_VIA_RPC: bool = False
+    # Write events to the social_outbox table in the same transaction as the
+    # sync (apply_sync RPC) and relay them to Redis after each cycle. Takes
+    # precedence over SYNC_VIA_RPC
+    OUTBOX_ENABLED: bool = False
+    OUTBOX_BATCH_SIZE: int = 500
     # 247Sports config - required for sync service, optional for worker
     TEAM_247_NAME: str | None = None
     TEAM_247_YEAR: int | None = None
     # Redis and team - needed by both sync and worker
     REDIS_URL: str | None = None
     TEAM: str | None = None
+    # Comma-separated tracked fields whose change enqueues a social event:
+    # "status" sends status_change, any other field sends player_updated
+    EVENT_FIELDS: str = "status"
+    # Drop repeat social post events seen within this window (0 disables)
+    EVENT_DEDUP_TTL_SECONDS: int = 21600
+    # Recruit events at or above these go to the high-priority queue lane, at or
+    # below PRIORITY_LOW_STARS to the low one (removals and updates are always low)
+    PRIORITY_HIGH_STARS: int = 4
+    PRIORITY_HIGH_RATING: float = 0.89
+    PRIORITY_LOW_STARS: int = 2
+    # Hold events per team this long before posting so flips cancel out (0 posts
+    # immediately); a window with at least COALESCE_DIGEST_MIN_EVENTS events is
+    # posted as one digest thread (0 never digests)
+    COALESCE_WINDOW_SECONDS: int = 0
+    COALESCE_DIGEST_MIN_EVENTS: int = 3
+    # Multi-team mode - JSON list of teams, inline or in a file (overrides TEAM)
+    TEAMS: str | None = None
+    TEAMS_FILE: str | None = None
+    # Max concurrent 247Sports page fetches - keep low to avoid throttling
+    FETCH_CONCURRENCY: int = 2
+    # Each pooled scraper is relaunched after this many fetches to cap browser memory
+    SCRAPER_MAX_USES: int = 50
+    # Run the cycle on asyncio (async Supabase client) instead of threads
+    ASYNC_IO: bool = False
+    # Local SQLite state (fingerprints, snapshots) - use a persistent volume path
+    # to skip unchanged pages across cron runs; ":memory:" lasts one process
+    STATE_PATH: str = ":memory:"
+    # Diff against the local snapshot, re-reading Supabase at most this often (0 = every run)
+    SNAPSHOT_RECONCILE_SECONDS: int = 3600
+    # Per-stage cycle metrics (always logged) - optionally rewrite this file with
+    # Prometheus text each cycle (node_exporter textfile collector) and/or emit
+    # OpenTelemetry spans (needs opentelemetry-api installed and configured)
+    METRICS_PROMETHEUS_FILE: str | None = None
+    METRICS_OTEL: bool = False
+    # Daemon mode - stay resident and run a cycle every interval (+/- jitter)
+    DAEMON: bool = False
+    CYCLE_INTERVAL_SECONDS: int = 600
+    CYCLE_JITTER_SECONDS: int = 30
+    # Adaptive polling (daemon) - each team/table interval shrinks when syncs see
+    # changes and backs off when they don't, within these bounds
+    POLL_MIN_SECONDS: int = 120
+    POLL_MAX_SECONDS: int = 3600
+    # Comma-separated [table@]MM-DD:MM-DD ranges (signing periods, portal windows)
+    # polled at most POLL_HOT_MAX_SECONDS apart
+    HOT_WINDOWS: str | None = None
+    POLL_HOT_MAX_SECONDS: int = 300
     # X (Twitter) API credentials - all optional
     X_API_KEY: str | None = None
     X_API_SECRET: str | None = None
     X_ACCESS_TOKEN: str | None = None
     X_ACCESS_TOKEN_SECRET: str | None = None
+    # X write caps enforced across all workers by a Redis token bucket (needs
+    # REDIS_URL; 0 disables a window) - defaults fit the Free tier, raise for paid tiers
+    X_POSTS_PER_15_MINUTES: int = 100
+    X_POSTS_PER_24_HOURS: int = 17
+    # A job waits in-process for a slot up to this long, otherwise it is rescheduled
+    X_RATE_LIMIT_MAX_WAIT_SECONDS: float = 5
+    # Keep-alive HTTP session reused by every post a worker makes
+    X_HTTP_POOL_SIZE: int = 4
+    X_HTTP_CONNECT_TIMEOUT_SECONDS: float = 5
+    X_HTTP_READ_TIMEOUT_SECONDS: float = 30
+    # Retries for connections that fail to open or are reset before X answers
+    X_HTTP_CONNECT_RETRIES: int = 2
 
 
 config = Config()
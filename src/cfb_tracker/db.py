@@ -1,8 +1,24 @@
-from supabase import create_client
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import TypeVar
+
+from supabase import acreate_client, create_client
 
 from cfb_tracker.config import config
+from cfb_tracker.metrics import span
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 _client = None
+_async_client = None
 
 
 def get_client():
@@ -12,36 +28,360 @@ def get_client():
     return _client
 
 
+async def get_async_client():
+    """Async Supabase client, bound to the event loop that first created it."""
+    global _async_client
+    if _async_client is None:
+        _async_client = await acreate_client(config.SUPABASE_URL, config.SUPABASE_KEY)
+    return _async_client
+
+
+def reset_async_client() -> None:
+    """Drop the async client so the next event loop creates its own."""
+    global _async_client
+    _async_client = None
+
+
 def get_team_id() -> str:
-    """Get the current team_id from config."""
+    """Get the default team_id from config, used when no team is passed."""
     if not config.TEAM:
         raise ValueError("TEAM environment variable is required")
     return config.TEAM
 
 
-def get_all_records(table: str) -> list[dict]:
-    """Fetch all records for the current team only."""
-    team_id = get_team_id()
-    response = get_client().table(table).select("*").eq("team_id", team_id).execute()
-    return response.data
+def iter_records(
+    table: str,
+    team_id: str | None = None,
+    columns: str = "*",
+    page_size: int | None = None,
+) -> Iterator[list[dict]]:
+    """
+    Yield a single team's records page by page, keyset-paginated on entry_id.
+
+    Args:
+        table: Table name
+        team_id: Team to read (defaults to the configured TEAM)
+        columns: Comma-separated column projection passed to select()
+        page_size: Rows per request; must not exceed PostgREST's max-rows
+    """
+    team_id = team_id or get_team_id()
+    page_size = page_size or config.DB_PAGE_SIZE
+    last_entry_id = None
+    while True:
+        query = get_client().table(table).select(columns).eq("team_id", team_id)
+        if last_entry_id is not None:
+            query = query.gt("entry_id", last_entry_id)
+        with span("db.read") as timing:
+            rows = query.order("entry_id").limit(page_size).execute().data
+            timing.add(rows=len(rows))
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        last_entry_id = rows[-1]["entry_id"]
+
+
+def get_all_records(table: str, team_id: str | None = None, columns: str = "*") -> list[dict]:
+    """Fetch all records for a single team only, following pagination."""
+    return [row for page in iter_records(table, team_id=team_id, columns=columns) for row in page]
+
+
+def _sized_chunks(records: list[dict], max_rows: int, max_bytes: int) -> list[tuple[list[dict], int]]:
+    """Split records into chunks bounded by row count and serialized size, paired with that size."""
+    chunks: list[tuple[list[dict], int]] = []
+    current: list[dict] = []
+    current_bytes = 0
+    for record in records:
+        size = len(json.dumps(record, default=str))
+        if current and (len(current) >= max_rows or current_bytes + size > max_bytes):
+            chunks.append((current, current_bytes))
+            current, current_bytes = [], 0
+        current.append(record)
+        current_bytes += size
+    if current:
+        chunks.append((current, current_bytes))
+    return chunks
+
+
+def _chunk_records(records: list[dict], max_rows: int, max_bytes: int) -> list[list[dict]]:
+    """Split records into chunks bounded by row count and serialized size."""
+    return [chunk for chunk, _ in _sized_chunks(records, max_rows, max_bytes)]
+
+
+def _with_retry(operation: Callable[[], T], description: str) -> T:
+    """Run a write, retrying with exponential backoff before giving up; returns its result."""
+    attempts = max(1, config.DB_WRITE_RETRIES)
+    for attempt in range(1, attempts):
+        try:
+            return operation()
+        except Exception:
+            delay = config.DB_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+            logger.warning(
+                f"{description} failed, retrying",
+                extra={"attempt": attempt, "retry_in_seconds": delay},
+                exc_info=True,
+            )
+            time.sleep(delay)
+    return operation()
+
+
+def _run_chunks(write_chunk: Callable[[T], None], chunks: list[T]) -> None:
+    """Dispatch chunks over a bounded pool, re-raising the first failure."""
+    if len(chunks) == 1:
+        write_chunk(chunks[0])
+        return
+    workers = max(1, min(len(chunks), config.DB_WRITE_CONCURRENCY))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db-write") as pool:
+        futures = [pool.submit(write_chunk, chunk) for chunk in chunks]
+        for future in futures:
+            future.result()
 
 
-def upsert_records(table: str, records: list[dict]) -> None:
-    """Upsert records with team_id, using composite key for conflict resolution."""
+def upsert_records(table: str, records: list[dict], team_id: str | None = None) -> None:
+    """Upsert records with team_id in size-bounded chunks, keyed on (team_id, entry_id)."""
     if not records:
         return
-    team_id = get_team_id()
+    team_id = team_id or get_team_id()
     records_with_team = [{**record, "team_id": team_id} for record in records]
-    get_client().table(table).upsert(
-        records_with_team, on_conflict="team_id,entry_id"
-    ).execute()
+
+    def write_chunk(sized: tuple[list[dict], int]) -> None:
+        chunk, nbytes = sized
+        with span("db.upsert", rows=len(chunk), nbytes=nbytes):
+            _with_retry(
+                lambda: get_client().table(table).upsert(chunk, on_conflict="team_id,entry_id").execute(),
+                f"Upsert of {len(chunk)} {table} records",
+            )
+
+    _run_chunks(
+        write_chunk,
+        _sized_chunks(records_with_team, config.DB_WRITE_CHUNK_ROWS, config.DB_WRITE_CHUNK_BYTES),
+    )
+
+
+def delete_records(table: str, ids: list[str], team_id: str | None = None) -> None:
+    """Delete records by entry_id in chunks, scoped to a single team only."""
+    if not ids:
+        return
+    team_id = team_id or get_team_id()
+
+    def write_chunk(chunk: list[str]) -> None:
+        with span("db.delete", rows=len(chunk)):
+            _with_retry(
+                lambda: get_client().table(table).delete().eq("team_id", team_id).in_("entry_id", chunk).execute(),
+                f"Delete of {len(chunk)} {table} records",
+            )
+
+    size = max(1, config.DB_DELETE_CHUNK_SIZE)
+    _run_chunks(write_chunk, [ids[i : i + size] for i in range(0, len(ids), size)])
+
+
+# ============================================================================
+# Asyncio variants - same semantics as the blocking functions above
+# ============================================================================
+
+
+async def async_get_all_records(table: str, team_id: str | None = None, columns: str = "*") -> list[dict]:
+    """Fetch all records for a single team only, following keyset pagination."""
+    team_id = team_id or get_team_id()
+    client = await get_async_client()
+    page_size = config.DB_PAGE_SIZE
+    records: list[dict] = []
+    last_entry_id = None
+    while True:
+        query = client.table(table).select(columns).eq("team_id", team_id)
+        if last_entry_id is not None:
+            query = query.gt("entry_id", last_entry_id)
+        with span("db.read") as timing:
+            rows = (await query.order("entry_id").limit(page_size).execute()).data
+            timing.add(rows=len(rows))
+        records.extend(rows)
+        if len(rows) < page_size:
+            return records
+        last_entry_id = rows[-1]["entry_id"]
+
+
+async def _async_with_retry(operation: Callable[[], Awaitable[T]], description: str) -> T:
+    """Await a write, retrying with exponential backoff before giving up; returns its result."""
+    attempts = max(1, config.DB_WRITE_RETRIES)
+    for attempt in range(1, attempts):
+        try:
+            return await operation()
+        except Exception:
+            delay = config.DB_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+            logger.warning(
+                f"{description} failed, retrying",
+                extra={"attempt": attempt, "retry_in_seconds": delay},
+                exc_info=True,
+            )
+            await asyncio.sleep(delay)
+    return await operation()
+
+
+async def _async_run_chunks(write_chunk: Callable[[T], Awaitable[None]], chunks: list[T]) -> None:
+    """Run chunk writes concurrently, at most DB_WRITE_CONCURRENCY at a time."""
+    semaphore = asyncio.Semaphore(max(1, config.DB_WRITE_CONCURRENCY))
+
+    async def bounded(chunk: T) -> None:
+        async with semaphore:
+            await write_chunk(chunk)
+
+    await asyncio.gather(*(bounded(chunk) for chunk in chunks))
+
+
+async def async_upsert_records(table: str, records: list[dict], team_id: str | None = None) -> None:
+    """Upsert records with team_id in size-bounded chunks, keyed on (team_id, entry_id)."""
+    if not records:
+        return
+    team_id = team_id or get_team_id()
+    client = await get_async_client()
+    records_with_team = [{**record, "team_id": team_id} for record in records]
+
+    async def write_chunk(sized: tuple[list[dict], int]) -> None:
+        chunk, nbytes = sized
+        with span("db.upsert", rows=len(chunk), nbytes=nbytes):
+            await _async_with_retry(
+                lambda: client.table(table).upsert(chunk, on_conflict="team_id,entry_id").execute(),
+                f"Upsert of {len(chunk)} {table} records",
+            )
+
+    await _async_run_chunks(
+        write_chunk,
+        _sized_chunks(records_with_team, config.DB_WRITE_CHUNK_ROWS, config.DB_WRITE_CHUNK_BYTES),
+    )
+
+
+async def async_delete_records(table: str, ids: list[str], team_id: str | None = None) -> None:
+    """Delete records by entry_id in chunks, scoped to a single team only."""
+    if not ids:
+        return
+    team_id = team_id or get_team_id()
+    client = await get_async_client()
+
+    async def write_chunk(chunk: list[str]) -> None:
+        with span("db.delete", rows=len(chunk)):
+            await _async_with_retry(
+                lambda: client.table(table).delete().eq("team_id", team_id).in_("entry_id", chunk).execute(),
+                f"Delete of {len(chunk)} {table} records",
+            )
+
+    size = max(1, config.DB_DELETE_CHUNK_SIZE)
+    await _async_run_chunks(write_chunk, [ids[i : i + size] for i in range(0, len(ids), size)])
+
+
+SYNC_RPC = "sync_team_table"
+
+
+def _sync_rpc_params(table: str, records: list[dict], team_id: str) -> dict:
+    # One request id per sync, sent on every retry: if an attempt committed but
+    # its response was lost, the function returns that attempt's result rather
+    # than re-diffing against its own writes and reporting no changes
+    return {"p_table": table, "p_team_id": team_id, "p_records": records, "p_request_id": uuid.uuid4().hex}
+
+
+def sync_via_rpc(table: str, records: list[dict], team_id: str | None = None) -> dict:
+    """
+    Sync a team's table server-side in one transaction via the sync_team_table RPC.
+
+    The function upserts the records whose content_hash differs from the
+    stored row, deletes the team's rows missing from records, and reports both.
+    Retries reuse the request id, so a retry after a lost response returns the
+    committed result.
+
+    Returns:
+        dict: {"upserted": [{"entry_id", "old"}], "deleted": [row, ...]}, where
+            "old" is the replaced row or None for new records
+    """
+    params = _sync_rpc_params(table, records, team_id or get_team_id())
+    with span("db.sync_rpc", rows=len(records)):
+        response = _with_retry(
+            lambda: get_client().rpc(SYNC_RPC, params).execute(),
+            f"Sync RPC for {len(records)} {table} records",
+        )
+    return response.data
+
+
+async def async_sync_via_rpc(table: str, records: list[dict], team_id: str | None = None) -> dict:
+    """Asyncio variant of sync_via_rpc."""
+    params = _sync_rpc_params(table, records, team_id or get_team_id())
+    client = await get_async_client()
+    with span("db.sync_rpc", rows=len(records)):
+        response = await _async_with_retry(
+            lambda: client.rpc(SYNC_RPC, params).execute(),
+            f"Sync RPC for {len(records)} {table} records",
+        )
+    return response.data
+
+
+APPLY_SYNC_RPC = "apply_sync"
+OUTBOX_TABLE = "social_outbox"
+
+
+def _apply_sync_params(
+    table: str, records: list[dict], delete_ids: list[str], events: list[dict], team_id: str
+) -> dict:
+    return {
+        "p_table": table,
+        "p_team_id": team_id,
+        "p_upserts": records,
+        "p_delete_ids": delete_ids,
+        "p_events": events,
+    }
+
+
+def apply_sync(
+    table: str, records: list[dict], delete_ids: list[str], events: list[dict], team_id: str | None = None
+) -> None:
+    """
+    Upsert, delete and write outbox events for a team's table in one transaction.
+
+    Args:
+        table: Table to write
+        records: Full records to upsert, all with the same keys
+        delete_ids: entry_ids to delete
+        events: Outbox rows as {"event_key", "payload"}; pending duplicates are ignored
+        team_id: Team the rows belong to (defaults to the configured TEAM)
+    """
+    params = _apply_sync_params(table, records, delete_ids, events, team_id or get_team_id())
+    with span("db.apply_sync", rows=len(records) + len(delete_ids)):
+        _with_retry(
+            lambda: get_client().rpc(APPLY_SYNC_RPC, params).execute(),
+            f"Outbox sync of {len(records)} upserts, {len(delete_ids)} deletes for {table}",
+        )
+
+
+async def async_apply_sync(
+    table: str, records: list[dict], delete_ids: list[str], events: list[dict], team_id: str | None = None
+) -> None:
+    """Asyncio variant of apply_sync."""
+    params = _apply_sync_params(table, records, delete_ids, events, team_id or get_team_id())
+    client = await get_async_client()
+    with span("db.apply_sync", rows=len(records) + len(delete_ids)):
+        await _async_with_retry(
+            lambda: client.rpc(APPLY_SYNC_RPC, params).execute(),
+            f"Outbox sync of {len(records)} upserts, {len(delete_ids)} deletes for {table}",
+        )
+
+
+def fetch_outbox(limit: int) -> list[dict]:
+    """Oldest outbox events not yet handed to the queue, as {"id", "payload"} rows."""
+    response = (
+        get_client()
+        .table(OUTBOX_TABLE)
+        .select("id,payload")
+        .is_("enqueued_at", "null")
+        .order("id")
+        .limit(limit)
+        .execute()
+    )
+    return response.data
 
 
-def delete_records(table: str, ids: list[str]) -> None:
-    """Delete records by entry_id, scoped to current team only."""
+def mark_outbox_enqueued(ids: list[int]) -> None:
+    """Stamp outbox events as handed to the queue."""
     if not ids:
         return
-    team_id = get_team_id()
-    get_client().table(table).delete().eq("team_id", team_id).in_(
-        "entry_id", ids
-    ).execute()
+    enqueued_at = datetime.now(timezone.utc).isoformat()
+    _with_retry(
+        lambda: get_client().table(OUTBOX_TABLE).update({"enqueued_at": enqueued_at}).in_("id", ids).execute(),
+        f"Marking {len(ids)} outbox events enqueued",
+    )
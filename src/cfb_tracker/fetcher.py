@@ -1,12 +1,24 @@
+import asyncio
+import hashlib
+import json
 import logging
+import queue
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from typing import Any, TypeVar
 
 from cfb_cli import get_scraper
 
 from cfb_tracker.config import config
-from cfb_tracker.normalizer import generate_id, normalize_position
+from cfb_tracker.metrics import span
+from cfb_tracker.normalizer import generate_id, normalize_batch, normalize_position
+from cfb_tracker.teams import Team
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 def _status_to_str(status) -> str | None:
     """Convert status enum to string, or return None."""
@@ -15,11 +27,11 @@ def _status_to_str(status) -> str | None:
     return str(status.value) if hasattr(status, "value") else str(status)
 
 
-def _recruit_to_dict(recruit) -> dict:
+def _recruit_to_dict(recruit, entry_id: str | None = None, position: str | None = None) -> dict:
     return {
-        "entry_id": generate_id(recruit.name),
+        "entry_id": entry_id or generate_id(recruit.name),
         "name": recruit.name.strip(),
-        "position": normalize_position(recruit.position),
+        "position": position or normalize_position(recruit.position),
         "hometown": recruit.hometown,
         "stars": recruit.stars,
         "rating": recruit.rating,
@@ -29,11 +41,11 @@ def _recruit_to_dict(recruit) -> dict:
     }
 
 
-def _portal_to_dict(player, direction: str) -> dict:
+def _portal_to_dict(player, direction: str, entry_id: str | None = None, position: str | None = None) -> dict:
     return {
-        "entry_id": generate_id(player.name),
+        "entry_id": entry_id or generate_id(player.name),
         "name": player.name.strip(),
-        "position": normalize_position(player.position),
+        "position": position or normalize_position(player.position),
         "direction": direction,
         "source_school": getattr(player, "source_school", None),
         "status": _status_to_str(getattr(player, "status", None)),
@@ -42,33 +54,199 @@ def _portal_to_dict(player, direction: str) -> dict:
     }
 
 
-def fetch_recruits() -> list[dict]:
-    """Fetch recruit data from 247Sports."""
+def _normalize_players(players: list) -> Iterator[tuple]:
+    """Pair each player with its batch-generated entry_id and normalized position."""
+    ids, positions = normalize_batch([p.name for p in players], [p.position for p in players])
+    return zip(players, ids, positions)
+
+
+def fingerprint(records: list[dict]) -> str:
+    """Content fingerprint of a fetched payload, independent of page order."""
+    ordered = sorted(records, key=lambda r: r["entry_id"])
+    payload = json.dumps(ordered, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def create_scraper():
+    """Create a headless 247Sports scraper that can be shared across teams."""
+    return get_scraper("247sports", headless=True)
+
+
+def _close_scraper(scraper) -> None:
+    """Release a scraper's browser resources if it exposes a close hook."""
+    close = getattr(scraper, "close", None)
+    if close is None:
+        return
+    try:
+        close()
+    except Exception:
+        logger.warning("Failed to close scraper", exc_info=True)
+
+
+class ScraperPool:
+    """
+    Long-lived scraper threads, each owning one headless scraper.
+
+    Playwright's sync API binds a browser to the thread that launched it, so
+    a scraper never leaves its thread: callers hand work to run(), which
+    executes it on one of at most `size` pool threads. Each thread launches
+    its scraper lazily, reuses it across fetches and cycles, relaunches it
+    after `max_uses` fetches or a failed fetch, and closes it on shutdown.
+    """
+
+    def __init__(self, size: int, max_uses: int):
+        self._size = max(1, size)
+        self._max_uses = max(1, max_uses)
+        self._tasks: queue.Queue = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._pending = 0
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def run(self, fn: Callable[[Any], T]) -> T:
+        """Run fn(scraper) on a pool thread and return its result, re-raising its exception."""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Scraper pool is closed")
+            self._pending += 1
+            # Only start another thread (and so another browser) when every thread is busy
+            if self._pending > len(self._threads) and len(self._threads) < self._size:
+                thread = threading.Thread(target=self._work, name=f"scraper-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._tasks.put((fn, future))
+        return future.result()
+
+    def _launch(self):
+        with span("fetch.scraper_launch"):
+            scraper = create_scraper()
+        with self._lock:
+            self._created += 1
+        logger.info("Launched pooled scraper", extra={"scrapers_launched": self._created})
+        return scraper
+
+    def _finish(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _work(self) -> None:
+        scraper, uses = None, 0
+        while (task := self._tasks.get()) is not None:
+            fn, future = task
+            try:
+                if scraper is None:
+                    scraper = self._launch()
+                result = fn(scraper)
+            except BaseException as e:
+                if scraper is not None:
+                    _close_scraper(scraper)
+                scraper, uses = None, 0
+                self._finish()
+                future.set_exception(e)
+                continue
+            uses += 1
+            if uses >= self._max_uses:
+                _close_scraper(scraper)
+                scraper, uses = None, 0
+            self._finish()
+            future.set_result(result)
+        if scraper is not None:
+            _close_scraper(scraper)
+
+    def close(self) -> None:
+        """Finish queued work, then close every scraper on the thread that launched it."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads = list(self._threads)
+        for _ in threads:
+            self._tasks.put(None)
+        for thread in threads:
+            thread.join()
+
+
+_pool: ScraperPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_scraper_pool() -> ScraperPool:
+    """Return the process-wide scraper pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ScraperPool(size=config.FETCH_CONCURRENCY, max_uses=config.SCRAPER_MAX_USES)
+        return _pool
+
+
+def close_scraper_pool() -> None:
+    """Tear down the process-wide scraper pool and its browsers."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+def _scrape(fn: Callable[[Any], T], scraper=None) -> T:
+    """Run fn with the caller's scraper, or on one of the shared pool's scraper threads."""
+    if scraper is not None:
+        return fn(scraper)
+    return get_scraper_pool().run(fn)
+
+
+def _team_247(team: Team | None) -> tuple[str | None, int | None]:
+    """Return the 247Sports name and year for a team, defaulting to config."""
+    if team is None:
+        return config.TEAM_247_NAME, config.TEAM_247_YEAR
+    return team.name_247, team.year
+
+
+def fetch_recruits(team: Team | None = None, scraper=None) -> list[dict]:
+    """Fetch recruit data from 247Sports using scraper, or a pooled one if omitted."""
+    name_247, year = _team_247(team)
     try:
-        scraper = get_scraper("247sports", headless=True)
-        data = scraper.fetch_recruit_data(config.TEAM_247_NAME, config.TEAM_247_YEAR)
-        records = [_recruit_to_dict(r) for r in data.recruits]
-        logger.info(f"Fetched {len(records)} recruits from 247Sports")
+        with span("fetch.recruits") as timing:
+            data = _scrape(lambda active: active.fetch_recruit_data(name_247, year), scraper)
+            timing.add(rows=len(data.recruits))
+        with span("fetch.normalize", rows=len(data.recruits)):
+            records = [_recruit_to_dict(r, i, pos) for r, i, pos in _normalize_players(data.recruits)]
+        logger.info(f"Fetched {len(records)} recruits from 247Sports", extra={"team_247_name": name_247})
     except Exception:
-        logger.exception("Failed to fetch recruits from 247Sports")
+        logger.exception("Failed to fetch recruits from 247Sports", extra={"team_247_name": name_247})
         return []
     else:
         return records
 
 
-def fetch_portal() -> list[dict]:
-    """Fetch transfer portal data from 247Sports."""
+def fetch_portal(team: Team | None = None, scraper=None) -> list[dict]:
+    """Fetch transfer portal data from 247Sports using scraper, or a pooled one if omitted."""
+    name_247, year = _team_247(team)
     try:
-        scraper = get_scraper("247sports", headless=True)
-        data = scraper.fetch_portal_data(config.TEAM_247_NAME, config.TEAM_247_YEAR)
-        records = []
-        for p in data.incoming:
-            records.append(_portal_to_dict(p, "incoming"))
-        for p in data.outgoing:
-            records.append(_portal_to_dict(p, "outgoing"))
-        logger.info(f"Fetched {len(data.incoming)} incoming, {len(data.outgoing)} outgoing from 247Sports")
+        with span("fetch.portal") as timing:
+            data = _scrape(lambda active: active.fetch_portal_data(name_247, year), scraper)
+            timing.add(rows=len(data.incoming) + len(data.outgoing))
+        with span("fetch.normalize", rows=len(data.incoming) + len(data.outgoing)):
+            records = [_portal_to_dict(p, "incoming", i, pos) for p, i, pos in _normalize_players(data.incoming)]
+            records += [_portal_to_dict(p, "outgoing", i, pos) for p, i, pos in _normalize_players(data.outgoing)]
+        logger.info(
+            f"Fetched {len(data.incoming)} incoming, {len(data.outgoing)} outgoing from 247Sports",
+            extra={"team_247_name": name_247},
+        )
     except Exception:
-        logger.exception("Failed to fetch portal from 247Sports")
+        logger.exception("Failed to fetch portal from 247Sports", extra={"team_247_name": name_247})
         return []
     else:
         return records
+
+
+async def async_fetch_recruits(team: Team | None = None) -> list[dict]:
+    """Asyncio variant of fetch_recruits; the blocking scraper runs on a worker thread."""
+    return await asyncio.to_thread(fetch_recruits, team)
+
+
+async def async_fetch_portal(team: Team | None = None) -> list[dict]:
+    """Asyncio variant of fetch_portal; the blocking scraper runs on a worker thread."""
+    return await asyncio.to_thread(fetch_portal, team)
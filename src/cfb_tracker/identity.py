@@ -0,0 +1,121 @@
+"""Collision-free, stable entry_ids for a team's fetched records."""
+
+import hashlib
+import logging
+
+from cfb_tracker import db, state
+from cfb_tracker.normalizer import normalize_name
+from cfb_tracker.sync import SYNC_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+def _identities(record: dict) -> list[str]:
+    """Keys identifying a player, most specific first."""
+    keys = []
+    if record.get("player_url"):
+        keys.append(f"url:{record['player_url']}")
+    place = record.get("hometown") or record.get("source_school") or ""
+    keys.append(f"attrs:{normalize_name(record['name'])}|{record.get('position') or ''}|{normalize_name(place)}")
+    return keys
+
+
+def _disambiguate(entry_id: str, identity: str) -> str:
+    return hashlib.sha256(f"{entry_id}|{identity}".encode()).hexdigest()[:16]
+
+
+def _synced_rows(team_id: str, table: str) -> list[dict]:
+    """
+    Rows already synced for a team's table: the local snapshot, else a Supabase read.
+
+    A Supabase read is saved as the snapshot, so the sync that follows diffs
+    against it instead of reading the table again.
+    """
+    rows = state.load_snapshot(team_id, table)
+    if rows is None:
+        rows = db.get_all_records(table, team_id=team_id, columns=SYNC_COLUMNS.get(table, "*"))
+        state.save_snapshot(team_id, table, rows)
+    return rows
+
+
+def _seed_entry_ids(team_id: str, table: str) -> dict[str, str]:
+    """identity -> entry_id of every synced player, so current holders keep their ids."""
+    seeded: dict[str, str] = {}
+    for row in _synced_rows(team_id, table):
+        if row.get("entry_id") and row.get("name"):
+            for key in _identities(row):
+                seeded.setdefault(key, row["entry_id"])
+    return seeded
+
+
+def assign_entry_ids(team_id: str, table: str, records: list[dict]) -> list[dict]:
+    """
+    Give every distinct player on a team's page its own stable entry_id.
+
+    generate_id keys players on first initial + last name, so "John Smith"
+    and "Jake Smith" collide. Players are identified by player_url, falling
+    back to name/position/hometown (source school for portal entries). A
+    player seen before keeps its persisted entry_id; a new player gets the
+    name-based id unless another player on this page already holds it, in
+    which case it gets an id derived from that id and its identity. New
+    players are assigned in identity order, so the result does not depend
+    on page order.
+
+    A name-based id whose holder is missing from this page is taken over,
+    and the holder's identities are forgotten. A player without a url whose
+    position or hometown changed is a new identity, so this is what keeps
+    its row (and turns the edit into an update rather than a removal plus a
+    new player).
+
+    Assignments persist in the local state store. When it has none for the
+    table (a fresh or in-memory store, as on every cron run), they are seeded
+    from the rows already synced, so players already in Supabase keep their
+    ids.
+
+    Args:
+        team_id: Team the records belong to
+        table: Table the records will be synced to
+        records: Fetched records with name-based entry_ids
+
+    Returns:
+        list[dict]: Records in the same order with final entry_ids
+    """
+    stored = state.load_entry_ids(team_id, table)
+    known = stored or _seed_entry_ids(team_id, table)
+    identities = [_identities(record) for record in records]
+    matched = [next((known[k] for k in keys if k in known), None) for keys in identities]
+
+    held = {entry_id for entry_id in matched if entry_id is not None}
+    assigned: dict[str, str] = {}
+    collisions = 0
+    for i in sorted((i for i, entry_id in enumerate(matched) if entry_id is None), key=lambda i: identities[i]):
+        primary = identities[i][0]
+        if primary in assigned:
+            # The same player listed twice on one page
+            continue
+        entry_id = records[i]["entry_id"]
+        if entry_id in held:
+            entry_id = _disambiguate(entry_id, primary)
+            collisions += 1
+        held.add(entry_id)
+        assigned[primary] = entry_id
+    entry_ids = [entry_id or assigned[keys[0]] for keys, entry_id in zip(identities, matched)]
+
+    # Identities of absent players whose ids were just taken over
+    taken_over = set(assigned.values())
+    stale = [key for key, entry_id in known.items() if entry_id in taken_over]
+    updates = {
+        key: entry_id for keys, entry_id in zip(identities, entry_ids) for key in keys if stored.get(key) != entry_id
+    }
+    if not stored:
+        # Persist the seed too, so the next run matches players absent from this page
+        updates = {**{key: entry_id for key, entry_id in known.items() if key not in stale}, **updates}
+    state.delete_entry_ids(team_id, table, [key for key in stale if key in stored])
+    state.save_entry_ids(team_id, table, updates)
+    if collisions:
+        logger.info("Disambiguated colliding entry_ids", extra={"team": team_id, "table": table, "count": collisions})
+
+    return [
+        record if record["entry_id"] == entry_id else {**record, "entry_id": entry_id}
+        for record, entry_id in zip(records, entry_ids)
+    ]
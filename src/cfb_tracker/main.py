@@ -1,11 +1,29 @@
+import asyncio
 import logging
+import signal
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from pythonjsonlogger import jsonlogger
 
+from cfb_tracker import db, metrics
 from cfb_tracker.config import config
-from cfb_tracker.fetcher import fetch_portal, fetch_recruits
-from cfb_tracker.queue import init_queue
-from cfb_tracker.sync import sync_table
+from cfb_tracker.fetcher import (
+    async_fetch_portal,
+    async_fetch_recruits,
+    close_scraper_pool,
+    fetch_portal,
+    fetch_recruits,
+    fingerprint,
+)
+from cfb_tracker.identity import assign_entry_ids
+from cfb_tracker.normalizer import cache_stats
+from cfb_tracker.outbox import relay_outbox
+from cfb_tracker.queue import init_queue, is_available, queue_depths
+from cfb_tracker.scheduler import AdaptiveScheduler
+from cfb_tracker.sync import async_sync_table, sync_table
+from cfb_tracker.teams import Team, load_teams
 
 
 def setup_logging():
@@ -25,47 +43,293 @@ setup_logging()
 logger = logging.getLogger(__name__)
 
 
-def main():
-    logger.info("Starting CFB Tracker sync")
+def _fetchers() -> list[tuple]:
+    """(table, label, blocking fetch, async fetch) for each synced table."""
+    return [
+        (config.RECRUITS_TABLE, "Recruits", fetch_recruits, async_fetch_recruits),
+        (config.PORTAL_TABLE, "Portal", fetch_portal, async_fetch_portal),
+    ]
+
+
+def _warn_empty(team: Team, label: str) -> None:
+    logger.warning(f"No {label.lower()} data fetched from any source", extra={"team": team.team_id})
+
+
+def _log_result(team: Team, table: str, label: str, result: dict) -> None:
+    logger.info(f"{label} sync complete", extra={"team": team.team_id, "table": table, **result})
+
+
+def _sync_fetched(team: Team, table: str, label: str, records: list[dict]) -> dict | None:
+    """Sync one fetched table for a team, logging and returning the result."""
+    if not records:
+        _warn_empty(team, label)
+        return None
+    records = assign_entry_ids(team.team_id, table, records)
+    result = sync_table(table, records, team_id=team.team_id, fingerprint=fingerprint(records))
+    _log_result(team, table, label, result)
+    return result
+
+
+def _is_due(team: Team, table: str, due: set[tuple[str, str]] | None) -> bool:
+    return due is None or (team.team_id, table) in due
+
+
+def run_cycle(
+    teams: list[Team],
+    due: set[tuple[str, str]] | None = None,
+    on_result: Callable[[str, str, dict], None] | None = None,
+) -> list[str]:
+    """
+    Fetch every team's recruits and portal pages concurrently, then sync each.
+
+    Pages are fetched on a pool bounded by FETCH_CONCURRENCY; each result is
+    synced on the calling thread as soon as its fetch completes.
+
+    Args:
+        teams: Teams to sync
+        due: Only sync these (team_id, table) pairs (default: all)
+        on_result: Called with (team_id, table, result) after each successful sync
+
+    Returns:
+        list[str]: team_ids whose sync raised an exception
+    """
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, config.FETCH_CONCURRENCY), thread_name_prefix="fetch") as pool:
+        futures = {
+            pool.submit(fetch_fn, team): (team, table, label)
+            for team in teams
+            for table, label, fetch_fn, _ in _fetchers()
+            if _is_due(team, table, due)
+        }
+        for future in as_completed(futures):
+            team, table, label = futures[future]
+            try:
+                result = _sync_fetched(team, table, label, future.result())
+                if result is not None and on_result is not None:
+                    on_result(team.team_id, table, result)
+            except Exception:
+                # One failing team should not block the rest of the cycle
+                logger.exception("Team sync failed", extra={"team": team.team_id, "table": table})
+                if team.team_id not in failed:
+                    failed.append(team.team_id)
+    return failed
+
+
+async def run_cycle_async(
+    teams: list[Team],
+    due: set[tuple[str, str]] | None = None,
+    on_result: Callable[[str, str, dict], None] | None = None,
+) -> list[str]:
+    """
+    Asyncio variant of run_cycle, taking the same arguments.
+
+    Fetches are bounded by FETCH_CONCURRENCY; database round-trips for all
+    teams overlap on the event loop instead of running one table at a time.
+
+    Returns:
+        list[str]: team_ids whose sync raised an exception
+    """
+    fetch_slots = asyncio.Semaphore(max(1, config.FETCH_CONCURRENCY))
+    failed = []
+
+    async def sync_one(team: Team, table: str, label: str, fetch_fn) -> None:
+        async with fetch_slots:
+            records = await fetch_fn(team)
+        if not records:
+            _warn_empty(team, label)
+            return
+        try:
+            # Seeding ids may read Supabase with the blocking client on a fresh store
+            records = await asyncio.to_thread(assign_entry_ids, team.team_id, table, records)
+            result = await async_sync_table(table, records, team_id=team.team_id, fingerprint=fingerprint(records))
+        except Exception:
+            logger.exception("Team sync failed", extra={"team": team.team_id, "table": table})
+            if team.team_id not in failed:
+                failed.append(team.team_id)
+        else:
+            _log_result(team, table, label, result)
+            if on_result is not None:
+                on_result(team.team_id, table, result)
+
+    await asyncio.gather(
+        *(
+            sync_one(team, table, label, async_fetch)
+            for team in teams
+            for table, label, _, async_fetch in _fetchers()
+            if _is_due(team, table, due)
+        )
+    )
+    return failed
+
+
+def _relay_outbox() -> None:
+    """Hand events committed this cycle to the queue; anything left waits for the next cycle."""
+    if not config.OUTBOX_ENABLED:
+        return
+    try:
+        relay_outbox()
+    except Exception:
+        logger.exception("Outbox relay failed")
+
 
-    # Validate required config for sync service
+_shutdown = threading.Event()
+
+
+def _request_shutdown(signum, frame) -> None:
+    logger.info("Shutdown requested", extra={"signal": signal.Signals(signum).name})
+    _shutdown.set()
+
+
+def run_daemon(
+    teams: list[Team],
+    run_once: Callable[[list[Team], set[tuple[str, str]]], list[str]],
+    scheduler: AdaptiveScheduler,
+) -> None:
+    """
+    Run sync cycles until SIGTERM/SIGINT.
+
+    Each tick syncs the (team_id, table) pairs the scheduler reports as due,
+    then sleeps until the next pair is due. A signal lets the running cycle
+    finish and cancels the wait. Failed teams are logged and retried when next
+    due rather than exiting the process.
+
+    Args:
+        teams: Teams to sync
+        run_once: Runs one cycle over the due pairs and returns the failed team_ids
+        scheduler: Decides which pairs are due; run_once reports results to it
+    """
+    _shutdown.clear()
+    previous = {sig: signal.signal(sig, _request_shutdown) for sig in (signal.SIGTERM, signal.SIGINT)}
+    try:
+        while not _shutdown.is_set():
+            due = scheduler.take_due()
+            if due:
+                try:
+                    failed = run_once(teams, due)
+                except Exception:
+                    logger.exception("Sync cycle failed")
+                else:
+                    logger.info(
+                        "Sync complete", extra={"synced": len(due), "failed": failed, "name_cache": cache_stats()}
+                    )
+            delay = scheduler.seconds_until_next()
+            if not _shutdown.is_set():
+                logger.info("Next sync scheduled", extra={"delay_seconds": round(delay, 1)})
+            _shutdown.wait(delay)
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+    logger.info("Daemon stopped")
+
+
+def _check_config() -> None:
+    """Exit if config required by the sync service is missing, and warn about settings that are ignored."""
     missing = []
     if not config.SUPABASE_URL:
         missing.append("SUPABASE_URL")
     if not config.SUPABASE_KEY:
         missing.append("SUPABASE_KEY")
-    if not config.TEAM_247_NAME:
-        missing.append("TEAM_247_NAME")
-    if not config.TEAM_247_YEAR:
-        missing.append("TEAM_247_YEAR")
-    if not config.TEAM:
-        missing.append("TEAM")
+    if not config.TEAMS and not config.TEAMS_FILE:
+        if not config.TEAM_247_NAME:
+            missing.append("TEAM_247_NAME")
+        if not config.TEAM_247_YEAR:
+            missing.append("TEAM_247_YEAR")
+        if not config.TEAM:
+            missing.append("TEAM")
     if missing:
         logger.error("Missing required environment variables", extra={"missing": missing})
         raise SystemExit(f"Missing required config: {', '.join(missing)}")
+    if config.OUTBOX_ENABLED and config.SYNC_VIA_RPC:
+        logger.warning("OUTBOX_ENABLED takes precedence - SYNC_VIA_RPC is ignored")
+
+
+def _load_teams() -> list[Team]:
+    """Load the configured teams, exiting if the configuration is invalid or empty."""
+    try:
+        teams = load_teams()
+    except (OSError, ValueError) as e:
+        logger.exception("Invalid team configuration")
+        raise SystemExit(f"Invalid team configuration: {e}") from e
+    if not teams:
+        raise SystemExit("No teams configured")
+    return teams
+
+
+def _build_scheduler(teams: list[Team]) -> AdaptiveScheduler | None:
+    """Scheduler for daemon mode, or None for a single run."""
+    if not config.DAEMON:
+        return None
+    pairs = [(team.team_id, table) for team in teams for table, *_ in _fetchers()]
+    try:
+        return AdaptiveScheduler(pairs)
+    except ValueError as e:
+        logger.exception("Invalid polling configuration")
+        raise SystemExit(f"Invalid polling configuration: {e}") from e
 
-    # Initialize Redis queue (graceful if unavailable)
-    queue_available = init_queue()
-    if queue_available:
+
+def _connect_queue() -> bool:
+    """
+    Initialize the Redis queue unless it is already up.
+
+    Runs at startup and before every cycle, so a daemon started while Redis
+    was down resumes social posts and the outbox relay once it is back.
+    """
+    if is_available():
+        return True
+    if init_queue():
         logger.info("Queue initialized - social posts will be enqueued")
-    else:
-        logger.info("Queue unavailable - sync will continue without social posts")
-
-    recruits = fetch_recruits()
-    if recruits:
-        result = sync_table(config.RECRUITS_TABLE, recruits)
-        logger.info("Recruits sync complete", extra={"table": config.RECRUITS_TABLE, **result})
-    else:
-        logger.warning("No recruit data fetched from any source")
-
-    portal = fetch_portal()
-    if portal:
-        result = sync_table(config.PORTAL_TABLE, portal)
-        logger.info("Portal sync complete", extra={"table": config.PORTAL_TABLE, **result})
-    else:
-        logger.warning("No portal data fetched from any source")
-
-    logger.info("Sync complete")
+        return True
+    logger.info("Queue unavailable - sync will continue without social posts")
+    return False
+
+
+def _record_queue_depths() -> None:
+    depths = queue_depths()
+    if depths:
+        metrics.set_gauge("queue_depth", "queue", depths)
+
+
+def main():
+    logger.info("Starting CFB Tracker sync")
+    _check_config()
+    teams = _load_teams()
+
+    # Initialize Redis queue (graceful if unavailable; retried every cycle)
+    _connect_queue()
+
+    # Pooled scrapers, the Supabase clients and the queue are shared by every team,
+    # and in daemon mode by every cycle. The async client is bound to its event
+    # loop, so one loop is kept for the life of the process.
+    scheduler = _build_scheduler(teams)
+    on_result = scheduler.observe if scheduler is not None else None
+    loop = asyncio.new_event_loop() if config.ASYNC_IO else None
+
+    def run_once(teams: list[Team], due: set[tuple[str, str]] | None = None) -> list[str]:
+        metrics.start_cycle()
+        _connect_queue()
+        if loop is not None:
+            failed = loop.run_until_complete(run_cycle_async(teams, due, on_result))
+        else:
+            failed = run_cycle(teams, due, on_result)
+        _relay_outbox()
+        _record_queue_depths()
+        metrics.log_cycle_summary()
+        return failed
+
+    try:
+        if scheduler is not None:
+            logger.info("Running as daemon", extra={"interval_seconds": config.CYCLE_INTERVAL_SECONDS})
+            run_daemon(teams, run_once, scheduler)
+            return
+        failed = run_once(teams)
+    finally:
+        close_scraper_pool()
+        if loop is not None:
+            db.reset_async_client()
+            loop.close()
+    logger.info("Sync complete", extra={"teams": len(teams), "failed": failed, "name_cache": cache_stats()})
+    if failed:
+        raise SystemExit(f"Sync failed for: {', '.join(failed)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,194 @@
+"""Per-stage timings, row and byte counts for sync cycles."""
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Generator, Mapping
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass
+
+from cfb_tracker.config import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StageStats:
+    """Aggregated measurements for one stage."""
+
+    calls: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+
+    def add(self, seconds: float, rows: int, nbytes: int, error: bool) -> None:
+        self.calls += 1
+        self.errors += int(error)
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.rows += rows
+        self.bytes += nbytes
+
+
+class Span:
+    """Handle for a running span; add() attaches counts learned while it runs."""
+
+    def __init__(self, rows: int = 0, nbytes: int = 0):
+        self.rows = rows
+        self.bytes = nbytes
+
+    def add(self, rows: int = 0, nbytes: int = 0) -> None:
+        self.rows += rows
+        self.bytes += nbytes
+
+
+_lock = threading.Lock()
+_cycle: dict[str, StageStats] = {}
+_totals: dict[str, StageStats] = {}
+# Gauge name -> (label name, {label value: value}), replaced wholesale by set_gauge
+_gauges: dict[str, tuple[str, dict[str, float]]] = {}
+_cycle_started = time.monotonic()
+_tracer = None
+_tracer_checked = False
+
+
+def _get_tracer():
+    """OpenTelemetry tracer when METRICS_OTEL is set and opentelemetry-api is installed."""
+    global _tracer, _tracer_checked
+    if not _tracer_checked:
+        _tracer_checked = True
+        if config.METRICS_OTEL:
+            try:
+                from opentelemetry import trace  # ty: ignore[unresolved-import]  # optional otel extra
+            except ImportError:
+                logger.warning("METRICS_OTEL is set but opentelemetry-api is not installed")
+            else:
+                _tracer = trace.get_tracer("cfb_tracker")
+    return _tracer
+
+
+@contextmanager
+def span(stage: str, rows: int = 0, nbytes: int = 0) -> Generator[Span, None, None]:
+    """
+    Time a stage and record its duration, rows and bytes for the current cycle.
+
+    Args:
+        stage: Dotted stage name, e.g. "db.upsert"
+        rows: Rows handled, if known up front
+        nbytes: Bytes handled, if known up front
+
+    Yields:
+        Span: Call add() on it to report counts found while running
+    """
+    current = Span(rows, nbytes)
+    error = False
+    start = time.perf_counter()
+    with ExitStack() as stack:
+        tracer = _get_tracer()
+        otel_span = stack.enter_context(tracer.start_as_current_span(stage)) if tracer is not None else None
+        try:
+            yield current
+        except BaseException:
+            error = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            if otel_span is not None:
+                otel_span.set_attribute("rows", current.rows)
+                otel_span.set_attribute("bytes", current.bytes)
+            with _lock:
+                for stats in (_cycle, _totals):
+                    stats.setdefault(stage, StageStats()).add(elapsed, current.rows, current.bytes, error)
+
+
+def set_gauge(name: str, label: str, values: Mapping[str, float]) -> None:
+    """
+    Set a labelled gauge, e.g. set_gauge("queue_depth", "queue", {"social-posts": 3}).
+
+    Args:
+        name: Gauge name, exported as cfb_tracker_<name>
+        label: Label that distinguishes the values
+        values: Current value per label value; replaces any earlier ones
+    """
+    with _lock:
+        _gauges[name] = (label, dict(values))
+
+
+def start_cycle() -> None:
+    """Begin a new cycle: clear per-cycle stats (process totals are kept)."""
+    global _cycle_started
+    with _lock:
+        _cycle.clear()
+        _cycle_started = time.monotonic()
+
+
+def cycle_summary() -> dict:
+    """Stats for every stage recorded since start_cycle(), rounded for logging."""
+    with _lock:
+        stages = {
+            stage: {**asdict(stats), "seconds": round(stats.seconds, 4), "max_seconds": round(stats.max_seconds, 4)}
+            for stage, stats in sorted(_cycle.items())
+        }
+        summary = {"cycle_seconds": round(time.monotonic() - _cycle_started, 4), "stages": stages}
+        if _gauges:
+            summary["gauges"] = {name: dict(values) for name, (_, values) in sorted(_gauges.items())}
+        return summary
+
+
+def prometheus_text() -> str:
+    """Process-lifetime stage totals in the Prometheus text exposition format."""
+    metrics = [
+        ("cfb_tracker_stage_calls_total", "counter", "Stage executions", "calls"),
+        ("cfb_tracker_stage_errors_total", "counter", "Stage executions that raised", "errors"),
+        ("cfb_tracker_stage_seconds_total", "counter", "Time spent in stage", "seconds"),
+        ("cfb_tracker_stage_max_seconds", "gauge", "Slowest single execution of stage", "max_seconds"),
+        ("cfb_tracker_stage_rows_total", "counter", "Rows handled by stage", "rows"),
+        ("cfb_tracker_stage_bytes_total", "counter", "Bytes handled by stage", "bytes"),
+    ]
+    with _lock:
+        totals = sorted((stage, asdict(stats)) for stage, stats in _totals.items())
+        gauges = sorted((name, label, dict(values)) for name, (label, values) in _gauges.items())
+    lines = []
+    for name, kind, help_text, field in metrics:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(f'{name}{{stage="{stage}"}} {values[field]}' for stage, values in totals)
+    for name, label, values in gauges:
+        lines.append(f"# TYPE cfb_tracker_{name} gauge")
+        lines.extend(f'cfb_tracker_{name}{{{label}="{key}"}} {value}' for key, value in sorted(values.items()))
+    return "\n".join(lines) + "\n"
+
+
+def log_cycle_summary() -> dict:
+    """
+    Log this cycle's stage stats as one JSON line, and write Prometheus text
+    to METRICS_PROMETHEUS_FILE if set.
+
+    Returns:
+        dict: The logged summary
+    """
+    summary = cycle_summary()
+    logger.info("Cycle metrics", extra=summary)
+    if config.METRICS_PROMETHEUS_FILE:
+        try:
+            # Write then rename so a scraper never reads a half-written file
+            tmp_path = f"{config.METRICS_PROMETHEUS_FILE}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(prometheus_text())
+            os.replace(tmp_path, config.METRICS_PROMETHEUS_FILE)
+        except OSError:
+            logger.exception("Failed to write Prometheus metrics", extra={"path": config.METRICS_PROMETHEUS_FILE})
+    return summary
+
+
+def reset() -> None:
+    """Clear all stats and the cached tracer (for tests)."""
+    global _tracer, _tracer_checked
+    with _lock:
+        _cycle.clear()
+        _totals.clear()
+        _gauges.clear()
+    _tracer, _tracer_checked = None, False
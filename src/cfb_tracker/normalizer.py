@@ -1,14 +1,23 @@
 import hashlib
 import re
 import unicodedata
+from functools import lru_cache
 
+# Rosters barely change between runs, so names are memoized; the bound keeps
+# a long-lived multi-team process from growing without limit.
+CACHE_SIZE = 8192
 
+_PUNCTUATION = re.compile(r"[^\w\s-]")  # punctuation except hyphens
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=CACHE_SIZE)
 def normalize_name(name: str) -> str:
     name = unicodedata.normalize("NFKD", name)
     name = name.encode("ascii", "ignore").decode("ascii")
     name = name.lower().strip()
-    name = re.sub(r"[^\w\s-]", "", name)  # remove punctuation except hyphens
-    name = re.sub(r"\s+", " ", name)
+    name = _PUNCTUATION.sub("", name)
+    name = _WHITESPACE.sub(" ", name)
     return name
 
 
@@ -47,8 +56,12 @@ def normalize_position(position: str) -> str:
 SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
 
 
+@lru_cache(maxsize=CACHE_SIZE)
 def get_name_key(name: str) -> str:
-    normalized = normalize_name(name)
+    return _key_from_normalized(normalize_name(name))
+
+
+def _key_from_normalized(normalized: str) -> str:
     parts = normalized.split()
 
     # Remove suffixes from end
@@ -68,5 +81,78 @@ def get_name_key(name: str) -> str:
     return f"{first_letter}{lastname}"
 
 
+@lru_cache(maxsize=CACHE_SIZE)
 def generate_id(name: str) -> str:
     return hashlib.sha256(get_name_key(name).encode()).hexdigest()[:16]
+
+
+# Batch path: after the ASCII fold, one translate() deletes everything the
+# punctuation regex would (anything but word characters, whitespace and hyphens)
+_ASCII = [chr(i) for i in range(128)]
+_DELETE_PUNCTUATION = str.maketrans("", "", "".join(c for c in _ASCII if not (c.isalnum() or c in "_-" or c.isspace())))
+
+
+def _collapse_whitespace(name: str) -> str:
+    """Collapse whitespace runs to one space, like _WHITESPACE.sub(" ", name)."""
+    core = " ".join(name.split())
+    if not core:
+        return " " if name else ""
+    lead = " " if name[0].isspace() else ""
+    trail = " " if name[-1].isspace() else ""
+    return f"{lead}{core}{trail}"
+
+
+def _fast_normalize_name(name: str) -> str:
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return _collapse_whitespace(name.lower().strip().translate(_DELETE_PUNCTUATION))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _batch_id(name: str) -> str:
+    """generate_id through the regex-free normalizer, memoized per name across cycles."""
+    key = _key_from_normalized(_fast_normalize_name(name))
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def normalize_batch(names: list[str], positions: list[str]) -> tuple[list[str], list[str]]:
+    """
+    Generate ids and normalize positions for a whole roster in one pass.
+
+    Equivalent to [generate_id(n) for n in names] and
+    [normalize_position(p) for p in positions], without the per-name regex
+    or the three chained caches; repeated names and positions are only
+    processed once, and ids are memoized per name like generate_id's.
+
+    Args:
+        names: Player names
+        positions: Player positions
+
+    Returns:
+        tuple[list[str], list[str]]: Ids for names and normalized positions, in input order
+    """
+    ids = {name: _batch_id(name) for name in dict.fromkeys(names)}
+    normalized = {pos: normalize_position(pos) for pos in dict.fromkeys(positions)}
+    return [ids[name] for name in names], [normalized[pos] for pos in positions]
+
+
+_CACHED = {
+    "normalize_name": normalize_name,
+    "get_name_key": get_name_key,
+    "generate_id": generate_id,
+    "normalize_batch": _batch_id,
+}
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    """Hit/miss counters and current size of each memoized function."""
+    stats = {}
+    for label, func in _CACHED.items():
+        info = func.cache_info()
+        stats[label] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+    return stats
+
+
+def clear_caches() -> None:
+    """Empty the memo caches and reset their counters."""
+    for func in _CACHED.values():
+        func.cache_clear()
@@ -0,0 +1,69 @@
+"""Relay social post events from the Supabase outbox to the Redis queue."""
+
+import logging
+
+from cfb_tracker import db
+from cfb_tracker.config import config
+from cfb_tracker.queue import EventBatch, event_key
+
+logger = logging.getLogger(__name__)
+
+
+def outbox_events(batch: EventBatch) -> list[dict]:
+    """Turn collected events into outbox rows ({"event_key", "payload"}), emptying the batch."""
+    return [{"event_key": event_key(payload), "payload": payload} for payload in batch.take_payloads()]
+
+
+def relay_outbox(batch_size: int | None = None) -> int:
+    """
+    Drain pending outbox events to RQ, oldest first.
+
+    Delivery is at-least-once: an event is stamped only after it reached the
+    queue, and one relayed twice (e.g. after a crash between the two steps)
+    is dropped by the queue's dedup. Stops early when Redis rejects a batch,
+    leaving the rest pending for the next run.
+
+    Args:
+        batch_size: Events per read/enqueue round-trip (defaults to OUTBOX_BATCH_SIZE)
+
+    Returns:
+        int: Number of events handed to the queue
+    """
+    batch_size = batch_size or config.OUTBOX_BATCH_SIZE
+    relayed = 0
+    while True:
+        rows = db.fetch_outbox(batch_size)
+        if not rows:
+            break
+
+        batch = EventBatch()
+        for row in rows:
+            batch.add_payload(row["payload"])
+        results = batch.flush()
+
+        done = [row["id"] for row, ok in zip(rows, results) if ok]
+        db.mark_outbox_enqueued(done)
+        relayed += len(done)
+        if len(done) < len(rows):
+            logger.warning(
+                "Outbox relay stopped with events still pending",
+                extra={"pending": len(rows) - len(done), "relayed": relayed},
+            )
+            break
+        if len(rows) < batch_size:
+            break
+
+    if relayed:
+        logger.info("Relayed outbox events", extra={"relayed": relayed})
+    return relayed
+
+
+if __name__ == "__main__":
+    # Bulk replay: python -m cfb_tracker.outbox drains everything pending
+    from cfb_tracker.main import setup_logging
+    from cfb_tracker.queue import init_queue
+
+    setup_logging()
+    if not init_queue():
+        raise SystemExit("Redis unavailable - nothing relayed")
+    relay_outbox()
@@ -1,17 +1,34 @@
+import hashlib
+import json
 import logging
+from datetime import datetime
 from typing import Literal
 
 from redis import Redis
 from redis.exceptions import ConnectionError as RedisConnectionError
-from rq import Queue, Retry
+from rq import Queue, Retry, get_current_job
 
+from cfb_tracker import coalesce
 from cfb_tracker.config import config
+from cfb_tracker.metrics import span
 
 logger = logging.getLogger(__name__)
 
 _queue: Queue | None = None
+_lanes: dict[str, Queue] = {}
 _redis_available = False
 
+Lane = Literal["high", "normal", "low"]
+
+# One RQ queue per priority lane; "normal" keeps the original queue name.
+# Workers list them in this order so higher lanes drain first.
+LANE_QUEUES: dict[str, str] = {
+    "high": "social-posts-high",
+    "normal": "social-posts",
+    "low": "social-posts-low",
+}
+PRIORITY_QUEUES = tuple(LANE_QUEUES.values())
+
 
 def init_queue() -> bool:
     """
@@ -20,7 +37,7 @@ def init_queue() -> bool:
     Returns:
         bool: True if Redis is available and queue initialized, False otherwise
     """
-    global _queue, _redis_available
+    global _queue, _lanes, _redis_available
 
     if not config.REDIS_URL:
         logger.warning("REDIS_URL not configured - social post jobs will be skipped")
@@ -32,12 +49,11 @@ def init_queue() -> bool:
         # Test connection
         redis_conn.ping()
 
-        _queue = Queue("social-posts", connection=redis_conn)
+        _lanes = {lane: Queue(name, connection=redis_conn) for lane, name in LANE_QUEUES.items()}
+        _queue = _lanes["normal"]
         _redis_available = True
 
-        logger.info(
-            "Redis queue initialized successfully", extra={"queue": "social-posts"}
-        )
+        logger.info("Redis queue initialized successfully", extra={"queues": list(PRIORITY_QUEUES)})
 
     except RedisConnectionError as e:
         logger.warning(
@@ -54,70 +70,278 @@ def init_queue() -> bool:
         return True
 
 
+EventType = Literal["new_player", "status_change", "player_updated", "player_removed"]
+TableName = Literal["recruits", "portal"]
+
+JOB_FUNC = "cfb_tracker.worker.process_social_post"
+JOB_TIMEOUT = 300  # 5 minutes
+RESULT_TTL = 3600  # Keep results for 1 hour
+FAILURE_TTL = 86400  # Keep failures for 24 hours
+
+
+def _job_retry() -> Retry:
+    return Retry(max=3, interval=[60, 300, 900])  # Retry at 1min, 5min, 15min
+
+
+def build_payload(
+    event_type: EventType,
+    table: TableName,
+    player_data: dict,
+    old_status: str | None = None,
+    new_status: str | None = None,
+    team: str | None = None,
+    changes: dict | None = None,
+) -> dict:
+    """Build the social post job payload for a player event."""
+    payload: dict = {
+        "event_type": event_type,
+        "table": table,
+        "team": team or config.TEAM,
+        "player": {
+            "name": player_data.get("name"),
+            "position": player_data.get("position"),
+            "entry_id": player_data.get("entry_id"),
+            "player_url": player_data.get("player_url"),
+        },
+    }
+
+    # Add recruit-specific fields
+    if table == "recruits":
+        payload["player"]["hometown"] = player_data.get("hometown")
+        payload["player"]["stars"] = player_data.get("stars")
+        payload["player"]["rating"] = player_data.get("rating")
+
+    # Add portal-specific fields
+    if table == "portal":
+        payload["player"]["direction"] = player_data.get("direction")
+        payload["player"]["source_school"] = player_data.get("source_school")
+
+    # Add status information
+    if event_type == "status_change":
+        payload["old_status"] = old_status
+        payload["new_status"] = new_status
+    elif event_type == "new_player":
+        payload["status"] = player_data.get("status")
+    elif event_type == "player_updated":
+        # {field: {"old": ..., "new": ...}} for each changed EVENT_FIELDS field
+        payload["changes"] = changes or {}
+
+    return payload
+
+
+def event_priority(payload: dict) -> Lane:
+    """
+    Pick the queue lane for an event so headline posts skip the backlog.
+
+    Removals and field updates are low priority. Portal commitments
+    (incoming) are high, portal entries normal. Recruits are high from
+    PRIORITY_HIGH_STARS or PRIORITY_HIGH_RATING, low at or below
+    PRIORITY_LOW_STARS, otherwise normal.
+    """
+    if payload["event_type"] == "digest":
+        # A digest goes out with its most urgent event
+        return min(
+            (event_priority(event) for event in payload["events"]), key=lambda lane: _LANE_RANK[lane], default="normal"
+        )
+    if payload["event_type"] in ("player_removed", "player_updated"):
+        return "low"
+    player = payload["player"]
+    if payload["table"] == "portal":
+        return "high" if player.get("direction") == "incoming" else "normal"
+    stars = player.get("stars") or 0
+    rating = player.get("rating") or 0
+    if stars >= config.PRIORITY_HIGH_STARS or rating >= config.PRIORITY_HIGH_RATING:
+        return "high"
+    if 0 < stars <= config.PRIORITY_LOW_STARS:
+        return "low"
+    return "normal"
+
+
+_LANE_RANK = {lane: rank for rank, lane in enumerate(LANE_QUEUES)}
+
+
+def priority_rank(payload: dict) -> int:
+    """Sort key putting higher-priority events first."""
+    return _LANE_RANK[event_priority(payload)]
+
+
+def _default_queue() -> Queue:
+    """The normal-lane queue, for its Redis connection; callers check is_available() first."""
+    if _queue is None:
+        raise RuntimeError("Redis queue is not initialized")
+    return _queue
+
+
+def _lane_queue(lane: str) -> Queue:
+    """Queue for a lane; everything shares the default queue when lanes are not set up."""
+    return _lanes[lane] if lane in _lanes else _default_queue()
+
+
+def _enqueue_lanes(jobs_by_lane: dict[str, list]) -> None:
+    """Enqueue prepared jobs on their lanes' queues in a single Redis round-trip."""
+    groups: dict[int, tuple[Queue, list]] = {}
+    for lane, jobs in jobs_by_lane.items():
+        queue = _lane_queue(lane)
+        groups.setdefault(id(queue), (queue, []))[1].extend(jobs)
+    if len(groups) == 1:
+        queue, jobs = next(iter(groups.values()))
+        queue.enqueue_many(jobs)
+        return
+    with _default_queue().connection.pipeline() as pipe:
+        for queue, jobs in groups.values():
+            queue.enqueue_many(jobs, pipeline=pipe)
+        pipe.execute()
+
+
+def is_available() -> bool:
+    """Check if the Redis queue is initialized."""
+    return _redis_available and _queue is not None
+
+
+def flush_queue() -> Queue:
+    """Queue that runs coalescing flush jobs - the high lane, so they are not stuck behind a backlog."""
+    return _lane_queue("high")
+
+
+def queue_depths() -> dict[str, int]:
+    """
+    Jobs waiting in each lane's queue.
+
+    Returns:
+        dict[str, int]: Queue name to depth, empty when Redis is unavailable
+    """
+    if not _redis_available or not _lanes:
+        return {}
+    try:
+        return {queue.name: queue.count for queue in _lanes.values()}
+    except Exception:
+        logger.warning("Failed to read queue depths", exc_info=True)
+        return {}
+
+
+def event_key(payload: dict) -> str:
+    """
+    Stable identity of a player event, used for dedup keys and RQ job ids.
+
+    Built from (team, table, entry_id, event_type, old_status, new_status) and,
+    for player_updated, the changes, so a re-emitted event collides while a
+    genuine later flip back does not.
+    """
+    if payload.get("event_type") == "digest":
+        members = sorted(event_key(event) for event in payload["events"])
+        return hashlib.sha256("|".join([payload["team"], *members]).encode()).hexdigest()[:32]
+    player = payload.get("player", {})
+    new_status = payload.get("new_status", payload.get("status"))
+    parts = (
+        payload.get("team"),
+        payload.get("table"),
+        player.get("entry_id"),
+        payload.get("event_type"),
+        payload.get("old_status"),
+        new_status,
+        json.dumps(payload.get("changes"), sort_keys=True, default=str),
+    )
+    return hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()[:32]
+
+
+def _dedup_key(key: str) -> str:
+    return f"cfb-tracker:dedup:{key}"
+
+
+def _job_id(key: str) -> str:
+    return f"social-post-{key}"
+
+
+def _claim(keys: list[str]) -> list[bool]:
+    """
+    Atomically claim event keys with SET NX, in one pipeline.
+
+    Returns:
+        list[bool]: True for keys not seen within EVENT_DEDUP_TTL_SECONDS
+    """
+    ttl = config.EVENT_DEDUP_TTL_SECONDS
+    if ttl <= 0 or not keys:
+        return [True] * len(keys)
+    connection = _default_queue().connection
+    if len(keys) == 1:
+        return [bool(connection.set(_dedup_key(keys[0]), 1, nx=True, ex=ttl))]
+    pipe = connection.pipeline(transaction=False)
+    for key in keys:
+        pipe.set(_dedup_key(key), 1, nx=True, ex=ttl)
+    return [bool(claimed) for claimed in pipe.execute()]
+
+
+def _claim_keys(payload: dict, key: str) -> list[str]:
+    """Keys an event claims: its own, plus each member's for a digest, so a member re-emitted later is dropped."""
+    if payload.get("event_type") == "digest":
+        return [key, *(event_key(event) for event in payload["events"])]
+    return [key]
+
+
+def _release(keys: list[str]) -> None:
+    """Drop dedup claims for events that failed to enqueue so a retry can send them."""
+    if config.EVENT_DEDUP_TTL_SECONDS <= 0 or not keys:
+        return
+    try:
+        _default_queue().connection.delete(*[_dedup_key(key) for key in keys])
+    except Exception:
+        logger.warning("Failed to release dedup keys", extra={"events": len(keys)}, exc_info=True)
+
+
 def enqueue_event(
-    event_type: Literal["new_player", "status_change", "player_removed"],
-    table: Literal["recruits", "portal"],
+    event_type: EventType,
+    table: TableName,
     player_data: dict,
     old_status: str | None = None,
     new_status: str | None = None,
+    team: str | None = None,
+    changes: dict | None = None,
 ) -> bool:
     """
     Enqueue a player event for social media posting.
 
     Args:
-        event_type: Type of event ("new_player" or "status_change")
+        event_type: Type of event ("new_player", "status_change", "player_updated" or "player_removed")
         table: Table name ("recruits" or "portal")
         player_data: Player record data
         old_status: Previous status (for status_change events)
         new_status: New status (for status_change events)
+        team: Team the player belongs to (defaults to the configured TEAM)
+        changes: Changed fields as {field: {"old", "new"}} (for player_updated events)
 
     Returns:
-        bool: True if job was enqueued successfully, False otherwise
+        bool: True if job was enqueued (or an identical one already was), False otherwise
     """
     if not _redis_available or _queue is None:
         logger.debug("Redis not available - skipping job enqueue")
         return False
 
+    key = None
     try:
-        # Build job payload
-        payload = {
-            "event_type": event_type,
-            "table": table,
-            "team": config.TEAM,
-            "player": {
-                "name": player_data.get("name"),
-                "position": player_data.get("position"),
-                "entry_id": player_data.get("entry_id"),
-                "player_url": player_data.get("player_url"),
-            },
-        }
-
-        # Add recruit-specific fields
-        if table == "recruits":
-            payload["player"]["hometown"] = player_data.get("hometown")
-            payload["player"]["stars"] = player_data.get("stars")
-            payload["player"]["rating"] = player_data.get("rating")
-
-        # Add portal-specific fields
-        if table == "portal":
-            payload["player"]["direction"] = player_data.get("direction")
-            payload["player"]["source_school"] = player_data.get("source_school")
-
-        # Add status information
-        if event_type == "status_change":
-            payload["old_status"] = old_status
-            payload["new_status"] = new_status
-        elif event_type == "new_player":
-            payload["status"] = player_data.get("status")
-
-        # Enqueue the job
-        job = _queue.enqueue(
-            "cfb_tracker.worker.process_social_post",
+        payload = build_payload(event_type, table, player_data, old_status, new_status, team, changes)
+
+        if config.COALESCE_WINDOW_SECONDS > 0:
+            coalesce.hold(flush_queue(), [payload])
+            return True
+
+        # Drop events already enqueued within the dedup window
+        key = event_key(payload)
+        if not _claim([key])[0]:
+            logger.info(
+                "Dropped duplicate social post job",
+                extra={"event_type": event_type, "player_name": player_data.get("name"), "table": table},
+            )
+            return True
+
+        # Enqueue the job on its priority lane
+        job = _lane_queue(event_priority(payload)).enqueue(
+            JOB_FUNC,
             payload,
-            job_timeout="5m",
-            result_ttl=3600,  # Keep results for 1 hour
-            failure_ttl=86400,  # Keep failures for 24 hours
-            retry=Retry(max=3, interval=[60, 300, 900]),  # Retry at 1min, 5min, 15min
+            job_id=_job_id(key),
+            job_timeout=JOB_TIMEOUT,
+            result_ttl=RESULT_TTL,
+            failure_ttl=FAILURE_TTL,
+            retry=_job_retry(),
         )
 
         logger.info(
@@ -138,6 +362,195 @@ def enqueue_event(
                 "player_name": player_data.get("name"),
             },
         )
+        if key is not None:
+            _release([key])
         return False
     else:
         return True
+
+
+def reschedule_current_job(payload: dict, at: datetime) -> str | None:
+    """
+    Re-enqueue the running job's payload on its own queue to run at a set time.
+
+    Used when a post has to wait for an X rate limit window: the current job
+    finishes and a fresh one (with fresh retries) runs once a slot opens.
+    Needs workers started with --with-scheduler.
+
+    Args:
+        payload: Job payload to run again
+        at: When to run it (timezone-aware)
+
+    Returns:
+        str | None: Scheduled job id, or None when not called from an RQ job
+    """
+    job = get_current_job()
+    if job is None:
+        return None
+    scheduled = Queue(job.origin, connection=job.connection).enqueue_at(
+        at,
+        JOB_FUNC,
+        payload,
+        job_timeout=JOB_TIMEOUT,
+        result_ttl=RESULT_TTL,
+        failure_ttl=FAILURE_TTL,
+        retry=_job_retry(),
+    )
+    return scheduled.id
+
+
+def _hold_built(built: list[tuple[int, dict, str]]) -> bool:
+    """Buffer built events for coalescing; False if that failed and they should be enqueued now."""
+    try:
+        coalesce.hold(flush_queue(), [payload for _, payload, _ in built])
+    except Exception:
+        logger.exception("Failed to hold social post jobs - enqueueing now", extra={"events": len(built)})
+        return False
+    return True
+
+
+def _enqueue_built(built: list[tuple[int, dict, str]]) -> list[int]:
+    """
+    Claim built events and enqueue the new ones on their lanes in one round-trip.
+
+    A digest claims its members' keys alongside its own, and every key an
+    event claimed is released if its enqueue fails.
+
+    Returns:
+        list[int]: Positions of events now enqueued, including duplicates of
+            events already enqueued within EVENT_DEDUP_TTL_SECONDS
+    """
+    keys = [_claim_keys(payload, key) for _, payload, key in built]
+    try:
+        with span("queue.dedup", rows=len(built)):
+            results = iter(_claim([key for event_keys in keys for key in event_keys]))
+            claimed = [[key for key in event_keys if next(results)] for event_keys in keys]
+    except Exception:
+        logger.exception("Failed to check social post jobs for duplicates", extra={"events": len(built)})
+        return []
+
+    duplicates = [i for (i, _, key), held in zip(built, claimed) if key not in held]
+    new = [event for event, held in zip(built, claimed) if event[2] in held]
+    if not new:
+        return duplicates
+
+    jobs_by_lane: dict[str, list] = {}
+    for _, payload, key in new:
+        jobs_by_lane.setdefault(event_priority(payload), []).append(
+            Queue.prepare_data(
+                JOB_FUNC,
+                args=(payload,),
+                timeout=JOB_TIMEOUT,
+                result_ttl=RESULT_TTL,
+                failure_ttl=FAILURE_TTL,
+                job_id=_job_id(key),
+                retry=_job_retry(),
+            )
+        )
+    try:
+        with span("queue.enqueue", rows=len(new)):
+            _enqueue_lanes(jobs_by_lane)
+    except Exception:
+        logger.exception("Failed to enqueue social post jobs", extra={"events": len(new)})
+        _release([key for (_, _, own), held in zip(built, claimed) if own in held for key in held])
+        return duplicates
+
+    logger.info(
+        "Enqueued social post jobs",
+        extra={
+            "enqueued": len(new),
+            "duplicates": len(duplicates),
+            "events": len(built),
+            "lanes": {lane: len(jobs) for lane, jobs in jobs_by_lane.items()},
+        },
+    )
+    return duplicates + [i for i, _, _ in new]
+
+
+class EventBatch:
+    """
+    Collects player events and enqueues them in a single Redis pipeline.
+
+    add() accepts the same arguments as enqueue_event and add_payload() a
+    payload built earlier (e.g. read back from the outbox); neither touches
+    Redis. flush() sends everything collected since the last flush.
+    """
+
+    def __init__(self, coalesce: bool | None = None):
+        self._events: list[dict] = []
+        # None follows COALESCE_WINDOW_SECONDS; the coalescing flush job itself passes False
+        self._coalesce = coalesce
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def add(
+        self,
+        event_type: EventType,
+        table: TableName,
+        player_data: dict,
+        old_status: str | None = None,
+        new_status: str | None = None,
+        team: str | None = None,
+        changes: dict | None = None,
+    ) -> None:
+        """Collect an event for the next flush."""
+        self._events.append({
+            "event_type": event_type,
+            "table": table,
+            "player_data": player_data,
+            "old_status": old_status,
+            "new_status": new_status,
+            "team": team,
+            "changes": changes,
+        })
+
+    def add_payload(self, payload: dict) -> None:
+        """Collect an already-built job payload for the next flush."""
+        self._events.append({"payload": payload})
+
+    def _build(self, events: list[dict]) -> list[tuple[int, dict, str]]:
+        """Build (position, payload, event_key) for each event, logging ones that fail."""
+        built = []
+        for i, event in enumerate(events):
+            try:
+                payload = event["payload"] if "payload" in event else build_payload(**event)
+            except Exception:
+                logger.exception(
+                    "Failed to build social post job",
+                    extra={"event_type": event["event_type"], "player_name": event["player_data"].get("name")},
+                )
+                continue
+            built.append((i, payload, event_key(payload)))
+        return built
+
+    def take_payloads(self) -> list[dict]:
+        """Build and remove every collected event without enqueueing, for the outbox."""
+        events, self._events = self._events, []
+        return [payload for _, payload, _ in self._build(events)]
+
+    def flush(self) -> list[bool]:
+        """
+        Enqueue every collected event via Queue.enqueue_many in one round-trip.
+
+        Events already enqueued within EVENT_DEDUP_TTL_SECONDS are dropped and
+        count as successful.
+
+        Returns:
+            list[bool]: Per-event success, in the order events were added
+        """
+        events, self._events = self._events, []
+        if not events:
+            return []
+        if not _redis_available or _queue is None:
+            logger.debug("Redis not available - skipping job enqueue", extra={"events": len(events)})
+            return [False] * len(events)
+
+        hold = config.COALESCE_WINDOW_SECONDS > 0 if self._coalesce is None else self._coalesce
+        built = self._build(events)
+        done = [i for i, _, _ in built] if hold and _hold_built(built) else _enqueue_built(built)
+
+        results = [False] * len(events)
+        for i in done:
+            results[i] = True
+        return results
@@ -0,0 +1,145 @@
+"""Adaptive per-team/table polling schedule for daemon mode."""
+
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from cfb_tracker.config import config
+
+# Interval multipliers after a sync that did / did not change anything
+_SPEEDUP = 0.5
+_BACKOFF = 1.5
+
+
+@dataclass(frozen=True)
+class HotWindow:
+    """A yearly (month, day) range, inclusive, optionally limited to one table."""
+
+    start: tuple[int, int]
+    end: tuple[int, int]
+    table: str | None = None
+
+    def contains(self, day: date, table: str) -> bool:
+        if self.table is not None and self.table != table:
+            return False
+        today = (day.month, day.day)
+        if self.start <= self.end:
+            return self.start <= today <= self.end
+        # Window wraps the new year, e.g. 12-15:01-10
+        return today >= self.start or today <= self.end
+
+
+def _parse_month_day(text: str) -> tuple[int, int]:
+    month, day = (int(part) for part in text.split("-"))
+    # Validate against a leap year so 02-29 is accepted
+    date(2024, month, day)
+    return month, day
+
+
+def parse_hot_windows(spec: str | None) -> list[HotWindow]:
+    """
+    Parse HOT_WINDOWS into HotWindow ranges.
+
+    The spec is a comma-separated list of "MM-DD:MM-DD" ranges, each
+    optionally prefixed with "table@" to apply to a single table.
+
+    Args:
+        spec: HOT_WINDOWS value, e.g. "12-03:12-05,portal@12-09:12-28"
+
+    Returns:
+        list[HotWindow]: Parsed windows (empty if spec is unset)
+
+    Raises:
+        ValueError: If a window is malformed
+    """
+    windows = []
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        table, _, dates = item.rpartition("@")
+        try:
+            start, end = dates.split(":")
+            windows.append(HotWindow(_parse_month_day(start), _parse_month_day(end), table or None))
+        except ValueError as e:
+            raise ValueError(f"Invalid HOT_WINDOWS entry {item!r}, expected [table@]MM-DD:MM-DD") from e
+    return windows
+
+
+class AdaptiveScheduler:
+    """
+    Tracks when each (team_id, table) pair is next due for a sync.
+
+    Every pair starts at CYCLE_INTERVAL_SECONDS. A sync that upserts or
+    deletes rows halves the pair's interval; one that changes nothing
+    stretches it by half again. Intervals stay within POLL_MIN_SECONDS and
+    POLL_MAX_SECONDS, and within POLL_HOT_MAX_SECONDS while a HOT_WINDOWS
+    range is active. Each reschedule is shifted by up to CYCLE_JITTER_SECONDS.
+    """
+
+    def __init__(self, pairs: list[tuple[str, str]], clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._windows = parse_hot_windows(config.HOT_WINDOWS)
+        self._lock = threading.Lock()
+        now = clock()
+        self._intervals = {pair: float(config.CYCLE_INTERVAL_SECONDS) for pair in pairs}
+        self._next_due = dict.fromkeys(pairs, now)
+
+    def _bounds(self, table: str, now: float) -> tuple[float, float]:
+        low, high = config.POLL_MIN_SECONDS, config.POLL_MAX_SECONDS
+        today = datetime.fromtimestamp(now).date()
+        if any(window.contains(today, table) for window in self._windows):
+            high = min(high, config.POLL_HOT_MAX_SECONDS)
+        return float(low), float(max(low, high))
+
+    def _reschedule(self, pair: tuple[str, str], now: float) -> None:
+        low, high = self._bounds(pair[1], now)
+        interval = min(max(self._intervals[pair], low), high)
+        self._intervals[pair] = interval
+        jitter = config.CYCLE_JITTER_SECONDS
+        self._next_due[pair] = now + max(0.0, interval + random.uniform(-jitter, jitter))  # noqa: S311
+
+    def interval(self, team_id: str, table: str) -> float:
+        """Current poll interval in seconds for a team's table."""
+        return self._intervals[(team_id, table)]
+
+    def take_due(self) -> set[tuple[str, str]]:
+        """
+        Claim the pairs due now.
+
+        Claimed pairs are provisionally rescheduled at their current interval,
+        so a pair whose sync fails (and is never observed) is not retried in a
+        tight loop.
+
+        Returns:
+            set[tuple[str, str]]: (team_id, table) pairs to sync this tick
+        """
+        with self._lock:
+            now = self._clock()
+            due = {pair for pair, at in self._next_due.items() if at <= now}
+            for pair in due:
+                self._reschedule(pair, now)
+            return due
+
+    def observe(self, team_id: str, table: str, result: dict) -> None:
+        """
+        Adapt a pair's interval to a sync_table result and reschedule it.
+
+        Args:
+            team_id: Team that was synced
+            table: Table that was synced
+            result: sync_table result with "upserted" and "deleted" counts
+        """
+        pair = (team_id, table)
+        changed = result.get("upserted", 0) + result.get("deleted", 0)
+        with self._lock:
+            self._intervals[pair] *= _SPEEDUP if changed else _BACKOFF
+            self._reschedule(pair, self._clock())
+
+    def seconds_until_next(self) -> float:
+        """Seconds until the earliest pair is due (0 if one is already due)."""
+        with self._lock:
+            return max(0.0, min(self._next_due.values(), default=0.0) - self._clock())
@@ -0,0 +1,22 @@
+"""Command-line entry point for the non-forking social post worker."""
+
+import argparse
+
+from cfb_tracker.queue import PRIORITY_QUEUES
+from cfb_tracker.worker import run_worker
+
+# Kept apart from worker.py: `python -m cfb_tracker.worker` would load that module twice (as __main__ and as
+# cfb_tracker.worker, which jobs reference), running its X client setup twice.
+
+
+def main(argv: list[str] | None = None) -> bool:
+    """Parse queue names and --burst, then run the worker until it stops."""
+    parser = argparse.ArgumentParser(description="Run the non-forking social post worker.")
+    parser.add_argument("queues", nargs="*", default=list(PRIORITY_QUEUES), help="queues in priority order")
+    parser.add_argument("--burst", action="store_true", help="exit once the queues are empty")
+    args = parser.parse_args(argv)
+    return run_worker(tuple(args.queues), burst=args.burst)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""Local sync state persisted in SQLite between cycles."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from cfb_tracker.config import config
+
+_conn: sqlite3.Connection | None = None
+_lock = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    team_id TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (team_id, table_name)
+);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    team_id TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    entry_id TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (team_id, table_name, entry_id)
+);
+
+CREATE TABLE IF NOT EXISTS entry_ids (
+    team_id TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    identity TEXT NOT NULL,
+    entry_id TEXT NOT NULL,
+    PRIMARY KEY (team_id, table_name, identity)
+);
+
+CREATE TABLE IF NOT EXISTS reconciliations (
+    team_id TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    reconciled_at REAL NOT NULL,
+    PRIMARY KEY (team_id, table_name)
+);
+"""
+
+# Columns managed by the database or derived by sync rather than scraped from 247Sports
+_VOLATILE_FIELDS = {"id", "team_id", "updated_at", "created_at", "content_hash"}
+
+
+def get_connection() -> sqlite3.Connection:
+    """Open the state database at STATE_PATH on first use."""
+    global _conn
+    with _lock:
+        if _conn is None:
+            _conn = sqlite3.connect(config.STATE_PATH, check_same_thread=False)
+            _conn.executescript(_SCHEMA)
+        return _conn
+
+
+def reset() -> None:
+    """Close the state database so the next call reopens STATE_PATH."""
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+        _conn = None
+
+
+def get_fingerprint(team_id: str, table: str) -> str | None:
+    """Get the fingerprint of the last payload synced for a team's table."""
+    conn = get_connection()
+    with _lock:
+        row = conn.execute(
+            "SELECT fingerprint FROM fingerprints WHERE team_id = ? AND table_name = ?",
+            (team_id, table),
+        ).fetchone()
+    return row[0] if row else None
+
+
+def set_fingerprint(team_id: str, table: str, fingerprint: str) -> None:
+    """Record the fingerprint of a payload that was fully synced."""
+    conn = get_connection()
+    with _lock, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO fingerprints (team_id, table_name, fingerprint, updated_at) VALUES (?, ?, ?, ?)",
+            (team_id, table, fingerprint, datetime.now(timezone.utc).isoformat()),
+        )
+
+
+def record_hash(record: dict, fields: tuple[str, ...] | None = None) -> str:
+    """
+    Compact hash of a record's scraped content.
+
+    Args:
+        record: Record to hash
+        fields: Only hash these fields (missing ones count as None); by default
+            every field except database-managed columns
+
+    Returns:
+        str: 16-character hex digest
+    """
+    if fields is None:
+        content = {k: v for k, v in record.items() if k not in _VOLATILE_FIELDS}
+    else:
+        content = {f: record.get(f) for f in fields}
+    payload = json.dumps(content, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _snapshot_rows(team_id: str, table: str, records: list[dict]) -> list[tuple]:
+    return [(team_id, table, r["entry_id"], record_hash(r), json.dumps(r, default=str)) for r in records]
+
+
+def load_snapshot(team_id: str, table: str) -> list[dict] | None:
+    """
+    Load the last-synced records for a team's table.
+
+    Returns:
+        list[dict] | None: Snapshot records, or None if the table was never reconciled
+    """
+    conn = get_connection()
+    with _lock:
+        reconciled = conn.execute(
+            "SELECT 1 FROM reconciliations WHERE team_id = ? AND table_name = ?",
+            (team_id, table),
+        ).fetchone()
+        if reconciled is None:
+            return None
+        rows = conn.execute(
+            "SELECT record FROM snapshots WHERE team_id = ? AND table_name = ?",
+            (team_id, table),
+        ).fetchall()
+    return [json.loads(row[0]) for row in rows]
+
+
+def save_snapshot(team_id: str, table: str, records: list[dict]) -> None:
+    """Replace a team's snapshot with a full read from Supabase and mark it reconciled."""
+    conn = get_connection()
+    with _lock, conn:
+        conn.execute("DELETE FROM snapshots WHERE team_id = ? AND table_name = ?", (team_id, table))
+        conn.executemany(
+            "INSERT INTO snapshots (team_id, table_name, entry_id, content_hash, record) VALUES (?, ?, ?, ?, ?)",
+            _snapshot_rows(team_id, table, records),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO reconciliations (team_id, table_name, reconciled_at) VALUES (?, ?, ?)",
+            (team_id, table, time.time()),
+        )
+
+
+def apply_upserts(team_id: str, table: str, records: list[dict]) -> None:
+    """Mirror records just upserted to Supabase into the snapshot."""
+    if not records:
+        return
+    conn = get_connection()
+    with _lock, conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO snapshots (team_id, table_name, entry_id, content_hash, record) "
+            "VALUES (?, ?, ?, ?, ?)",
+            _snapshot_rows(team_id, table, records),
+        )
+
+
+def apply_deletes(team_id: str, table: str, entry_ids: list[str]) -> None:
+    """Mirror records just deleted from Supabase into the snapshot."""
+    if not entry_ids:
+        return
+    conn = get_connection()
+    with _lock, conn:
+        conn.executemany(
+            "DELETE FROM snapshots WHERE team_id = ? AND table_name = ? AND entry_id = ?",
+            [(team_id, table, entry_id) for entry_id in entry_ids],
+        )
+
+
+def needs_reconciliation(team_id: str, table: str, max_age_seconds: float) -> bool:
+    """Check whether a team's snapshot is missing or older than max_age_seconds."""
+    if max_age_seconds <= 0:
+        return True
+    conn = get_connection()
+    with _lock:
+        row = conn.execute(
+            "SELECT reconciled_at FROM reconciliations WHERE team_id = ? AND table_name = ?",
+            (team_id, table),
+        ).fetchone()
+    return row is None or time.time() - row[0] >= max_age_seconds
+
+
+def load_entry_ids(team_id: str, table: str) -> dict[str, str]:
+    """Load the persisted identity -> entry_id assignments for a team's table."""
+    conn = get_connection()
+    with _lock:
+        rows = conn.execute(
+            "SELECT identity, entry_id FROM entry_ids WHERE team_id = ? AND table_name = ?",
+            (team_id, table),
+        ).fetchall()
+    return dict(rows)
+
+
+def save_entry_ids(team_id: str, table: str, assignments: dict[str, str]) -> None:
+    """Persist identity -> entry_id assignments so ids stay stable between runs."""
+    if not assignments:
+        return
+    conn = get_connection()
+    with _lock, conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO entry_ids (team_id, table_name, identity, entry_id) VALUES (?, ?, ?, ?)",
+            [(team_id, table, identity, entry_id) for identity, entry_id in assignments.items()],
+        )
+
+
+def delete_entry_ids(team_id: str, table: str, identities: list[str]) -> None:
+    """Forget identity -> entry_id assignments whose entry_id now belongs to another identity."""
+    if not identities:
+        return
+    conn = get_connection()
+    with _lock, conn:
+        conn.executemany(
+            "DELETE FROM entry_ids WHERE team_id = ? AND table_name = ? AND identity = ?",
+            [(team_id, table, identity) for identity in identities],
+        )
@@ -1,71 +1,407 @@
+import asyncio
 import logging
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
-from cfb_tracker import db
-from cfb_tracker.queue import enqueue_event
+from cfb_tracker import db, state
+from cfb_tracker.config import config
+from cfb_tracker.metrics import span
+from cfb_tracker.outbox import outbox_events
+from cfb_tracker.queue import EventBatch
 
 logger = logging.getLogger(__name__)
 
+# Columns sync_table reads back: the diff key and status plus the fields
+# carried in player_removed job payloads. Unknown tables read every column.
+SYNC_COLUMNS = {
+    "recruits": "entry_id,content_hash,status,name,position,player_url,hometown,stars,rating",
+    "portal": "entry_id,content_hash,status,name,position,player_url,direction,source_school",
+}
 
-def sync_table(table_name: str, fresh_records: list[dict]) -> dict:
-    # Deduplicate fresh records by entry_id (keep last occurrence)
-    fresh_by_id = {r["entry_id"]: r for r in fresh_records}
-    fresh_records = list(fresh_by_id.values())
-
-    existing = db.get_all_records(table_name)
-    existing_by_id = {r["entry_id"]: r for r in existing}
-    fresh_ids = set(fresh_by_id.keys())
-
-    # Only upsert records where status changed or record is new
-    to_upsert = []
-    for record in fresh_records:
-        entry_id = record["entry_id"]
-        existing_record = existing_by_id.get(entry_id)
-
-        if existing_record is None:
-            # New record
-            record["updated_at"] = datetime.now(timezone.utc).isoformat()
-            to_upsert.append(record)
-
-            # Enqueue social post job for new player
-            _enqueue_new_player_event(table_name, record)
-
-        elif record.get("status") != existing_record.get("status"):
-            # Status changed
-            record["updated_at"] = datetime.now(timezone.utc).isoformat()
-            to_upsert.append(record)
-
-            # Enqueue social post job for status change
-            _enqueue_status_change_event(
-                table_name,
-                record,
-                old_status=existing_record.get("status"),
-                new_status=record.get("status"),
+# Scraped fields covered by content_hash; a change to any of them is written.
+# Unknown tables track every field of the fetched record.
+TRACKED_FIELDS = {
+    "recruits": ("name", "position", "hometown", "stars", "rating", "status", "player_url"),
+    "portal": ("name", "position", "direction", "source_school", "status", "player_url"),
+}
+_UNTRACKED = {"entry_id", "content_hash", "updated_at"}
+
+
+@dataclass
+class _SyncPlan:
+    """Writes and events needed to bring a team's table in line with a fetch."""
+
+    to_upsert: list[dict] = field(default_factory=list)
+    new_records: list[dict] = field(default_factory=list)
+    status_changes: list[tuple[dict, str | None]] = field(default_factory=list)
+    field_changes: list[tuple[dict, dict]] = field(default_factory=list)
+    stale_records: list[dict] = field(default_factory=list)
+    # Changed columns per updated entry_id, for SYNC_CHANGED_COLUMNS_ONLY writes
+    changed_columns: dict[str, list[str]] = field(default_factory=dict)
+
+    @property
+    def stale_ids(self) -> list[str]:
+        return [r["entry_id"] for r in self.stale_records]
+
+    def write_rows(self) -> list[list[dict]]:
+        """
+        Rows to upsert, grouped so every row in a group has the same columns.
+
+        Full records by default. With SYNC_CHANGED_COLUMNS_ONLY, updated rows
+        carry only their changed columns, so each group is a separate upsert
+        (a bulk upsert would null out columns missing from some rows).
+        """
+        if not config.SYNC_CHANGED_COLUMNS_ONLY:
+            return [self.to_upsert] if self.to_upsert else []
+        groups: dict[tuple[str, ...], list[dict]] = {}
+        for record in self.to_upsert:
+            changed = self.changed_columns.get(record["entry_id"])
+            row = (
+                record
+                if changed is None
+                else {key: record[key] for key in ("entry_id", *changed, "content_hash", "updated_at")}
             )
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        return list(groups.values())
+
+
+def _tracked_fields(table_name: str, record: dict) -> tuple[str, ...]:
+    return TRACKED_FIELDS.get(table_name) or tuple(k for k in record if k not in _UNTRACKED)
+
+
+def _event_fields() -> set[str]:
+    return {f.strip() for f in config.EVENT_FIELDS.split(",") if f.strip()}
+
+
+def _changed_fields(record: dict, existing: dict, fields: tuple[str, ...]) -> list[str]:
+    """Tracked fields whose value differs, among those present on the existing row."""
+    return [f for f in fields if f in existing and record.get(f) != existing.get(f)]
+
+
+def _add_upsert(plan: _SyncPlan, table_name: str, record: dict, existing_record: dict | None) -> None:
+    """Plan the write and events for a record that is new or whose content changed."""
+    record["updated_at"] = datetime.now(timezone.utc).isoformat()
+    plan.to_upsert.append(record)
+    if existing_record is None:
+        plan.new_records.append(record)
+        return
+
+    changed = _changed_fields(record, existing_record, _tracked_fields(table_name, record))
+    if changed:
+        plan.changed_columns[record["entry_id"]] = changed
+
+    event_fields = _event_fields()
+    if "status" in changed and "status" in event_fields:
+        plan.status_changes.append((record, existing_record.get("status")))
+    updates = {
+        f: {"old": existing_record.get(f), "new": record.get(f)} for f in changed if f != "status" and f in event_fields
+    }
+    if updates:
+        plan.field_changes.append((record, updates))
+
+
+def _with_content_hashes(table_name: str, fresh_records: list[dict]) -> dict[str, dict]:
+    """Deduplicate fresh records by entry_id (keeping the last) and set their content_hash."""
+    fresh_by_id = {r["entry_id"]: r for r in fresh_records}
+    for record in fresh_by_id.values():
+        record["content_hash"] = state.record_hash(record, _tracked_fields(table_name, record))
+    return fresh_by_id
+
+
+def _plan_sync(table_name: str, fresh_records: list[dict], existing: list[dict]) -> _SyncPlan:
+    """Diff fresh records against existing ones by entry_id and content hash."""
+    with span("sync.diff", rows=len(fresh_records)):
+        fresh_by_id = _with_content_hashes(table_name, fresh_records)
+        existing_by_id = {r["entry_id"]: r for r in existing}
+
+        # Only upsert records whose tracked content changed or that are new
+        plan = _SyncPlan()
+        for entry_id, record in fresh_by_id.items():
+            existing_record = existing_by_id.get(entry_id)
+            if existing_record is not None:
+                # Rows written before content_hash existed are hashed on the fly
+                stored_hash = existing_record.get("content_hash") or state.record_hash(
+                    existing_record, _tracked_fields(table_name, record)
+                )
+                if record["content_hash"] == stored_hash:
+                    continue
+            _add_upsert(plan, table_name, record, existing_record)
+
+        # Records no longer in source
+        plan.stale_records = [r for entry_id, r in existing_by_id.items() if entry_id not in fresh_by_id]
+    return plan
+
+
+def _rpc_records(fresh_by_id: dict[str, dict]) -> list[dict]:
+    """Fresh records stamped for the sync RPC, which only writes the changed ones."""
+    updated_at = datetime.now(timezone.utc).isoformat()
+    return [{**record, "updated_at": updated_at} for record in fresh_by_id.values()]
+
+
+def _plan_from_rpc(table_name: str, fresh_by_id: dict[str, dict], response: dict) -> _SyncPlan:
+    """Rebuild the plan sync_team_table carried out, for events and the snapshot."""
+    plan = _SyncPlan()
+    for row in response.get("upserted") or []:
+        _add_upsert(plan, table_name, fresh_by_id[row["entry_id"]], row.get("old"))
+    plan.stale_records = response.get("deleted") or []
+    return plan
+
+
+def _enqueue_upsert_events(batch: EventBatch, table_name: str, plan: _SyncPlan, team_id: str | None) -> None:
+    """Collect new_player and status_change jobs for a plan."""
+    for record in plan.new_records:
+        _enqueue_new_player_event(batch, table_name, record, team_id=team_id)
+    for record, old_status in plan.status_changes:
+        _enqueue_status_change_event(
+            batch,
+            table_name,
+            record,
+            old_status=old_status,
+            new_status=record.get("status"),
+            team_id=team_id,
+        )
+    for record, changes in plan.field_changes:
+        _enqueue_player_updated_event(batch, table_name, record, changes, team_id=team_id)
+
+
+def _enqueue_removed_events(batch: EventBatch, table_name: str, plan: _SyncPlan, team_id: str | None) -> None:
+    """Collect player_removed jobs for a plan's stale records."""
+    for stale_record in plan.stale_records:
+        _enqueue_player_removed_event(batch, table_name, stale_record, team_id=team_id)
+
+
+def _flush_events(batch: EventBatch, table_name: str) -> None:
+    """Enqueue collected jobs in one round-trip, logging any that failed."""
+    try:
+        results = batch.flush()
+    except Exception:
+        # Log but don't fail the sync
+        logger.exception("Failed to enqueue social post jobs", extra={"table": table_name})
+        return
+    failed = results.count(False)
+    if failed:
+        logger.warning(
+            "Some social post jobs were not enqueued",
+            extra={"table": table_name, "failed": failed, "total": len(results)},
+        )
+
+
+def _state_team(team_id: str | None) -> str:
+    """Team the local state is keyed on: team_id, else the configured TEAM (as db.get_team_id)."""
+    state_team = team_id or config.TEAM
+    if not state_team:
+        raise ValueError("TEAM environment variable is required")
+    return state_team
+
+
+def _skip_unchanged(table_name: str, state_team: str, fingerprint: str | None) -> bool:
+    """
+    Check whether the fetched payload matches the last synced one.
+
+    A Supabase reconciliation that is due still runs, so manual edits or
+    drift in the table are caught while the page stays unchanged. The RPC
+    path never reads the table, so it skips on the fingerprint alone.
+    """
+    if fingerprint is None or state.get_fingerprint(state_team, table_name) != fingerprint:
+        return False
+    reads_table = config.OUTBOX_ENABLED or not config.SYNC_VIA_RPC
+    if reads_table and state.needs_reconciliation(state_team, table_name, config.SNAPSHOT_RECONCILE_SECONDS):
+        logger.info(f"[{table_name}] Unchanged, but reconciliation is due", extra={"team": state_team})
+        return False
+    logger.info(f"[{table_name}] Unchanged since last sync, skipping", extra={"team": state_team})
+    return True
+
+
+def _finish_sync(table_name: str, state_team: str, plan: _SyncPlan, fingerprint: str | None, reconciled: bool) -> dict:
+    if fingerprint is not None:
+        state.set_fingerprint(state_team, table_name, fingerprint)
+
+    logger.info(f"[{table_name}] Upserted: {len(plan.to_upsert)}, Deleted: {len(plan.stale_records)}")
+    return {
+        "upserted": len(plan.to_upsert),
+        "deleted": len(plan.stale_records),
+        "skipped": False,
+        "reconciled": reconciled,
+    }
 
-    if to_upsert:
-        db.upsert_records(table_name, to_upsert)
 
-    # Delete records no longer in source
-    stale_ids = set(existing_by_id.keys()) - fresh_ids
-    if stale_ids:
-        # Enqueue player_removed events before deletion
-        for stale_id in stale_ids:
-            stale_record = existing_by_id[stale_id]
-            _enqueue_player_removed_event(table_name, stale_record)
-        db.delete_records(table_name, list(stale_ids))
+def _outbox_events(table_name: str, plan: _SyncPlan, team_id: str | None) -> list[dict]:
+    """Outbox rows for every event a plan produces, written with the plan's changes."""
+    batch = EventBatch()
+    _enqueue_upsert_events(batch, table_name, plan, team_id)
+    _enqueue_removed_events(batch, table_name, plan, team_id)
+    return outbox_events(batch)
 
-    logger.info(f"[{table_name}] Upserted: {len(to_upsert)}, Deleted: {len(stale_ids)}")
-    return {"upserted": len(to_upsert), "deleted": len(stale_ids)}
 
+def _finish_outbox_sync(
+    table_name: str, state_team: str, plan: _SyncPlan, fingerprint: str | None, reconciled: bool
+) -> dict:
+    """Mirror a committed apply_sync into local state; the relay sends its events."""
+    state.apply_upserts(state_team, table_name, plan.to_upsert)
+    state.apply_deletes(state_team, table_name, plan.stale_ids)
+    return _finish_sync(table_name, state_team, plan, fingerprint, reconciled)
 
-def _enqueue_new_player_event(table_name: str, record: dict) -> None:
-    """Enqueue job for new player event with error handling."""
+
+def _finish_rpc_sync(
+    table_name: str,
+    team_id: str | None,
+    state_team: str,
+    fresh_by_id: dict[str, dict],
+    response: dict,
+    fingerprint: str | None,
+) -> dict:
+    """Enqueue events and update local state after a committed sync_team_table call."""
+    plan = _plan_from_rpc(table_name, fresh_by_id, response)
+    state.apply_upserts(state_team, table_name, plan.to_upsert)
+    state.apply_deletes(state_team, table_name, plan.stale_ids)
+
+    # The RPC committed upserts and deletes together, so every event goes out in one flush
+    batch = EventBatch()
+    _enqueue_upsert_events(batch, table_name, plan, team_id)
+    _enqueue_removed_events(batch, table_name, plan, team_id)
+    _flush_events(batch, table_name)
+    return _finish_sync(table_name, state_team, plan, fingerprint, reconciled=False)
+
+
+_SKIPPED = {"upserted": 0, "deleted": 0, "skipped": True, "reconciled": False}
+
+
+def sync_table(
+    table_name: str,
+    fresh_records: list[dict],
+    team_id: str | None = None,
+    fingerprint: str | None = None,
+) -> dict:
+    state_team = _state_team(team_id)
+
+    # Skip entirely (no reads, no writes) when the fetched payload is unchanged
+    if _skip_unchanged(table_name, state_team, fingerprint):
+        return dict(_SKIPPED)
+
+    if config.OUTBOX_ENABLED:
+        existing, reconciled = _load_existing(table_name, team_id, state_team)
+        plan = _plan_sync(table_name, fresh_records, existing)
+        if plan.to_upsert or plan.stale_records:
+            events = _outbox_events(table_name, plan, team_id)
+            db.apply_sync(table_name, plan.to_upsert, plan.stale_ids, events, team_id)
+        return _finish_outbox_sync(table_name, state_team, plan, fingerprint, reconciled)
+
+    if config.SYNC_VIA_RPC:
+        fresh_by_id = _with_content_hashes(table_name, fresh_records)
+        response = db.sync_via_rpc(table_name, _rpc_records(fresh_by_id), team_id=team_id)
+        return _finish_rpc_sync(table_name, team_id, state_team, fresh_by_id, response, fingerprint)
+
+    existing, reconciled = _load_existing(table_name, team_id, state_team)
+    plan = _plan_sync(table_name, fresh_records, existing)
+
+    # Events are flushed once their write lands, so a failed write sends nothing
+    batch = EventBatch()
+    _enqueue_upsert_events(batch, table_name, plan, team_id)
+    if plan.to_upsert:
+        for rows in plan.write_rows():
+            db.upsert_records(table_name, rows, team_id=team_id)
+        state.apply_upserts(state_team, table_name, plan.to_upsert)
+    _flush_events(batch, table_name)
+
+    if plan.stale_records:
+        # Collect player_removed events from the rows before deletion
+        _enqueue_removed_events(batch, table_name, plan, team_id)
+        db.delete_records(table_name, plan.stale_ids, team_id=team_id)
+        state.apply_deletes(state_team, table_name, plan.stale_ids)
+        _flush_events(batch, table_name)
+
+    return _finish_sync(table_name, state_team, plan, fingerprint, reconciled)
+
+
+async def async_sync_table(
+    table_name: str,
+    fresh_records: list[dict],
+    team_id: str | None = None,
+    fingerprint: str | None = None,
+) -> dict:
+    """Asyncio variant of sync_table using the async Supabase client."""
+    state_team = _state_team(team_id)
+
+    if _skip_unchanged(table_name, state_team, fingerprint):
+        return dict(_SKIPPED)
+
+    if config.OUTBOX_ENABLED:
+        existing, reconciled = await _async_load_existing(table_name, team_id, state_team)
+        plan = _plan_sync(table_name, fresh_records, existing)
+        if plan.to_upsert or plan.stale_records:
+            events = _outbox_events(table_name, plan, team_id)
+            await db.async_apply_sync(table_name, plan.to_upsert, plan.stale_ids, events, team_id)
+        return _finish_outbox_sync(table_name, state_team, plan, fingerprint, reconciled)
+
+    if config.SYNC_VIA_RPC:
+        fresh_by_id = _with_content_hashes(table_name, fresh_records)
+        response = await db.async_sync_via_rpc(table_name, _rpc_records(fresh_by_id), team_id=team_id)
+        return await asyncio.to_thread(
+            _finish_rpc_sync, table_name, team_id, state_team, fresh_by_id, response, fingerprint
+        )
+
+    existing, reconciled = await _async_load_existing(table_name, team_id, state_team)
+    plan = _plan_sync(table_name, fresh_records, existing)
+
+    # RQ only speaks blocking Redis, so flushes run off the event loop
+    batch = EventBatch()
+    _enqueue_upsert_events(batch, table_name, plan, team_id)
+    if plan.to_upsert:
+        await asyncio.gather(
+            *(db.async_upsert_records(table_name, rows, team_id=team_id) for rows in plan.write_rows())
+        )
+        state.apply_upserts(state_team, table_name, plan.to_upsert)
+    await asyncio.to_thread(_flush_events, batch, table_name)
+
+    if plan.stale_records:
+        _enqueue_removed_events(batch, table_name, plan, team_id)
+        await db.async_delete_records(table_name, plan.stale_ids, team_id=team_id)
+        state.apply_deletes(state_team, table_name, plan.stale_ids)
+        await asyncio.to_thread(_flush_events, batch, table_name)
+
+    return _finish_sync(table_name, state_team, plan, fingerprint, reconciled)
+
+
+def _load_existing(table_name: str, team_id: str | None, state_team: str) -> tuple[list[dict], bool]:
+    """
+    Load the records to diff against: the local snapshot, or Supabase when due.
+
+    A full Supabase read happens on the first sync of a team's table and then
+    every SNAPSHOT_RECONCILE_SECONDS to catch drift; it replaces the snapshot.
+
+    Returns:
+        tuple: (existing records, whether they were read from Supabase)
+    """
+    if not state.needs_reconciliation(state_team, table_name, config.SNAPSHOT_RECONCILE_SECONDS):
+        snapshot = state.load_snapshot(state_team, table_name)
+        if snapshot is not None:
+            return snapshot, False
+
+    existing = db.get_all_records(table_name, team_id=team_id, columns=SYNC_COLUMNS.get(table_name, "*"))
+    state.save_snapshot(state_team, table_name, existing)
+    return existing, True
+
+
+async def _async_load_existing(table_name: str, team_id: str | None, state_team: str) -> tuple[list[dict], bool]:
+    """Asyncio variant of _load_existing."""
+    if not state.needs_reconciliation(state_team, table_name, config.SNAPSHOT_RECONCILE_SECONDS):
+        snapshot = state.load_snapshot(state_team, table_name)
+        if snapshot is not None:
+            return snapshot, False
+
+    existing = await db.async_get_all_records(table_name, team_id=team_id, columns=SYNC_COLUMNS.get(table_name, "*"))
+    state.save_snapshot(state_team, table_name, existing)
+    return existing, True
+
+
+def _enqueue_new_player_event(batch: EventBatch, table_name: str, record: dict, team_id: str | None = None) -> None:
+    """Collect job for new player event with error handling."""
     try:
-        enqueue_event(
+        batch.add(
             event_type="new_player",
             table=table_name,
             player_data=record,
+            team=team_id,
         )
     except Exception:
         # Log but don't fail the sync
@@ -76,19 +412,22 @@ def _enqueue_new_player_event(table_name: str, record: dict) -> None:
 
 
 def _enqueue_status_change_event(
+    batch: EventBatch,
     table_name: str,
     record: dict,
     old_status: str | None,
     new_status: str | None,
+    team_id: str | None = None,
 ) -> None:
-    """Enqueue job for status change event with error handling."""
+    """Collect job for status change event with error handling."""
     try:
-        enqueue_event(
+        batch.add(
             event_type="status_change",
             table=table_name,
             player_data=record,
             old_status=old_status,
             new_status=new_status,
+            team=team_id,
         )
     except Exception:
         # Log but don't fail the sync
@@ -103,13 +442,34 @@ def _enqueue_status_change_event(
         )
 
 
-def _enqueue_player_removed_event(table_name: str, record: dict) -> None:
-    """Enqueue job for player removed event with error handling."""
+def _enqueue_player_updated_event(
+    batch: EventBatch, table_name: str, record: dict, changes: dict, team_id: str | None = None
+) -> None:
+    """Collect job for an EVENT_FIELDS change other than status, with error handling."""
+    try:
+        batch.add(
+            event_type="player_updated",
+            table=table_name,
+            player_data=record,
+            changes=changes,
+            team=team_id,
+        )
+    except Exception:
+        # Log but don't fail the sync
+        logger.exception(
+            "Failed to enqueue player updated event",
+            extra={"table": table_name, "player": record.get("name"), "fields": sorted(changes)},
+        )
+
+
+def _enqueue_player_removed_event(batch: EventBatch, table_name: str, record: dict, team_id: str | None = None) -> None:
+    """Collect job for player removed event with error handling."""
     try:
-        enqueue_event(
+        batch.add(
             event_type="player_removed",
             table=table_name,
             player_data=record,
+            team=team_id,
         )
     except Exception:
         # Log but don't fail the sync
@@ -0,0 +1,63 @@
+"""Team context for syncing one or many teams in a single process."""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from cfb_tracker.config import config
+
+
+@dataclass(frozen=True)
+class Team:
+    """A team to sync: its database team_id and its 247Sports lookup."""
+
+    team_id: str
+    name_247: str
+    year: int
+
+
+def _team_from_dict(entry: dict) -> Team:
+    """Build a Team from a TEAMS entry, falling back to TEAM_247_YEAR."""
+    if not isinstance(entry, dict):
+        raise ValueError(f"Team entry must be a JSON object: {entry!r}")  # noqa: TRY004
+    team_id = entry.get("team")
+    name_247 = entry.get("team_247_name")
+    year = entry.get("team_247_year") or config.TEAM_247_YEAR
+    if not team_id or not name_247 or not year:
+        raise ValueError(f"Team entry requires team, team_247_name and team_247_year: {entry}")
+    return Team(team_id=team_id, name_247=name_247, year=int(year))
+
+
+def load_teams() -> list[Team]:
+    """
+    Load the teams to sync from TEAMS_FILE, TEAMS or the single-team config.
+
+    TEAMS_FILE and TEAMS hold a JSON list of objects with "team",
+    "team_247_name" and optional "team_247_year" keys.
+
+    Returns:
+        list[Team]: Teams in configured order (empty if nothing is configured)
+
+    Raises:
+        ValueError: If the team list is malformed or contains duplicate teams
+    """
+    if config.TEAMS_FILE:
+        raw = Path(config.TEAMS_FILE).read_text()
+    elif config.TEAMS:
+        raw = config.TEAMS
+    else:
+        team, name_247, year = config.TEAM, config.TEAM_247_NAME, config.TEAM_247_YEAR
+        if not (team and name_247 and year):
+            return []
+        return [Team(team_id=team, name_247=name_247, year=year)]
+
+    entries = json.loads(raw)
+    if not isinstance(entries, list):
+        raise ValueError("TEAMS must be a JSON list of team objects")  # noqa: TRY004
+
+    teams = [_team_from_dict(entry) for entry in entries]
+    team_ids = [team.team_id for team in teams]
+    duplicates = sorted({t for t in team_ids if team_ids.count(t) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate teams in TEAMS: {', '.join(duplicates)}")
+    return teams
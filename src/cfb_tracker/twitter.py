@@ -1,15 +1,161 @@
 """X (Twitter) client and posting functionality."""
 
 import logging
+import time
 
+import requests
 import tweepy
+from redis import Redis
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError
+from urllib3.util import Retry
 
 from cfb_tracker.config import config
 
 logger = logging.getLogger(__name__)
 
 _client: tweepy.Client | None = None
+_session: requests.Session | None = None
 _twitter_enabled = False
+_redis: Redis | None = None
+_redis_checked = False
+
+RATE_LIMIT_KEY = "cfb_tracker:x-rate-limit"
+DEFAULT_RETRY_SECONDS = 60.0
+
+# Refill each window's bucket for the time elapsed, then take one token from
+# every bucket or none. Returns 0 when taken, else ms until all have a token.
+# KEYS: one bucket per window; ARGV: capacity and window ms per bucket
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local wait = 0
+local levels = {}
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local window = tonumber(ARGV[2 * i])
+    local state = redis.call('HMGET', key, 'tokens', 'ts', 'blocked_until')
+    local level = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    local blocked = tonumber(state[3]) or 0
+    if blocked > now then
+        wait = math.max(wait, blocked - now)
+    elseif blocked > 0 then
+        -- X's window reset has passed: its full quota is back
+        level = capacity
+        redis.call('HDEL', key, 'blocked_until')
+    else
+        level = math.min(capacity, level + (now - ts) * capacity / window)
+        if level < 1 then
+            wait = math.max(wait, math.ceil((1 - level) * window / capacity))
+        end
+    end
+    levels[i] = level
+end
+for i, key in ipairs(KEYS) do
+    local level = levels[i]
+    if wait == 0 then
+        level = level - 1
+    end
+    redis.call('HSET', key, 'tokens', tostring(level), 'ts', now)
+    redis.call('PEXPIRE', key, tonumber(ARGV[2 * i]) * 2)
+end
+return wait
+"""
+
+# Overwrite buckets with the quota X reported; an exhausted one stays blocked
+# until its reset. KEYS: buckets; ARGV: remaining, reset ms, window ms per bucket
+_RESYNC_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+for i, key in ipairs(KEYS) do
+    local remaining = tonumber(ARGV[3 * i - 2])
+    local reset = tonumber(ARGV[3 * i - 1])
+    local window = tonumber(ARGV[3 * i])
+    redis.call('HSET', key, 'tokens', remaining, 'ts', now)
+    if remaining < 1 and reset > now then
+        redis.call('HSET', key, 'blocked_until', reset)
+    else
+        redis.call('HDEL', key, 'blocked_until')
+    end
+    redis.call('PEXPIRE', key, math.max(window, reset - now) * 2)
+end
+return 0
+"""
+
+# (remaining, reset) header pairs X sends for each write window
+_LIMIT_HEADERS = {
+    "15m": [("x-rate-limit-remaining", "x-rate-limit-reset")],
+    "24h": [
+        ("x-user-limit-24hour-remaining", "x-user-limit-24hour-reset"),
+        ("x-app-limit-24hour-remaining", "x-app-limit-24hour-reset"),
+    ],
+}
+
+
+class RateLimitedError(Exception):
+    """Raised when no X write slot is free; retry_after is seconds until one opens."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"X write limit reached, next slot in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class _ResetRetry(Retry):
+    """Retry that re-sends a POST only when the connection broke before X answered."""
+
+    def _is_read_error(self, err: Exception) -> bool:
+        # A read timeout may mean X got the tweet; a reset or dropped keep-alive
+        # connection did not. Timeouts fall through to the `other` budget (0).
+        return isinstance(err, ProtocolError)
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter applying a default timeout, since tweepy does not pass one."""
+
+    def __init__(self, timeout: tuple[float, float], **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if timeout is None:
+            timeout = self.timeout
+        return super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+
+def _build_session() -> requests.Session:
+    """
+    Keep-alive HTTP session for the X API, shared by every post in the process.
+
+    Connections to api.x.com stay open in a pool of X_HTTP_POOL_SIZE, so a
+    worker pays the TCP and TLS handshake once rather than per job. Every
+    request gets the configured connect/read timeouts, and connections that
+    fail to open or are reset before a response are retried with backoff.
+    Status codes are never retried here; 429s go through the rate limiter.
+
+    Returns:
+        requests.Session: Session to hand to tweepy.Client
+    """
+    retries = config.X_HTTP_CONNECT_RETRIES
+    adapter = _TimeoutHTTPAdapter(
+        timeout=(config.X_HTTP_CONNECT_TIMEOUT_SECONDS, config.X_HTTP_READ_TIMEOUT_SECONDS),
+        pool_connections=1,
+        pool_maxsize=config.X_HTTP_POOL_SIZE,
+        max_retries=_ResetRetry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=0,
+            other=0,
+            redirect=0,
+            allowed_methods=None,
+            backoff_factor=0.5,
+            raise_on_status=False,
+        ),
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return session
 
 
 def init_twitter() -> bool:
@@ -19,7 +165,7 @@ def init_twitter() -> bool:
     Returns:
         bool: True if X client initialized successfully, False otherwise
     """
-    global _client, _twitter_enabled
+    global _client, _session, _twitter_enabled
 
     # Check if all credentials are provided
     if not all([
@@ -39,6 +185,11 @@ def init_twitter() -> bool:
             access_token=config.X_ACCESS_TOKEN,
             access_token_secret=config.X_ACCESS_TOKEN_SECRET,
         )
+        # Replace tweepy's bare session with the pooled one, closing any from an earlier init
+        if _session is not None:
+            _session.close()
+        _session = _build_session()
+        _client.session = _session
         _twitter_enabled = True
         logger.info("X client initialized successfully")
     except Exception:
@@ -49,24 +200,123 @@ def init_twitter() -> bool:
         return True
 
 
-def post_tweet(message: str) -> dict | None:
+def _get_redis() -> Redis | None:
+    """Redis connection for the shared rate limiter, or None to post unthrottled."""
+    global _redis, _redis_checked
+    if not _redis_checked:
+        _redis_checked = True
+        if not config.REDIS_URL:
+            logger.warning("REDIS_URL not configured - X posts are not rate limited")
+            return None
+        try:
+            _redis = Redis.from_url(config.REDIS_URL, socket_connect_timeout=5)
+        except Exception:
+            logger.warning("Invalid REDIS_URL - X posts are not rate limited", exc_info=True)
+    return _redis
+
+
+def _windows() -> list[tuple[str, int, int]]:
+    """(name, capacity, seconds) for every enabled write window."""
+    windows = [("15m", config.X_POSTS_PER_15_MINUTES, 15 * 60), ("24h", config.X_POSTS_PER_24_HOURS, 24 * 3600)]
+    return [window for window in windows if window[1] > 0]
+
+
+def acquire_post_slot() -> float:
+    """
+    Take a write slot from the token buckets shared by every worker.
+
+    Returns:
+        float: 0 if a slot was taken, otherwise seconds until one opens.
+            Also 0 when the limiter is disabled or Redis is unreachable.
+    """
+    redis = _get_redis()
+    windows = _windows()
+    if redis is None or not windows:
+        return 0.0
+    keys = [f"{RATE_LIMIT_KEY}:{name}" for name, _, _ in windows]
+    args = [value for _, capacity, seconds in windows for value in (capacity, seconds * 1000)]
+    try:
+        wait_ms = redis.eval(_ACQUIRE_SCRIPT, len(keys), *keys, *args)
+    except Exception:
+        logger.warning("X rate limiter unavailable - posting without it", exc_info=True)
+        return 0.0
+    return int(wait_ms) / 1000
+
+
+def resync_rate_limits(headers) -> float:
     """
-    Post a tweet to X.
+    Reset the shared buckets from X's x-rate-limit / x-*-limit-24hour headers.
+
+    Args:
+        headers: Response headers of a create_tweet call
+
+    Returns:
+        float: Seconds until the latest reset of an exhausted window, or
+            DEFAULT_RETRY_SECONDS if the headers do not say
+    """
+    now = time.time()
+    keys, args = [], []
+    retry_after = 0.0
+    for name, capacity, seconds in _windows():
+        reported = [
+            (int(headers[remaining]), int(headers[reset]))
+            for remaining, reset in _LIMIT_HEADERS[name]
+            if remaining in headers and reset in headers
+        ]
+        if not reported:
+            continue
+        # The tightest of the user and app quotas is the one that binds
+        remaining, reset = min(reported)
+        if remaining < 1:
+            retry_after = max(retry_after, reset - now)
+        keys.append(f"{RATE_LIMIT_KEY}:{name}")
+        args += [min(remaining, capacity), reset * 1000, seconds * 1000]
+
+    redis = _get_redis()
+    if redis is not None and keys:
+        try:
+            redis.eval(_RESYNC_SCRIPT, len(keys), *keys, *args)
+        except Exception:
+            logger.warning("Failed to resync X rate limiter", exc_info=True)
+    return retry_after if retry_after > 0 else DEFAULT_RETRY_SECONDS
+
+
+def post_tweet(message: str, reply_to: str | None = None) -> dict | None:
+    """
+    Post a tweet to X once the shared rate limiter grants a write slot.
 
     Args:
         message: The tweet text to post (max 280 characters)
+        reply_to: Tweet ID to reply to, for posting a thread
 
     Returns:
         dict: Response data containing tweet ID if successful, None if disabled
 
     Raises:
+        RateLimitedError: If no slot opens within X_RATE_LIMIT_MAX_WAIT_SECONDS
+            or X answered 429 (the job should be rescheduled for retry_after)
         tweepy.TweepyException: If the API request fails (for retry handling)
     """
     if not _twitter_enabled or _client is None:
         logger.debug("X posting disabled - skipping tweet")
         return None
 
-    response = _client.create_tweet(text=message)
+    wait = acquire_post_slot()
+    if 0 < wait <= config.X_RATE_LIMIT_MAX_WAIT_SECONDS:
+        time.sleep(wait)
+        wait = acquire_post_slot()
+    if wait > 0:
+        raise RateLimitedError(wait)
+
+    try:
+        if reply_to is None:
+            response = _client.create_tweet(text=message)
+        else:
+            response = _client.create_tweet(text=message, in_reply_to_tweet_id=reply_to)
+    except tweepy.TooManyRequests as e:
+        retry_after = resync_rate_limits(e.response.headers)
+        logger.warning("X returned 429 - rate limiter resynced", extra={"retry_after_seconds": retry_after})
+        raise RateLimitedError(retry_after) from e
     return response.data
 
 
@@ -1,8 +1,13 @@
 import logging
+from datetime import datetime, timedelta, timezone
 
 from pythonjsonlogger.json import JsonFormatter
+from redis import Redis
+from rq import Queue, SimpleWorker
 
-from cfb_tracker.twitter import init_twitter, post_tweet
+from cfb_tracker.config import config
+from cfb_tracker.queue import PRIORITY_QUEUES, reschedule_current_job
+from cfb_tracker.twitter import RateLimitedError, init_twitter, post_tweet
 
 # Set up JSON logging for worker
 handler = logging.StreamHandler()
@@ -27,6 +32,7 @@ EMOJI_DECOMMITTED = "\U0001f614"  # 😔 pensive face
 EMOJI_SIGNED = "\U0001f4dd"  # 📝 memo
 EMOJI_PORTAL_ENTER = "\U0001f6a8"  # 🚨 rotating light
 EMOJI_PORTAL_WITHDRAW = "\u21a9\ufe0f"  # ↩️ return arrow
+EMOJI_UPDATED = "\U0001f504"  # 🔄 arrows (field update)
 
 
 def process_social_post(data: dict) -> dict:
@@ -44,6 +50,9 @@ def process_social_post(data: dict) -> dict:
     """
     logger.info("Processing social post job", extra={"job_data": data})
 
+    if data.get("event_type") == "digest":
+        return _process_digest(data)
+
     event_type = data.get("event_type")
     table = data.get("table")
     team = data.get("team")
@@ -61,7 +70,11 @@ def process_social_post(data: dict) -> dict:
     logger.info("Social post message generated", extra={"post_content": message, "player_name": player.get("name")})
 
     # Post to X (returns None if disabled)
-    tweet_result = post_tweet(message)
+    try:
+        tweet_result = post_tweet(message)
+    except RateLimitedError as e:
+        retry_at = _reschedule(data, e)
+        return {"success": False, "rescheduled_at": retry_at, "player": player.get("name"), "event_type": event_type}
 
     if tweet_result:
         logger.info("Posted to X", extra={"tweet_id": tweet_result.get("id")})
@@ -85,6 +98,81 @@ def process_social_post(data: dict) -> dict:
     }
 
 
+def _reschedule(data: dict, error: RateLimitedError) -> str:
+    """
+    Run a rate-limited job again when a slot opens instead of spending RQ's fixed retries.
+
+    Returns:
+        str: ISO time the job was rescheduled for
+
+    Raises:
+        RateLimitedError: If not running inside an RQ job
+    """
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=error.retry_after)
+    job_id = reschedule_current_job(data, retry_at)
+    if job_id is None:
+        raise error
+    logger.info(
+        "X write limit reached - job rescheduled",
+        extra={"event_type": data.get("event_type"), "retry_at": retry_at.isoformat(), "job_id": job_id},
+    )
+    return retry_at.isoformat()
+
+
+# Stay under X's 280 limit, which counts each emoji as two characters
+DIGEST_MAX_CHARS = 260
+
+
+def _digest_line(team: str, event: dict) -> str:
+    """One-line summary of an event: its post without the URL, emoji and text joined."""
+    message = _build_message(event["event_type"], event["table"], team, event.get("player", {}), event)
+    return " ".join(line for line in message.split("\n\n")[0].split("\n") if line)
+
+
+def _digest_parts(team: str, events: list[dict]) -> list[str]:
+    """Split a digest into thread posts of at most DIGEST_MAX_CHARS."""
+    parts = [f"{team} update ({len(events)})"]
+    for line in (_digest_line(team, event) for event in events):
+        if len(parts[-1]) + 1 + len(line) > DIGEST_MAX_CHARS:
+            parts.append(line[:DIGEST_MAX_CHARS])
+        else:
+            parts[-1] += f"\n{line}"
+    return parts
+
+
+def _process_digest(data: dict) -> dict:
+    """
+    Post a coalesced digest of a team's events as a thread.
+
+    A rate-limited digest is rescheduled with the posts still to send and
+    the tweet to reply to, so a resumed thread continues where it stopped.
+    """
+    team = data.get("team")
+    if not team or not data.get("events"):
+        error_msg = "Missing required fields in digest payload"
+        logger.error(error_msg, extra={"job_data": data})
+        raise ValueError(error_msg)
+
+    parts = data.get("parts") or _digest_parts(team, data["events"])
+    reply_to = data.get("reply_to")
+    tweet_ids = []
+    for i, part in enumerate(parts):
+        try:
+            tweet_result = post_tweet(part, reply_to=reply_to)
+        except RateLimitedError as e:
+            retry_at = _reschedule({**data, "parts": parts[i:], "reply_to": reply_to}, e)
+            return {"success": False, "rescheduled_at": retry_at, "event_type": "digest", "tweet_ids": tweet_ids}
+        if tweet_result:
+            reply_to = tweet_result.get("id")
+            tweet_ids.append(reply_to)
+
+    logger.info(
+        "Social digest job completed",
+        extra={"team": team, "events": len(data["events"]), "posts": len(parts), "tweet_ids": tweet_ids},
+    )
+    return {"success": True, "message": "\n\n".join(parts), "event_type": "digest", "tweet_ids": tweet_ids}
+
+
 def _format_stars(stars: int | None) -> str:
     """Format stars as repeated star emojis."""
     if not stars or stars < 1:
@@ -99,6 +187,30 @@ def _format_url_line(player_url: str | None) -> str:
     return ""
 
 
+def _format_value(value) -> str:
+    """Format a changed field's value, showing a cleared field as "none"."""
+    return "none" if value is None else str(value)
+
+
+def _format_changes(changes: dict | None) -> str:
+    """Format player_updated changes as "field: old → new", comma-separated."""
+    return ", ".join(
+        f"{field}: {_format_value(change.get('old'))} \u2192 {_format_value(change.get('new'))}"
+        for field, change in (changes or {}).items()
+    )
+
+
+def _build_update_message(table: str, team: str, player: dict, changes: dict | None) -> str:
+    """Build the message for a player_updated event: what changed, old → new."""
+    name = player.get("name")
+    position = player.get("position")
+    subject = "recruit" if table == "recruits" else "portal"
+    return (
+        f"{EMOJI_UPDATED}\n{team} {subject} update: {position} {name} - {_format_changes(changes)}"
+        f"{_format_url_line(player.get('player_url'))}"
+    )
+
+
 def _build_message(  # noqa: C901
     event_type: str,
     table: str,
@@ -108,6 +220,10 @@ def _build_message(  # noqa: C901
 ) -> str:
     """Build human-readable social media message based on event type and table."""
 
+    # Field updates carry the player's unchanged status, so they must not fall into the status templates
+    if event_type == "player_updated" and data.get("changes"):
+        return _build_update_message(table, team, player, data["changes"])
+
     name = player.get("name")
     position = player.get("position")
     player_url = player.get("player_url")
@@ -165,3 +281,29 @@ def _build_message(  # noqa: C901
 
     # Fallback for unhandled cases
     return f"Player update: {name} ({position}) - {team}"
+
+
+def run_worker(queue_names: tuple[str, ...] = PRIORITY_QUEUES, burst: bool = False) -> bool:
+    """
+    Process social post jobs in this process, without forking per job.
+
+    The default `rq worker` forks a child for every job, so each one
+    re-imports this module, re-runs init_twitter() and opens a fresh
+    connection to X. SimpleWorker runs jobs in the worker process itself,
+    keeping the X client and its connection pool warm across jobs. Queues
+    are drained in the order given (highest priority first) and scheduled
+    jobs (rate-limit reschedules, coalescing flushes) are enqueued when due.
+
+    Args:
+        queue_names: Queues to listen on, in priority order
+        burst: Exit once the queues are empty instead of waiting for jobs
+
+    Returns:
+        bool: True if any job was processed
+    """
+    if not config.REDIS_URL:
+        raise SystemExit("REDIS_URL is required to run the worker")
+    connection = Redis.from_url(config.REDIS_URL)
+    queues = [Queue(name, connection=connection) for name in queue_names]
+    logger.info("Starting social post worker", extra={"queues": list(queue_names), "burst": burst})
+    return SimpleWorker(queues, connection=connection).work(with_scheduler=True, burst=burst)
@@ -0,0 +1,14 @@
+-- content_hash: short hash of a row's tracked fields, written by every sync
+-- and compared to skip unchanged rows - by the Python diff (the default path
+-- and OUTBOX_ENABLED) and by sync_team_table (SYNC_VIA_RPC).
+--
+-- Tables created from the README already have it. Existing rows are not
+-- backfilled, so they start with a NULL content_hash:
+--   * the Python diff hashes such rows on the fly, so they are only written
+--     once they change;
+--   * sync_team_table compares the stored column (IS DISTINCT FROM), so the
+--     first SYNC_VIA_RPC sync rewrites every row with a NULL hash once. Their
+--     tracked fields are unchanged, so nothing is posted; later syncs skip them.
+
+ALTER TABLE IF EXISTS recruits ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE IF EXISTS portal ADD COLUMN IF NOT EXISTS content_hash TEXT;
@@ -0,0 +1,112 @@
+-- Server-side sync for one team's recruits or portal table (SYNC_VIA_RPC=true).
+--
+-- p_records holds the full fresh fetch for the team, one JSON object per row
+-- with identical keys, content_hash set and entry_ids unique. In a single
+-- transaction the function:
+--   * upserts the rows that are new or whose content_hash differs,
+--   * deletes the team's rows whose entry_id is missing from p_records,
+-- and returns {"upserted": [{"entry_id", "old"}], "deleted": [row, ...]}
+-- where "old" is the row that was replaced (null for new rows).
+--
+-- p_request_id makes retries safe: the client sends the same id on every
+-- attempt, and a call whose id already committed returns the stored result
+-- instead of diffing against its own writes (which would report no changes
+-- and lose the social post events). Results are kept for a day.
+--
+-- Requires the content_hash column (20261016000000_content_hash.sql).
+
+CREATE TABLE IF NOT EXISTS sync_rpc_results (
+    request_id TEXT PRIMARY KEY,
+    result JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+ALTER TABLE sync_rpc_results ENABLE ROW LEVEL SECURITY;
+
+DROP FUNCTION IF EXISTS public.sync_team_table(text, text, jsonb);
+
+CREATE OR REPLACE FUNCTION public.sync_team_table(
+    p_table text,
+    p_team_id text,
+    p_records jsonb,
+    p_request_id text DEFAULT NULL
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+SET search_path = public
+AS $$
+DECLARE
+    v_cols text;
+    v_excluded text;
+    v_upserted jsonb;
+    v_deleted jsonb;
+    v_result jsonb;
+BEGIN
+    IF p_table NOT IN ('recruits', 'portal') THEN
+        RAISE EXCEPTION 'sync_team_table: unsupported table %', p_table;
+    END IF;
+
+    -- Serialize concurrent syncs of the same team's table
+    PERFORM pg_advisory_xact_lock(hashtext(p_table || ':' || p_team_id));
+
+    -- A retry of a call that already committed gets that call's result
+    IF p_request_id IS NOT NULL THEN
+        SELECT r.result INTO v_result FROM sync_rpc_results r WHERE r.request_id = p_request_id;
+        IF FOUND THEN
+            RETURN v_result;
+        END IF;
+    END IF;
+
+    -- Fresh rows that are new or changed, with the row they replace
+    EXECUTE format(
+        'SELECT coalesce(jsonb_agg(jsonb_build_object(
+                    ''entry_id'', f.entry_id,
+                    ''old'', CASE WHEN o.id IS NULL THEN NULL ELSE to_jsonb(o) END
+                )), ''[]''::jsonb)
+           FROM jsonb_populate_recordset(NULL::%1$I, $1) f
+           LEFT JOIN %1$I o ON o.team_id = $2 AND o.entry_id = f.entry_id
+          WHERE o.id IS NULL OR o.content_hash IS DISTINCT FROM f.content_hash',
+        p_table
+    ) INTO v_upserted USING p_records, p_team_id;
+
+    -- Columns to write are the keys of the fresh records
+    SELECT string_agg(format('%I', key), ', '), string_agg(format('EXCLUDED.%I', key), ', ')
+      INTO v_cols, v_excluded
+      FROM jsonb_object_keys(coalesce(p_records -> 0, '{}'::jsonb)) AS key
+     WHERE key NOT IN ('id', 'team_id');
+
+    IF v_cols IS NOT NULL AND jsonb_array_length(v_upserted) > 0 THEN
+        EXECUTE format(
+            'INSERT INTO %1$I (team_id, %2$s)
+             SELECT $2, %2$s
+               FROM jsonb_populate_recordset(NULL::%1$I, $1) f
+              WHERE f.entry_id IN (SELECT u ->> ''entry_id'' FROM jsonb_array_elements($3) u)
+             ON CONFLICT (team_id, entry_id) DO UPDATE SET (%2$s) = ROW(%3$s)',
+            p_table, v_cols, v_excluded
+        ) USING p_records, p_team_id, v_upserted;
+    END IF;
+
+    EXECUTE format(
+        'WITH removed AS (
+             DELETE FROM %1$I t
+              WHERE t.team_id = $2
+                AND t.entry_id NOT IN (SELECT f.entry_id FROM jsonb_populate_recordset(NULL::%1$I, $1) f)
+             RETURNING t.*
+         )
+         SELECT coalesce(jsonb_agg(to_jsonb(removed)), ''[]''::jsonb) FROM removed',
+        p_table
+    ) INTO v_deleted USING p_records, p_team_id;
+
+    v_result := jsonb_build_object('upserted', v_upserted, 'deleted', v_deleted);
+    IF p_request_id IS NOT NULL THEN
+        DELETE FROM sync_rpc_results WHERE created_at < now() - interval '1 day';
+        INSERT INTO sync_rpc_results (request_id, result) VALUES (p_request_id, v_result);
+    END IF;
+    RETURN v_result;
+END;
+$$;
+
+-- The sync service authenticates with the service role key; keep the
+-- function out of reach of anon/authenticated API clients.
+REVOKE EXECUTE ON FUNCTION public.sync_team_table(text, text, jsonb, text) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.sync_team_table(text, text, jsonb, text) TO service_role;
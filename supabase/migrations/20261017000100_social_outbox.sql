@@ -0,0 +1,75 @@
+-- Transactional outbox for social post events (OUTBOX_ENABLED=true).
+--
+-- sync writes a table's upserts, deletes and the events they produce with
+-- apply_sync in one transaction; the relay (cfb_tracker.outbox) drains
+-- pending rows to RQ and stamps enqueued_at. Upserted records carry
+-- content_hash (20261016000000_content_hash.sql).
+
+CREATE TABLE IF NOT EXISTS social_outbox (
+    id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    team_id TEXT NOT NULL,
+    event_key TEXT NOT NULL,
+    payload JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    enqueued_at TIMESTAMPTZ
+);
+
+-- At most one pending copy of an event; it may recur once the first was relayed
+CREATE UNIQUE INDEX IF NOT EXISTS idx_social_outbox_pending_key
+    ON social_outbox (event_key) WHERE enqueued_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_social_outbox_pending
+    ON social_outbox (id) WHERE enqueued_at IS NULL;
+
+ALTER TABLE social_outbox ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION public.apply_sync(
+    p_table text,
+    p_team_id text,
+    p_upserts jsonb,
+    p_delete_ids text[],
+    p_events jsonb
+)
+RETURNS void
+LANGUAGE plpgsql
+SET search_path = public
+AS $$
+DECLARE
+    v_cols text;
+    v_excluded text;
+BEGIN
+    IF p_table NOT IN ('recruits', 'portal') THEN
+        RAISE EXCEPTION 'apply_sync: unsupported table %', p_table;
+    END IF;
+
+    -- Serialize concurrent syncs of the same team's table
+    PERFORM pg_advisory_xact_lock(hashtext(p_table || ':' || p_team_id));
+
+    -- Columns to write are the keys of the upserted records
+    SELECT string_agg(format('%I', key), ', '), string_agg(format('EXCLUDED.%I', key), ', ')
+      INTO v_cols, v_excluded
+      FROM jsonb_object_keys(coalesce(p_upserts -> 0, '{}'::jsonb)) AS key
+     WHERE key NOT IN ('id', 'team_id');
+
+    IF v_cols IS NOT NULL THEN
+        EXECUTE format(
+            'INSERT INTO %1$I (team_id, %2$s)
+             SELECT $2, %2$s FROM jsonb_populate_recordset(NULL::%1$I, $1)
+             ON CONFLICT (team_id, entry_id) DO UPDATE SET (%2$s) = ROW(%3$s)',
+            p_table, v_cols, v_excluded
+        ) USING p_upserts, p_team_id;
+    END IF;
+
+    IF coalesce(array_length(p_delete_ids, 1), 0) > 0 THEN
+        EXECUTE format('DELETE FROM %I WHERE team_id = $1 AND entry_id = ANY($2)', p_table)
+            USING p_team_id, p_delete_ids;
+    END IF;
+
+    INSERT INTO social_outbox (team_id, event_key, payload)
+    SELECT p_team_id, e ->> 'event_key', e -> 'payload'
+      FROM jsonb_array_elements(coalesce(p_events, '[]'::jsonb)) AS e
+    ON CONFLICT (event_key) WHERE enqueued_at IS NULL DO NOTHING;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.apply_sync(text, text, jsonb, text[], jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.apply_sync(text, text, jsonb, text[], jsonb) TO service_role;
@@ -16,6 +16,21 @@ from unittest.mock import MagicMock, patch
 import pytest
 from cfb_cli import Player, Recruit, RecruitData, RecruitStatus, TransferPortalData, TransferStatus
 
+from cfb_tracker import state
+
+# ============================================================================
+# Local State
+# ============================================================================
+
+
+@pytest.fixture(autouse=True)
+def reset_state():
+    """Give every test a fresh in-memory state database."""
+    state.reset()
+    yield
+    state.reset()
+
+
 # ============================================================================
 # Mock Config
 # ============================================================================
@@ -29,10 +44,51 @@ def mock_config():
     config.SUPABASE_KEY = "test-key"
     config.RECRUITS_TABLE = "recruits"
     config.PORTAL_TABLE = "portal"
+    config.DB_PAGE_SIZE = 1000
+    config.DB_WRITE_CHUNK_ROWS = 500
+    config.DB_WRITE_CHUNK_BYTES = 1_000_000
+    config.DB_DELETE_CHUNK_SIZE = 200
+    config.DB_WRITE_CONCURRENCY = 4
+    config.DB_WRITE_RETRIES = 3
+    config.DB_RETRY_BACKOFF_SECONDS = 0
     config.TEAM_247_NAME = "test"
     config.TEAM_247_YEAR = 2026
     config.REDIS_URL = "redis://localhost:6379"
     config.TEAM = "Test Tigers"
+    config.EVENT_FIELDS = "status"
+    config.SYNC_CHANGED_COLUMNS_ONLY = False
+    config.SYNC_VIA_RPC = False
+    config.OUTBOX_ENABLED = False
+    config.OUTBOX_BATCH_SIZE = 500
+    config.EVENT_DEDUP_TTL_SECONDS = 21600
+    config.PRIORITY_HIGH_STARS = 4
+    config.PRIORITY_HIGH_RATING = 0.89
+    config.PRIORITY_LOW_STARS = 2
+    config.COALESCE_WINDOW_SECONDS = 0
+    config.COALESCE_DIGEST_MIN_EVENTS = 3
+    config.TEAMS = None
+    config.TEAMS_FILE = None
+    config.FETCH_CONCURRENCY = 2
+    config.SCRAPER_MAX_USES = 50
+    config.ASYNC_IO = False
+    config.STATE_PATH = ":memory:"
+    config.SNAPSHOT_RECONCILE_SECONDS = 3600
+    config.METRICS_PROMETHEUS_FILE = None
+    config.METRICS_OTEL = False
+    config.DAEMON = False
+    config.CYCLE_INTERVAL_SECONDS = 600
+    config.CYCLE_JITTER_SECONDS = 30
+    config.POLL_MIN_SECONDS = 120
+    config.POLL_MAX_SECONDS = 3600
+    config.HOT_WINDOWS = None
+    config.POLL_HOT_MAX_SECONDS = 300
+    config.X_POSTS_PER_15_MINUTES = 100
+    config.X_POSTS_PER_24_HOURS = 17
+    config.X_RATE_LIMIT_MAX_WAIT_SECONDS = 5
+    config.X_HTTP_POOL_SIZE = 4
+    config.X_HTTP_CONNECT_TIMEOUT_SECONDS = 5
+    config.X_HTTP_READ_TIMEOUT_SECONDS = 30
+    config.X_HTTP_CONNECT_RETRIES = 2
     return config
 
 
@@ -0,0 +1,281 @@
+"""Tests for the coalesce module - holding and merging events before posting."""
+
+import json
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from redis.exceptions import WatchError
+
+from cfb_tracker import coalesce as coalesce_module
+from cfb_tracker import queue as queue_module
+from cfb_tracker.coalesce import merge
+
+
+def _event(event_type, entry_id="a", table="recruits", team="Auburn Tigers", **fields):
+    return {"event_type": event_type, "table": table, "team": team, "player": {"entry_id": entry_id}, **fields}
+
+
+class FakeRedis:
+    """Just enough of Redis - hashes, SET NX and WATCH/MULTI pipelines - to interleave hold and take."""
+
+    def __init__(self):
+        self.data: dict[str, dict] = {}
+        self.versions: dict[str, int] = {}
+        self.on_read = None
+
+    def _touch(self, key):
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def hmget(self, key, fields):
+        values = [self.data.get(key, {}).get(field) for field in fields]
+        if self.on_read:
+            hook, self.on_read = self.on_read, None
+            hook()
+        return values
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+        self._touch(key)
+
+    def hdel(self, key, *fields):
+        for field in fields:
+            self.data.get(key, {}).pop(field, None)
+        self._touch(key)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+        self._touch(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return False
+        self.data[key] = value
+        self._touch(key)
+        return True
+
+
+class FakePipeline:
+    """Runs commands immediately while WATCHing, queues them otherwise."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.reset()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.reset()
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            if self.queued:
+                self.commands.append((name, args, kwargs))
+                return self
+            return getattr(self.redis, name)(*args, **kwargs)
+
+        return command
+
+    def reset(self):
+        self.watched, self.commands, self.queued = {}, [], True
+
+    def watch(self, key):
+        self.watched[key] = self.redis.versions.get(key, 0)
+        self.queued = False
+
+    def multi(self):
+        self.queued = True
+
+    def execute(self):
+        try:
+            if any(self.redis.versions.get(key, 0) != version for key, version in self.watched.items()):
+                raise WatchError
+            return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        finally:
+            self.reset()
+
+
+@pytest.fixture
+def config(mock_config):
+    mock_config.COALESCE_WINDOW_SECONDS = 300
+    with patch.object(coalesce_module, "config", mock_config):
+        yield mock_config
+
+
+class TestMerge:
+    """Tests for merge function."""
+
+    def test_status_flip_back_cancels(self):
+        """Should drop a committed -> decommitted -> committed flip."""
+        first = _event("status_change", old_status="committed", new_status="decommitted")
+        second = _event("status_change", old_status="decommitted", new_status="committed")
+
+        assert merge(first, second) is None
+
+    def test_status_changes_collapse(self):
+        """Should keep one change from the first old status to the last new one."""
+        first = _event("status_change", old_status="uncommitted", new_status="committed")
+        second = _event("status_change", old_status="committed", new_status="signed")
+
+        merged = merge(first, second)
+
+        assert (merged["old_status"], merged["new_status"]) == ("uncommitted", "signed")
+
+    @pytest.mark.parametrize(("first", "second"), [("new_player", "player_removed"), ("player_removed", "new_player")])
+    def test_added_and_removed_cancel(self, first, second):
+        """Should drop a player that appears and disappears within the window."""
+        assert merge(_event(first), _event(second)) is None
+
+    def test_new_player_takes_latest_status(self):
+        """Should post a new player once, with the status it ended on."""
+        merged = merge(
+            _event("new_player", status="committed"),
+            _event("status_change", old_status="committed", new_status="signed"),
+        )
+
+        assert merged["event_type"] == "new_player"
+        assert merged["status"] == "signed"
+
+    def test_field_updates_merge_and_revert(self):
+        """Should keep net field changes and drop ones that reverted."""
+        first = _event(
+            "player_updated", changes={"stars": {"old": 3, "new": 4}, "position": {"old": "QB", "new": "ATH"}}
+        )
+        second = _event(
+            "player_updated", changes={"stars": {"old": 4, "new": 5}, "position": {"old": "ATH", "new": "QB"}}
+        )
+
+        assert merge(first, second)["changes"] == {"stars": {"old": 3, "new": 5}}
+
+    def test_newer_event_wins(self):
+        """Should keep the newer event when the two do not combine."""
+        second = _event("player_removed")
+
+        assert merge(_event("status_change", old_status="committed", new_status="decommitted"), second) is second
+
+
+class TestHold:
+    """Tests for hold function."""
+
+    def test_buffers_and_schedules_flush(self, config):
+        """Should store events per player and schedule one flush for the team."""
+        flush_queue = MagicMock()
+        connection = flush_queue.connection
+        pipe = connection.pipeline.return_value.__enter__.return_value
+        pipe.hmget.return_value = [None]
+        connection.set.return_value = True
+
+        coalesce_module.hold(flush_queue, [_event("new_player", status="committed")])
+
+        pipe.watch.assert_called_once_with("cfb-tracker:coalesce:Auburn Tigers")
+        mapping = pipe.hset.call_args[1]["mapping"]
+        assert json.loads(mapping["recruits:a:status"])["event_type"] == "new_player"
+        connection.set.assert_called_once_with("cfb-tracker:coalesce-scheduled:Auburn Tigers", 1, nx=True, ex=660)
+        flush_queue.enqueue_in.assert_called_once_with(
+            timedelta(seconds=300), coalesce_module.FLUSH_FUNC, "Auburn Tigers", job_timeout="5m"
+        )
+
+    def test_cancels_against_held_event(self, config):
+        """Should delete a held event that a newer one cancels out."""
+        flush_queue = MagicMock()
+        connection = flush_queue.connection
+        pipe = connection.pipeline.return_value.__enter__.return_value
+        held = _event("status_change", old_status="committed", new_status="decommitted")
+        pipe.hmget.return_value = [json.dumps(held)]
+        connection.set.return_value = False
+
+        coalesce_module.hold(flush_queue, [_event("status_change", old_status="decommitted", new_status="committed")])
+
+        pipe.hdel.assert_called_once_with("cfb-tracker:coalesce:Auburn Tigers", "recruits:a:status")
+        pipe.hset.assert_not_called()
+        flush_queue.enqueue_in.assert_not_called()
+
+    def test_retries_merge_when_buffer_changes(self, config):
+        """Should re-read the buffer when the WATCHed write is aborted."""
+        flush_queue = MagicMock()
+        pipe = flush_queue.connection.pipeline.return_value.__enter__.return_value
+        held = _event("status_change", old_status="uncommitted", new_status="committed")
+        pipe.hmget.side_effect = [[json.dumps(held)], [None]]
+        pipe.execute.side_effect = [WatchError, []]
+
+        coalesce_module.hold(flush_queue, [_event("status_change", old_status="committed", new_status="signed")])
+
+        merged = json.loads(pipe.hset.call_args[1]["mapping"]["recruits:a:status"])
+        assert (merged["old_status"], merged["new_status"]) == ("committed", "signed")
+        assert pipe.watch.call_count == 2
+
+    def test_take_during_merge_is_not_written_back(self, config):
+        """Should not write events a concurrent take() already released back into the buffer."""
+        redis = FakeRedis()
+        flush_queue = MagicMock(connection=redis)
+        coalesce_module.hold(flush_queue, [_event("status_change", old_status="uncommitted", new_status="committed")])
+        taken = []
+        redis.on_read = lambda: taken.extend(coalesce_module.take(redis, "Auburn Tigers"))
+
+        coalesce_module.hold(flush_queue, [_event("status_change", old_status="committed", new_status="signed")])
+
+        assert [(e["old_status"], e["new_status"]) for e in taken] == [("uncommitted", "committed")]
+        held = coalesce_module.take(redis, "Auburn Tigers")
+        assert [(e["old_status"], e["new_status"]) for e in held] == [("committed", "signed")]
+        assert flush_queue.enqueue_in.call_count == 2
+
+
+class TestFlushTeam:
+    """Tests for flush_team job."""
+
+    def _flush(self, config, payloads, results):
+        batch = MagicMock()
+        batch.flush.return_value = results
+        with (
+            patch.object(queue_module, "is_available", return_value=True),
+            patch.object(queue_module, "flush_queue"),
+            patch.object(queue_module, "EventBatch", return_value=batch),
+            patch.object(queue_module, "config", config),
+            patch.object(coalesce_module, "take", return_value=payloads),
+            patch.object(coalesce_module, "hold") as mock_hold,
+        ):
+            result = coalesce_module.flush_team("Auburn Tigers")
+        return result, batch, mock_hold
+
+    def test_releases_events_individually(self, config):
+        """Should enqueue each event when fewer than the digest minimum were held."""
+        payloads = [_event("new_player", "a", status="committed"), _event("player_removed", "b")]
+
+        result, batch, mock_hold = self._flush(config, payloads, [True, True])
+
+        assert result == {"released": 2, "digest": False}
+        assert batch.add_payload.call_count == 2
+        mock_hold.assert_not_called()
+
+    def test_sends_digest(self, config):
+        """Should enqueue one digest job for a burst of events."""
+        payloads = [_event("new_player", entry_id, status="committed") for entry_id in "abc"]
+
+        result, batch, _ = self._flush(config, payloads, [True])
+
+        assert result == {"released": 3, "digest": True}
+        digest = batch.add_payload.call_args[0][0]
+        assert digest["event_type"] == "digest"
+        assert len(digest["events"]) == 3
+
+    def test_holds_failed_events_again(self, config):
+        """Should put events that failed to enqueue back in the buffer."""
+        payloads = [_event("new_player", "a", status="committed"), _event("player_removed", "b")]
+
+        _, _, mock_hold = self._flush(config, payloads, [True, False])
+
+        assert mock_hold.call_args[0][1] == [payloads[1]]
+
+    def test_nothing_held(self, config):
+        """Should do nothing when every held event cancelled out."""
+        result, batch, _ = self._flush(config, [], [])
+
+        assert result == {"released": 0, "digest": False}
+        batch.flush.assert_not_called()
@@ -1,6 +1,7 @@
 """Tests for the db module - team-scoped database operations."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -35,17 +36,23 @@ class TestGetTeamId:
                 db_module.get_team_id()
 
 
+def _mock_read_client(*pages):
+    """Mock client whose chained select queries return the given pages in order."""
+    mock_client = MagicMock()
+    mock_table = MagicMock()
+    mock_client.table.return_value = mock_table
+    for method in ("select", "eq", "gt", "order", "limit"):
+        getattr(mock_table, method).return_value = mock_table
+    mock_table.execute.side_effect = [MagicMock(data=page) for page in pages]
+    return mock_client, mock_table
+
+
 class TestGetAllRecords:
     """Tests for get_all_records with team filtering."""
 
     def test_filters_by_team_id(self, mock_config):
         """Should filter records by team_id."""
-        mock_client = MagicMock()
-        mock_table = MagicMock()
-        mock_client.table.return_value = mock_table
-        mock_table.select.return_value = mock_table
-        mock_table.eq.return_value = mock_table
-        mock_table.execute.return_value = MagicMock(data=[])
+        mock_client, mock_table = _mock_read_client([])
 
         with (
             patch.object(db_module, "get_client", return_value=mock_client),
@@ -60,13 +67,7 @@ class TestGetAllRecords:
     def test_returns_data_from_response(self, mock_config):
         """Should return data from Supabase response."""
         expected_data = [{"entry_id": "abc", "name": "Test Player"}]
-
-        mock_client = MagicMock()
-        mock_table = MagicMock()
-        mock_client.table.return_value = mock_table
-        mock_table.select.return_value = mock_table
-        mock_table.eq.return_value = mock_table
-        mock_table.execute.return_value = MagicMock(data=expected_data)
+        mock_client, _ = _mock_read_client(expected_data)
 
         with (
             patch.object(db_module, "get_client", return_value=mock_client),
@@ -76,6 +77,69 @@ class TestGetAllRecords:
 
         assert result == expected_data
 
+    def test_filters_by_explicit_team_id(self, mock_config):
+        """Should prefer an explicit team_id over the configured TEAM."""
+        mock_client, mock_table = _mock_read_client([])
+
+        with (
+            patch.object(db_module, "get_client", return_value=mock_client),
+            patch.object(db_module, "config", mock_config),
+        ):
+            db_module.get_all_records("recruits", team_id="Auburn Tigers")
+
+        mock_table.eq.assert_called_once_with("team_id", "Auburn Tigers")
+
+    def test_projects_columns(self, mock_config):
+        """Should select only the requested columns."""
+        mock_client, mock_table = _mock_read_client([])
+
+        with (
+            patch.object(db_module, "get_client", return_value=mock_client),
+            patch.object(db_module, "config", mock_config),
+        ):
+            db_module.get_all_records("recruits", columns="entry_id,status")
+
+        mock_table.select.assert_called_once_with("entry_id,status")
+
+
+class TestIterRecords:
+    """Tests for keyset-paginated reads."""
+
+    def test_follows_pages_until_short_page(self, mock_config):
+        """Should request pages after the last entry_id until a page comes back short."""
+        mock_config.DB_PAGE_SIZE = 2
+        pages = [
+            [{"entry_id": "a"}, {"entry_id": "b"}],
+            [{"entry_id": "c"}, {"entry_id": "d"}],
+            [{"entry_id": "e"}],
+        ]
+        mock_client, mock_table = _mock_read_client(*pages)
+
+        with (
+            patch.object(db_module, "get_client", return_value=mock_client),
+            patch.object(db_module, "config", mock_config),
+        ):
+            result = list(db_module.iter_records("recruits"))
+
+        assert result == pages
+        assert [c[0] for c in mock_table.gt.call_args_list] == [("entry_id", "b"), ("entry_id", "d")]
+        mock_table.order.assert_called_with("entry_id")
+        mock_table.limit.assert_called_with(2)
+
+    def test_stops_on_empty_page(self, mock_config):
+        """Should stop without yielding when a full page is followed by an empty one."""
+        mock_config.DB_PAGE_SIZE = 1
+        mock_client, mock_table = _mock_read_client([{"entry_id": "a"}], [])
+
+        with (
+            patch.object(db_module, "get_client", return_value=mock_client),
+            patch.object(db_module, "config", mock_config),
+        ):
+            result = db_module.get_all_records("recruits")
+
+        assert result == [{"entry_id": "a"}]
+        assert mock_table.execute.call_count == 2
+
 
 class TestUpsertRecords:
     """Tests for upsert_records with team_id injection."""
@@ -156,6 +220,23 @@ class TestUpsertRecords:
         assert len(upserted_records) == 2
         assert all(r["team_id"] == "Test Tigers" for r in upserted_records)
 
+    def test_uses_explicit_team_id(self, mock_config):
+        """Should tag records with an explicit team_id when given."""
+        mock_client = MagicMock()
+        mock_table = MagicMock()
+        mock_client.table.return_value = mock_table
+        mock_table.upsert.return_value = mock_table
+        mock_table.execute.return_value = MagicMock()
+
+        with (
+            patch.object(db_module, "get_client", return_value=mock_client),
+            patch.object(db_module, "config", mock_config),
+        ):
+            db_module.upsert_records("recruits", [{"entry_id": "abc"}], team_id="Auburn Tigers")
+
+        upserted_records = mock_table.upsert.call_args[0][0]
+        assert upserted_records[0]["team_id"] == "Auburn Tigers"
+
 
 class TestDeleteRecords:
     """Tests for delete_records with team scoping."""
@@ -208,3 +289,296 @@ class TestDeleteRecords:
             db_module.delete_records("recruits", ["single-id"])
 
         mock_table.in_.assert_called_once_with("entry_id", ["single-id"])
+
+    def test_scopes_delete_to_explicit_team(self, mock_config):
+        """Should filter delete by an explicit team_id when given."""
+        mock_client = MagicMock()
+        mock_table = MagicMock()
+        mock_client.table.return_value = mock_table
+        mock_table.delete.return_value = mock_table
+        mock_table.eq.return_value = mock_table
+        mock_table.in_.return_value = mock_table
+        mock_table.execute.return_value = MagicMock()
+
+        with (
+            patch.object(db_module, "get_client", return_value=mock_client),
+            patch.object(db_module, "config", mock_config),
+        ):
+            db_module.delete_records("recruits", ["id1"], team_id="Auburn Tigers")
+
+        mock_table.eq.assert_called_once_with("team_id", "Auburn Tigers")
+
+
+class TestChunkedWrites:
+    """Tests for chunked, retried upserts and deletes."""
+
+    def test_chunk_records_by_rows(self):
+        """Should start a new chunk once max_rows is reached."""
+        records = [{"entry_id": str(i)} for i in range(5)]
+
+        chunks = db_module._chunk_records(records, max_rows=2, max_bytes=1_000_000)
+
+        assert [len(c) for c in chunks] == [2, 2, 1]
+
+    def test_chunk_records_by_bytes(self):
+        """Should start a new chunk before exceeding max_bytes."""
+        records = [{"entry_id": str(i), "name": "x" * 100} for i in range(3)]
+
+        chunks = db_module._chunk_records(records, max_rows=100, max_bytes=300)
+
+        assert [len(c) for c in chunks] == [2, 1]
+
+    def test_upserts_in_chunks(self, mock_config):
+        """Should send one upsert request per chunk."""
+        mock_config.DB_WRITE_CHUNK_ROWS = 2
+        mock_client = MagicMock()
+        mock_table = MagicMock()
+        mock_client.table.return_value = mock_table
+        mock_table.upsert.return_value = mock_table
+
+        records = [{"entry_id": str(i)} for i in range(5)]
+
+        with (
+            patch.object(db_module, "get_client", return_value=mock_client),
+            patch.object(db_module, "config", mock_config),
+        ):
+            db_module.upsert_records("recruits", records)
+
+        sent = sorted(r["entry_id"] for c in mock_table.upsert.call_args_list for r in c[0][0])
+        assert mock_table.upsert.call_count == 3
+        assert sent == ["0", "1", "2", "3", "4"]
+
+    def test_deletes_in_chunks(self, mock_config):
+        """Should split stale ids across several in_() filters."""
+        mock_config.DB_DELETE_CHUNK_SIZE = 2
+        mock_client = MagicMock()
+        mock_table = MagicMock()
+        mock_client.table.return_value = mock_table
+        mock_table.delete.return_value = mock_table
+        mock_table.eq.return_value = mock_table
+        mock_table.in_.return_value = mock_table
+
+        with (
+            patch.object(db_module, "get_client", return_value=mock_client),
+            patch.object(db_module, "config", mock_config),
+        ):
+            db_module.delete_records("recruits", ["a", "b", "c"])
+
+        chunks = sorted(c[0][1] for c in mock_table.in_.call_args_list)
+        assert chunks == [["a", "b"], ["c"]]
+
+    def test_retries_failed_chunk(self, mock_config):
+        """Should retry a chunk that fails transiently."""
+        mock_client = MagicMock()
+        mock_table = MagicMock()
+        mock_client.table.return_value = mock_table
+        mock_table.upsert.return_value = mock_table
+        mock_table.execute.side_effect = [Exception("timeout"), MagicMock()]
+
+        with (
+            patch.object(db_module, "get_client", return_value=mock_client),
+            patch.object(db_module, "config", mock_config),
+        ):
+            db_module.upsert_records("recruits", [{"entry_id": "abc"}])
+
+        assert mock_table.execute.call_count == 2
+
+    def test_raises_after_retries_exhausted(self, mock_config):
+        """Should raise once every attempt for a chunk has failed."""
+        mock_config.DB_WRITE_RETRIES = 2
+        mock_client = MagicMock()
+        mock_table = MagicMock()
+        mock_client.table.return_value = mock_table
+        mock_table.upsert.return_value = mock_table
+        mock_table.execute.side_effect = Exception("request too large")
+
+        with (
+            patch.object(db_module, "get_client", return_value=mock_client),
+            patch.object(db_module, "config", mock_config),
+            pytest.raises(Exception, match="request too large"),
+        ):
+            db_module.upsert_records("recruits", [{"entry_id": "abc"}])
+
+        assert mock_table.execute.call_count == 2
+
+
+class TestAsyncVariants:
+    """Tests for the asyncio read/write path."""
+
+    def test_async_get_all_records_paginates(self, mock_config):
+        """Should follow keyset pages on the async client."""
+        mock_config.DB_PAGE_SIZE = 1
+        mock_client, mock_table = _mock_read_client()
+        mock_table.execute = AsyncMock(side_effect=[MagicMock(data=[{"entry_id": "a"}]), MagicMock(data=[])])
+
+        with (
+            patch.object(db_module, "get_async_client", AsyncMock(return_value=mock_client)),
+            patch.object(db_module, "config", mock_config),
+        ):
+            result = asyncio.run(db_module.async_get_all_records("recruits", team_id="Auburn Tigers"))
+
+        assert result == [{"entry_id": "a"}]
+        mock_table.eq.assert_called_with("team_id", "Auburn Tigers")
+        mock_table.gt.assert_called_once_with("entry_id", "a")
+
+    def test_async_upsert_chunks_and_tags_team(self, mock_config):
+        """Should upsert every chunk with team_id on the async client."""
+        mock_config.DB_WRITE_CHUNK_ROWS = 1
+        mock_client = MagicMock()
+        mock_table = MagicMock()
+        mock_client.table.return_value = mock_table
+        mock_table.upsert.return_value = mock_table
+        mock_table.execute = AsyncMock()
+
+        with (
+            patch.object(db_module, "get_async_client", AsyncMock(return_value=mock_client)),
+            patch.object(db_module, "config", mock_config),
+        ):
+            asyncio.run(db_module.async_upsert_records("recruits", [{"entry_id": "a"}, {"entry_id": "b"}]))
+
+        assert mock_table.execute.await_count == 2
+        sent = [r for c in mock_table.upsert.call_args_list for r in c[0][0]]
+        assert all(r["team_id"] == "Test Tigers" for r in sent)
+
+    def test_async_delete_retries(self, mock_config):
+        """Should retry a failed delete chunk on the async client."""
+        mock_client = MagicMock()
+        mock_table = MagicMock()
+        mock_client.table.return_value = mock_table
+        mock_table.delete.return_value = mock_table
+        mock_table.eq.return_value = mock_table
+        mock_table.in_.return_value = mock_table
+        mock_table.execute = AsyncMock(side_effect=[Exception("reset"), MagicMock()])
+
+        with (
+            patch.object(db_module, "get_async_client", AsyncMock(return_value=mock_client)),
+            patch.object(db_module, "config", mock_config),
+        ):
+            asyncio.run(db_module.async_delete_records("recruits", ["a"]))
+
+        assert mock_table.execute.await_count == 2
+
+
+class TestSyncViaRpc:
+    """Tests for the server-side sync RPC."""
+
+    def test_calls_rpc_with_team_and_records(self, mock_config):
+        """Should send the table, team_id and records and return the RPC's data."""
+        mock_client = MagicMock()
+        response = {"upserted": [{"entry_id": "a", "old": None}], "deleted": []}
+        mock_client.rpc.return_value.execute.return_value = MagicMock(data=response)
+        records = [{"entry_id": "a", "content_hash": "h"}]
+
+        with (
+            patch.object(db_module, "get_client", return_value=mock_client),
+            patch.object(db_module, "config", mock_config),
+        ):
+            result = db_module.sync_via_rpc("recruits", records, team_id="Auburn Tigers")
+
+        assert result == response
+        mock_client.rpc.assert_called_once()
+        name, params = mock_client.rpc.call_args[0]
+        assert name == "sync_team_table"
+        assert params["p_table"] == "recruits"
+        assert params["p_team_id"] == "Auburn Tigers"
+        assert params["p_records"] == records
+        assert params["p_request_id"]
+
+    def test_retries_transient_failure(self, mock_config):
+        """Should retry the RPC and return the successful attempt's data."""
+        mock_client = MagicMock()
+        mock_client.rpc.return_value.execute.side_effect = [Exception("timeout"), MagicMock(data={"deleted": []})]
+
+        with (
+            patch.object(db_module, "get_client", return_value=mock_client),
+            patch.object(db_module, "config", mock_config),
+        ):
+            result = db_module.sync_via_rpc("portal", [], team_id="Auburn Tigers")
+
+        assert result == {"deleted": []}
+
+    def test_retries_reuse_request_id(self, mock_config):
+        """Should send one request id on every attempt so a committed call is not re-applied."""
+        mock_client = MagicMock()
+        done = MagicMock(data={"deleted": []})
+        mock_client.rpc.return_value.execute.side_effect = [Exception("reset"), done, done]
+
+        with (
+            patch.object(db_module, "get_client", return_value=mock_client),
+            patch.object(db_module, "config", mock_config),
+        ):
+            db_module.sync_via_rpc("portal", [], team_id="Auburn Tigers")
+            db_module.sync_via_rpc("portal", [], team_id="Auburn Tigers")
+
+        ids = [c[0][1]["p_request_id"] for c in mock_client.rpc.call_args_list]
+        assert len(ids) == 3
+        assert ids[0] == ids[1] != ids[2]
+
+    def test_async_variant(self, mock_config):
+        """Should call the RPC on the async client."""
+        mock_client = MagicMock()
+        mock_client.rpc.return_value.execute = AsyncMock(return_value=MagicMock(data={"upserted": []}))
+
+        with (
+            patch.object(db_module, "get_async_client", AsyncMock(return_value=mock_client)),
+            patch.object(db_module, "config", mock_config),
+        ):
+            result = asyncio.run(db_module.async_sync_via_rpc("recruits", [], team_id="Auburn Tigers"))
+
+        assert result == {"upserted": []}
+
+
+class TestOutbox:
+    """Tests for the outbox reads, writes and apply_sync RPC."""
+
+    def test_apply_sync_sends_one_rpc(self, mock_config):
+        """Should send upserts, deletes and events for the team in one RPC."""
+        mock_client = MagicMock()
+        events = [{"event_key": "k", "payload": {"event_type": "new_player"}}]
+
+        with (
+            patch.object(db_module, "get_client", return_value=mock_client),
+            patch.object(db_module, "config", mock_config),
+        ):
+            db_module.apply_sync("recruits", [{"entry_id": "a"}], ["b"], events, team_id="Auburn Tigers")
+
+        mock_client.rpc.assert_called_once_with(
+            "apply_sync",
+            {
+                "p_table": "recruits",
+                "p_team_id": "Auburn Tigers",
+                "p_upserts": [{"entry_id": "a"}],
+                "p_delete_ids": ["b"],
+                "p_events": events,
+            },
+        )
+
+    def test_fetch_outbox_reads_pending_oldest_first(self, mock_config):
+        """Should select pending rows in id order, up to the limit."""
+        mock_client, mock_table = _mock_read_client([{"id": 1, "payload": {}}])
+        mock_table.is_.return_value = mock_table
+
+        with patch.object(db_module, "get_client", return_value=mock_client):
+            rows = db_module.fetch_outbox(50)
+
+        assert rows == [{"id": 1, "payload": {}}]
+        mock_client.table.assert_called_once_with("social_outbox")
+        mock_table.is_.assert_called_once_with("enqueued_at", "null")
+        mock_table.order.assert_called_once_with("id")
+        mock_table.limit.assert_called_once_with(50)
+
+    def test_mark_outbox_enqueued(self, mock_config):
+        """Should stamp enqueued_at on the given ids, and skip an empty list."""
+        mock_client = MagicMock()
+
+        with (
+            patch.object(db_module, "get_client", return_value=mock_client),
+            patch.object(db_module, "config", mock_config),
+        ):
+            db_module.mark_outbox_enqueued([])
+            db_module.mark_outbox_enqueued([1, 2])
+
+        update = mock_client.table.return_value.update
+        update.assert_called_once()
+        assert "enqueued_at" in update.call_args[0][0]
+        update.return_value.in_.assert_called_once_with("id", [1, 2])
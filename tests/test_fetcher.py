@@ -1,7 +1,11 @@
 """Tests for the fetcher module - data fetching and transformation."""
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
+import pytest
 from cfb_cli import Player, Recruit, RecruitStatus, TransferStatus
 
 from cfb_tracker import fetcher as fetcher_module
@@ -9,6 +13,15 @@ from cfb_tracker.fetcher import (
     _portal_to_dict,
     _recruit_to_dict,
 )
+from cfb_tracker.teams import Team
+
+
+@pytest.fixture(autouse=True)
+def reset_scraper_pool():
+    """Reset the shared scraper pool so each test sees its own mock scraper."""
+    fetcher_module._pool = None
+    yield
+    fetcher_module.close_scraper_pool()
 
 
 class TestRecruitToDict:
@@ -127,6 +140,24 @@ class TestPortalToDict:
         assert result["player_url"] is None
 
 
+class TestFingerprint:
+    """Tests for payload fingerprinting."""
+
+    def test_stable_across_page_order(self, sample_recruit, sample_recruit_no_url):
+        """Should not change when 247Sports reorders the same players."""
+        first = fetcher_module.fingerprint([sample_recruit, sample_recruit_no_url])
+        second = fetcher_module.fingerprint([sample_recruit_no_url, sample_recruit])
+
+        assert first == second
+
+    def test_changes_with_content(self, sample_recruit):
+        """Should change when any field of a player changes."""
+        before = fetcher_module.fingerprint([sample_recruit])
+        after = fetcher_module.fingerprint([{**sample_recruit, "rating": 0.96}])
+
+        assert before != after
+
+
 class TestFetchRecruits:
     """Tests for fetch_recruits function."""
 
@@ -160,6 +191,22 @@ class TestFetchRecruits:
 
         assert result == []
 
+    def test_uses_team_and_shared_scraper(self, mock_config, cfb_recruit_data):
+        """Should fetch the given team with the passed scraper instead of creating one."""
+        mock_scraper = MagicMock()
+        mock_scraper.fetch_recruit_data.return_value = cfb_recruit_data
+        team = Team(team_id="Auburn Tigers", name_247="auburn", year=2027)
+
+        with (
+            patch.object(fetcher_module, "config", mock_config),
+            patch.object(fetcher_module, "get_scraper") as mock_get_scraper,
+        ):
+            result = fetcher_module.fetch_recruits(team, scraper=mock_scraper)
+
+        assert len(result) == 2
+        mock_get_scraper.assert_not_called()
+        mock_scraper.fetch_recruit_data.assert_called_once_with("auburn", 2027)
+
 
 class TestFetchPortal:
     """Tests for fetch_portal function."""
@@ -196,3 +243,137 @@ class TestFetchPortal:
             result = fetcher_module.fetch_portal()
 
         assert result == []
+
+    def test_uses_team_and_shared_scraper(self, mock_config, cfb_portal_data):
+        """Should fetch the given team with the passed scraper instead of creating one."""
+        mock_scraper = MagicMock()
+        mock_scraper.fetch_portal_data.return_value = cfb_portal_data
+        team = Team(team_id="Auburn Tigers", name_247="auburn", year=2027)
+
+        with (
+            patch.object(fetcher_module, "config", mock_config),
+            patch.object(fetcher_module, "get_scraper") as mock_get_scraper,
+        ):
+            result = fetcher_module.fetch_portal(team, scraper=mock_scraper)
+
+        assert len(result) == 2
+        mock_get_scraper.assert_not_called()
+        mock_scraper.fetch_portal_data.assert_called_once_with("auburn", 2027)
+
+
+class TestScraperPool:
+    """Tests for ScraperPool reuse, recycling and thread affinity."""
+
+    @pytest.fixture
+    def mock_get_scraper(self):
+        with patch.object(fetcher_module, "get_scraper", side_effect=lambda *a, **k: MagicMock()) as mock_get:
+            yield mock_get
+
+    @pytest.fixture
+    def pool_factory(self, mock_get_scraper):
+        """Build pools with mock scrapers, closing them after the test."""
+        pools = []
+
+        def build(size=1, max_uses=10):
+            pool = fetcher_module.ScraperPool(size=size, max_uses=max_uses)
+            pools.append(pool)
+            return pool
+
+        yield build
+        for pool in pools:
+            pool.close()
+
+    def test_reuses_scraper_between_fetches(self, pool_factory, mock_get_scraper):
+        """Should hand the same scraper to the next fetch instead of launching a new one."""
+        pool = pool_factory()
+
+        first = pool.run(lambda scraper: scraper)
+        second = pool.run(lambda scraper: scraper)
+
+        assert first is second
+        mock_get_scraper.assert_called_once_with("247sports", headless=True)
+
+    def test_recycles_after_max_uses(self, pool_factory):
+        """Should close and relaunch a scraper once it reaches max_uses."""
+        pool = pool_factory(max_uses=2)
+
+        first = pool.run(lambda scraper: scraper)
+        again = pool.run(lambda scraper: scraper)
+        fresh = pool.run(lambda scraper: scraper)
+
+        assert first is again
+        assert fresh is not first
+        first.close.assert_called_once()
+
+    def test_discards_scraper_after_failure(self, pool_factory):
+        """Should close a scraper whose fetch raised rather than reuse it."""
+        pool = pool_factory()
+        used = []
+
+        def crash(scraper):
+            used.append(scraper)
+            raise RuntimeError("page crashed")
+
+        with pytest.raises(RuntimeError, match="page crashed"):
+            pool.run(crash)
+        replacement = pool.run(lambda scraper: scraper)
+
+        assert replacement is not used[0]
+        used[0].close.assert_called_once()
+
+    def test_close_tears_down_scrapers(self, pool_factory):
+        """Should close scrapers and refuse further fetches."""
+        pool = pool_factory()
+        scraper = pool.run(lambda scraper: scraper)
+
+        pool.close()
+
+        scraper.close.assert_called_once()
+        with pytest.raises(RuntimeError, match="closed"):
+            pool.run(lambda scraper: scraper)
+
+    def test_scraper_never_changes_thread(self, pool_factory, mock_get_scraper):
+        """Should launch, use and close each scraper on one thread, whichever thread asks."""
+        threads: dict[int, set[int]] = {}
+        lock = threading.Lock()
+
+        def new_scraper(*args, **kwargs):
+            scraper = MagicMock()
+            scraper.close.side_effect = lambda: record(scraper)
+            record(scraper)
+            return scraper
+
+        def record(scraper):
+            with lock:
+                threads.setdefault(id(scraper), set()).add(threading.get_ident())
+
+        mock_get_scraper.side_effect = new_scraper
+        pool = pool_factory(size=2, max_uses=3)
+
+        def fetch(scraper):
+            record(scraper)
+            time.sleep(0.001)
+
+        # Fresh caller threads every round, like a new ThreadPoolExecutor per cycle
+        for _ in range(3):
+            with ThreadPoolExecutor(max_workers=4) as callers:
+                list(callers.map(lambda _: pool.run(fetch), range(8)))
+        pool.close()
+
+        assert threads
+        assert all(len(idents) == 1 for idents in threads.values())
+
+    def test_fetches_share_pooled_scraper(self, mock_config, cfb_recruit_data, cfb_portal_data):
+        """Should launch one scraper for consecutive fetches without an explicit scraper."""
+        mock_scraper = MagicMock()
+        mock_scraper.fetch_recruit_data.return_value = cfb_recruit_data
+        mock_scraper.fetch_portal_data.return_value = cfb_portal_data
+
+        with (
+            patch.object(fetcher_module, "config", mock_config),
+            patch.object(fetcher_module, "get_scraper", return_value=mock_scraper) as mock_get,
+        ):
+            fetcher_module.fetch_recruits()
+            fetcher_module.fetch_portal()
+
+        mock_get.assert_called_once()
@@ -0,0 +1,160 @@
+"""Tests for the identity module - collision-free entry_ids."""
+
+from unittest.mock import patch
+
+import pytest
+
+from cfb_tracker import identity as identity_module
+from cfb_tracker import state as state_module
+from cfb_tracker import sync as sync_module
+from cfb_tracker.identity import assign_entry_ids
+from cfb_tracker.normalizer import generate_id
+from cfb_tracker.sync import _plan_sync
+
+SMITH_ID = generate_id("John Smith")
+
+
+def _recruit(name, url=None, position="QB", hometown="Birmingham, AL"):
+    return {
+        "entry_id": generate_id(name),
+        "name": name,
+        "position": position,
+        "hometown": hometown,
+        "player_url": url,
+    }
+
+
+JOHN = _recruit("John Smith", url="https://247sports.com/player/john-smith-1")
+JAKE = _recruit("Jake Smith", url="https://247sports.com/player/jake-smith-2", position="WR")
+
+
+@pytest.fixture(autouse=True)
+def mock_db():
+    """Supabase holds no rows unless a test says otherwise."""
+    with patch.object(identity_module, "db") as mock:
+        mock.get_all_records.return_value = []
+        yield mock
+
+
+class TestAssignEntryIds:
+    """Tests for assign_entry_ids function."""
+
+    def test_unique_names_keep_generated_ids(self):
+        """Should leave records alone when nothing collides."""
+        other = _recruit("Mike Jones")
+
+        result = assign_entry_ids("Auburn Tigers", "recruits", [JOHN, other])
+
+        assert result == [JOHN, other]
+
+    def test_disambiguates_colliding_players(self):
+        """Should give two players sharing a name key different ids, one keeping the base id."""
+        result = assign_entry_ids("Auburn Tigers", "recruits", [JOHN, JAKE])
+
+        ids = [r["entry_id"] for r in result]
+        assert ids[0] != ids[1]
+        assert SMITH_ID in ids
+
+    def test_independent_of_page_order(self):
+        """Should assign the same ids whichever colliding player is listed first."""
+        forward = assign_entry_ids("Auburn Tigers", "recruits", [JOHN, JAKE])
+        state_module.reset()
+        backward = assign_entry_ids("Auburn Tigers", "recruits", [JAKE, JOHN])
+
+        assert forward == backward[::-1]
+
+    def test_ids_stable_across_runs(self):
+        """Should keep a player's id when the colliding player appears later."""
+        first = assign_entry_ids("Auburn Tigers", "recruits", [JAKE])
+        second = assign_entry_ids("Auburn Tigers", "recruits", [JOHN, JAKE])
+
+        assert second[1]["entry_id"] == first[0]["entry_id"] == SMITH_ID
+        assert second[0]["entry_id"] != SMITH_ID
+
+    def test_absent_holders_id_is_taken_over(self):
+        """Should give a departed player's id to the next player, and not back to the departed one."""
+        assign_entry_ids("Auburn Tigers", "recruits", [JOHN])
+        taken_over = assign_entry_ids("Auburn Tigers", "recruits", [JAKE])
+
+        result = assign_entry_ids("Auburn Tigers", "recruits", [JOHN, JAKE])
+
+        assert taken_over[0]["entry_id"] == SMITH_ID
+        assert result[1]["entry_id"] == SMITH_ID
+        assert result[0]["entry_id"] != SMITH_ID
+
+    @pytest.mark.parametrize("change", [{"position": "ATH"}, {"hometown": "Mobile, AL"}])
+    @pytest.mark.parametrize("fresh_store", [False, True])
+    def test_player_without_url_keeps_id_through_edit(self, mock_db, mock_config, change, fresh_store):
+        """Should keep a url-less player's id when its position or hometown changes, so the sync posts an update."""
+        before = assign_entry_ids("Auburn Tigers", "recruits", [_recruit("John Smith")])
+        if fresh_store:
+            state_module.reset()
+            mock_db.get_all_records.return_value = before
+
+        after = assign_entry_ids("Auburn Tigers", "recruits", [{**_recruit("John Smith"), **change}])
+
+        assert after[0]["entry_id"] == before[0]["entry_id"] == SMITH_ID
+        mock_config.EVENT_FIELDS = "status,position,hometown"
+        with patch.object(sync_module, "config", mock_config):
+            plan = _plan_sync("recruits", after, before)
+        assert (plan.new_records, plan.stale_records) == ([], [])
+        assert [changes for _, changes in plan.field_changes] == [
+            {field: {"old": before[0][field], "new": value} for field, value in change.items()}
+        ]
+
+    def test_falls_back_to_name_position_hometown(self):
+        """Should tell players without urls apart by position and hometown."""
+        qb = _recruit("John Smith")
+        lb = _recruit("John Smith", position="LB", hometown="Mobile, AL")
+
+        result = assign_entry_ids("Auburn Tigers", "recruits", [qb, lb])
+
+        assert result[0]["entry_id"] != result[1]["entry_id"]
+
+    def test_same_player_listed_twice_shares_id(self):
+        """Should give duplicate listings of one player the same id."""
+        result = assign_entry_ids("Auburn Tigers", "recruits", [JOHN, dict(JOHN)])
+
+        assert result[0]["entry_id"] == result[1]["entry_id"] == SMITH_ID
+
+    def test_scoped_by_team(self):
+        """Should not reserve one team's ids for another team."""
+        assign_entry_ids("Auburn Tigers", "recruits", [JOHN])
+
+        result = assign_entry_ids("LSU Tigers", "recruits", [JAKE])
+
+        assert result[0]["entry_id"] == SMITH_ID
+
+    def test_fresh_store_keeps_synced_holder_on_base_id(self, mock_db):
+        """Should seed from Supabase rows so a newcomer cannot take a synced player's id."""
+        first = assign_entry_ids("Auburn Tigers", "recruits", [JOHN])
+        # A cron run starts with an empty in-memory store
+        state_module.reset()
+        mock_db.get_all_records.return_value = first
+
+        result = assign_entry_ids("Auburn Tigers", "recruits", [JOHN, JAKE])
+
+        assert result[0]["entry_id"] == SMITH_ID
+        assert result[1]["entry_id"] != SMITH_ID
+
+    def test_seed_reads_supabase_once_and_saves_snapshot(self, mock_db):
+        """Should save the seeding read as the snapshot and persist the seeded ids."""
+        mock_db.get_all_records.return_value = [JOHN]
+
+        first = assign_entry_ids("Auburn Tigers", "recruits", [JOHN, JAKE])
+        result = assign_entry_ids("Auburn Tigers", "recruits", [JAKE])
+
+        mock_db.get_all_records.assert_called_once()
+        assert state_module.load_snapshot("Auburn Tigers", "recruits") == [JOHN]
+        assert first[0]["entry_id"] == SMITH_ID
+        assert result[0]["entry_id"] == first[1]["entry_id"] != SMITH_ID
+
+    def test_seeds_from_snapshot_without_reading_supabase(self, mock_db):
+        """Should seed from a reconciled local snapshot when one exists."""
+        state_module.save_snapshot("Auburn Tigers", "recruits", [JOHN])
+
+        result = assign_entry_ids("Auburn Tigers", "recruits", [JAKE, JOHN])
+
+        mock_db.get_all_records.assert_not_called()
+        assert result[1]["entry_id"] == SMITH_ID
+        assert result[0]["entry_id"] != SMITH_ID
@@ -0,0 +1,285 @@
+"""Tests for the main module - cycle orchestration."""
+
+import asyncio
+import os
+import signal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cfb_tracker import identity as identity_module
+from cfb_tracker import main as main_module
+from cfb_tracker.teams import Team
+
+AUBURN = Team(team_id="Auburn Tigers", name_247="auburn", year=2026)
+LSU = Team(team_id="LSU Tigers", name_247="lsu", year=2026)
+
+
+@pytest.fixture(autouse=True)
+def no_synced_rows():
+    """Seed entry_ids from an empty Supabase instead of a real one."""
+    with patch.object(identity_module, "db") as mock_db:
+        mock_db.get_all_records.return_value = []
+        yield mock_db
+
+
+class TestRunCycle:
+    """Tests for run_cycle function."""
+
+    def test_fetches_and_syncs_every_team_and_table(self, mock_config, sample_recruit, sample_portal_incoming):
+        """Should sync recruits and portal for each team with its team_id."""
+        mock_sync = MagicMock(return_value={"upserted": 1, "deleted": 0})
+
+        with (
+            patch.object(main_module, "config", mock_config),
+            patch.object(main_module, "fetch_recruits", return_value=[sample_recruit]),
+            patch.object(main_module, "fetch_portal", return_value=[sample_portal_incoming]),
+            patch.object(main_module, "sync_table", mock_sync),
+        ):
+            failed = main_module.run_cycle([AUBURN, LSU])
+
+        assert failed == []
+        synced = {(c[0][0], c[1]["team_id"]) for c in mock_sync.call_args_list}
+        assert synced == {
+            ("recruits", "Auburn Tigers"),
+            ("portal", "Auburn Tigers"),
+            ("recruits", "LSU Tigers"),
+            ("portal", "LSU Tigers"),
+        }
+
+    def test_skips_sync_when_nothing_fetched(self, mock_config):
+        """Should not sync a table whose fetch returned no records."""
+        mock_sync = MagicMock()
+
+        with (
+            patch.object(main_module, "config", mock_config),
+            patch.object(main_module, "fetch_recruits", return_value=[]),
+            patch.object(main_module, "fetch_portal", return_value=[]),
+            patch.object(main_module, "sync_table", mock_sync),
+        ):
+            failed = main_module.run_cycle([AUBURN])
+
+        assert failed == []
+        mock_sync.assert_not_called()
+
+    def test_isolates_failing_team(self, mock_config, sample_recruit):
+        """Should report a failing team and still sync the others."""
+
+        def sync_side_effect(table, records, team_id=None, fingerprint=None):
+            if team_id == "LSU Tigers":
+                raise RuntimeError("db down")
+            return {"upserted": 0, "deleted": 0}
+
+        mock_sync = MagicMock(side_effect=sync_side_effect)
+
+        with (
+            patch.object(main_module, "config", mock_config),
+            patch.object(main_module, "fetch_recruits", return_value=[sample_recruit]),
+            patch.object(main_module, "fetch_portal", return_value=[]),
+            patch.object(main_module, "sync_table", mock_sync),
+        ):
+            failed = main_module.run_cycle([AUBURN, LSU])
+
+        assert failed == ["LSU Tigers"]
+        assert mock_sync.call_count == 2
+
+
+class TestRunCycleAsync:
+    """Tests for run_cycle_async function."""
+
+    def test_syncs_every_team_and_table(self, mock_config, sample_recruit, sample_portal_incoming):
+        """Should sync recruits and portal for each team on the event loop."""
+        mock_sync = AsyncMock(return_value={"upserted": 1, "deleted": 0})
+
+        with (
+            patch.object(main_module, "config", mock_config),
+            patch.object(main_module, "async_fetch_recruits", AsyncMock(return_value=[sample_recruit])),
+            patch.object(main_module, "async_fetch_portal", AsyncMock(return_value=[sample_portal_incoming])),
+            patch.object(main_module, "async_sync_table", mock_sync),
+        ):
+            failed = asyncio.run(main_module.run_cycle_async([AUBURN, LSU]))
+
+        assert failed == []
+        synced = {(c[0][0], c[1]["team_id"]) for c in mock_sync.call_args_list}
+        assert len(synced) == 4
+
+    def test_isolates_failing_team(self, mock_config, sample_recruit):
+        """Should report a failing team and still sync the others."""
+
+        async def sync_side_effect(table, records, team_id=None, fingerprint=None):
+            if team_id == "LSU Tigers":
+                raise RuntimeError("db down")
+            return {"upserted": 0, "deleted": 0}
+
+        with (
+            patch.object(main_module, "config", mock_config),
+            patch.object(main_module, "async_fetch_recruits", AsyncMock(return_value=[sample_recruit])),
+            patch.object(main_module, "async_fetch_portal", AsyncMock(return_value=[])),
+            patch.object(main_module, "async_sync_table", AsyncMock(side_effect=sync_side_effect)),
+        ):
+            failed = asyncio.run(main_module.run_cycle_async([AUBURN, LSU]))
+
+        assert failed == ["LSU Tigers"]
+
+
+class TestRunCycleDue:
+    """Tests for restricting a cycle to due pairs and reporting results."""
+
+    def test_only_syncs_due_pairs_and_reports_results(self, mock_config, sample_recruit, sample_portal_incoming):
+        """Should skip pairs that are not due and pass each result to on_result."""
+        result = {"upserted": 2, "deleted": 0}
+        on_result = MagicMock()
+
+        with (
+            patch.object(main_module, "config", mock_config),
+            patch.object(main_module, "fetch_recruits", return_value=[sample_recruit]) as mock_recruits,
+            patch.object(main_module, "fetch_portal", return_value=[sample_portal_incoming]) as mock_portal,
+            patch.object(main_module, "sync_table", return_value=result),
+        ):
+            main_module.run_cycle([AUBURN, LSU], due={("LSU Tigers", "portal")}, on_result=on_result)
+
+        mock_recruits.assert_not_called()
+        mock_portal.assert_called_once_with(LSU)
+        on_result.assert_called_once_with("LSU Tigers", "portal", result)
+
+
+def _scheduler(*due_ticks):
+    """Scheduler mock handing out each tick's due pairs, then nothing."""
+    scheduler = MagicMock()
+    scheduler.take_due.side_effect = [*due_ticks, *([set()] * 10)]
+    scheduler.seconds_until_next.return_value = 0
+    return scheduler
+
+
+PAIR = {("Auburn Tigers", "recruits")}
+
+
+class TestRunDaemon:
+    """Tests for run_daemon function."""
+
+    def test_runs_due_pairs_until_shutdown(self, mock_config):
+        """Should run each tick's due pairs until a shutdown is requested."""
+        calls = []
+
+        def run_once(teams, due):
+            calls.append(due)
+            if len(calls) == 2:
+                main_module._shutdown.set()
+            return []
+
+        main_module.run_daemon([AUBURN], run_once, _scheduler(PAIR, PAIR))
+
+        assert calls == [PAIR, PAIR]
+
+    def test_skips_cycle_when_nothing_due(self, mock_config):
+        """Should not run a cycle on a tick with no due pairs."""
+        run_once = MagicMock()
+        scheduler = _scheduler(set())
+        scheduler.seconds_until_next.side_effect = lambda: main_module._shutdown.set() or 0
+
+        main_module.run_daemon([AUBURN], run_once, scheduler)
+
+        run_once.assert_not_called()
+
+    def test_survives_failing_cycle(self, mock_config):
+        """Should log a cycle that raises and run the next one."""
+
+        def cycle(teams, due):
+            if run_once.call_count == 1:
+                raise RuntimeError("boom")
+            main_module._shutdown.set()
+            return []
+
+        run_once = MagicMock(side_effect=cycle)
+
+        main_module.run_daemon([AUBURN], run_once, _scheduler(PAIR, PAIR))
+
+        assert run_once.call_count == 2
+
+    def test_sigterm_stops_wait(self, mock_config):
+        """Should return promptly when SIGTERM arrives during the wait."""
+
+        def run_once(teams, due):
+            os.kill(os.getpid(), signal.SIGTERM)
+            return []
+
+        scheduler = _scheduler(PAIR)
+        scheduler.seconds_until_next.return_value = 600
+
+        main_module.run_daemon([AUBURN], run_once, scheduler)
+
+        assert main_module._shutdown.is_set()
+
+    def test_restores_signal_handlers(self, mock_config):
+        """Should put back the previous SIGTERM handler on exit."""
+        before = signal.getsignal(signal.SIGTERM)
+
+        main_module.run_daemon([AUBURN], lambda teams, due: main_module._shutdown.set(), _scheduler(PAIR))
+
+        assert signal.getsignal(signal.SIGTERM) is before
+
+
+class TestQueueRecovery:
+    """Tests for reconnecting the queue between cycles."""
+
+    def test_daemon_retries_queue_until_redis_is_back(self, mock_config):
+        """Should retry init_queue before each cycle while Redis is down, then post again."""
+        mock_config.ASYNC_IO = False
+        attempts = iter([False, False, True])
+        redis = {"up": False}
+        seen = []
+
+        def connect():
+            redis["up"] = next(attempts)
+            return redis["up"]
+
+        def daemon(teams, run_once, scheduler):
+            for _ in range(3):
+                run_once(teams, PAIR)
+
+        def cycle(teams, due, on_result):
+            seen.append(main_module.is_available())
+            return []
+
+        with (
+            patch.object(main_module, "config", mock_config),
+            patch.object(main_module, "_check_config"),
+            patch.object(main_module, "_load_teams", return_value=[AUBURN]),
+            patch.object(main_module, "_build_scheduler", return_value=MagicMock()),
+            patch.object(main_module, "init_queue", side_effect=connect) as init_queue,
+            patch.object(main_module, "is_available", side_effect=lambda: redis["up"]),
+            patch.object(main_module, "run_daemon", side_effect=daemon),
+            patch.object(main_module, "run_cycle", side_effect=cycle),
+            patch.object(main_module, "_relay_outbox"),
+            patch.object(main_module, "_record_queue_depths"),
+            patch.object(main_module, "metrics"),
+            patch.object(main_module, "close_scraper_pool"),
+        ):
+            main_module.main()
+
+        # Startup and the first two cycles retry; once Redis is back the third cycle does not
+        assert init_queue.call_count == 3
+        assert seen == [False, True, True]
+
+
+class TestCheckConfig:
+    """Tests for _check_config function."""
+
+    def test_warns_when_outbox_overrides_rpc(self, mock_config):
+        """Should warn that SYNC_VIA_RPC is ignored when the outbox is also enabled."""
+        mock_config.OUTBOX_ENABLED = True
+        mock_config.SYNC_VIA_RPC = True
+
+        with patch.object(main_module, "config", mock_config), patch.object(main_module, "logger") as mock_logger:
+            main_module._check_config()
+
+        assert "SYNC_VIA_RPC is ignored" in mock_logger.warning.call_args[0][0]
+
+    def test_no_warning_for_rpc_alone(self, mock_config):
+        """Should accept SYNC_VIA_RPC without the outbox silently."""
+        mock_config.SYNC_VIA_RPC = True
+
+        with patch.object(main_module, "config", mock_config), patch.object(main_module, "logger") as mock_logger:
+            main_module._check_config()
+
+        mock_logger.warning.assert_not_called()
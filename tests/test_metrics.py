@@ -0,0 +1,128 @@
+"""Tests for the metrics module - per-stage cycle timings."""
+
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cfb_tracker import metrics as metrics_module
+from cfb_tracker.metrics import (
+    cycle_summary,
+    log_cycle_summary,
+    prometheus_text,
+    set_gauge,
+    span,
+    start_cycle,
+)
+
+
+@pytest.fixture
+def config(mock_config):
+    metrics_module.reset()
+    with patch.object(metrics_module, "config", mock_config):
+        yield mock_config
+    metrics_module.reset()
+
+
+class TestSpan:
+    """Tests for the span context manager."""
+
+    def test_records_calls_rows_and_bytes(self, config):
+        """Should aggregate every execution of a stage."""
+        with span("db.upsert", rows=2, nbytes=100):
+            pass
+        with span("db.upsert", rows=3) as timing:
+            timing.add(nbytes=50)
+
+        stats = cycle_summary()["stages"]["db.upsert"]
+        assert stats["calls"] == 2
+        assert stats["rows"] == 5
+        assert stats["bytes"] == 150
+        assert stats["errors"] == 0
+        assert stats["seconds"] >= stats["max_seconds"] >= 0
+
+    def test_counts_errors_and_reraises(self, config):
+        """Should record a failed stage and propagate the exception."""
+        with pytest.raises(RuntimeError), span("fetch.recruits"):
+            raise RuntimeError("boom")
+
+        stats = cycle_summary()["stages"]["fetch.recruits"]
+        assert stats["calls"] == 1
+        assert stats["errors"] == 1
+
+    def test_emits_otel_span_when_enabled(self, config):
+        """Should mirror the stage as an OpenTelemetry span when configured."""
+        config.METRICS_OTEL = True
+        otel_span = MagicMock()
+        tracer = MagicMock()
+        tracer.start_as_current_span.return_value.__enter__.return_value = otel_span
+        trace = MagicMock()
+        trace.get_tracer.return_value = tracer
+        opentelemetry = MagicMock(trace=trace)
+
+        modules = {"opentelemetry": opentelemetry, "opentelemetry.trace": trace}
+        with patch.dict(sys.modules, modules), span("sync.diff", rows=4):
+            pass
+
+        tracer.start_as_current_span.assert_called_once_with("sync.diff")
+        otel_span.set_attribute.assert_any_call("rows", 4)
+
+    def test_otel_missing_is_ignored(self, config):
+        """Should keep recording when opentelemetry is not installed."""
+        config.METRICS_OTEL = True
+
+        with patch.dict(sys.modules, {"opentelemetry": None}), span("sync.diff"):
+            pass
+
+        assert cycle_summary()["stages"]["sync.diff"]["calls"] == 1
+
+
+class TestCycles:
+    """Tests for per-cycle summaries and exports."""
+
+    def test_start_cycle_resets_cycle_but_not_totals(self, config):
+        """Should start each cycle empty while keeping process totals."""
+        with span("db.read", rows=10):
+            pass
+        start_cycle()
+        with span("db.read", rows=5):
+            pass
+
+        assert cycle_summary()["stages"]["db.read"]["rows"] == 5
+        assert 'cfb_tracker_stage_rows_total{stage="db.read"} 15' in prometheus_text()
+
+    def test_log_cycle_summary(self, config):
+        """Should log the summary as structured fields."""
+        with span("queue.enqueue", rows=3):
+            pass
+
+        with patch.object(metrics_module, "logger") as mock_logger:
+            summary = log_cycle_summary()
+
+        mock_logger.info.assert_called_once_with("Cycle metrics", extra=summary)
+        assert summary["stages"]["queue.enqueue"]["rows"] == 3
+        assert "cycle_seconds" in summary
+
+    def test_writes_prometheus_file(self, config, tmp_path):
+        """Should write Prometheus text to METRICS_PROMETHEUS_FILE."""
+        path = tmp_path / "cfb_tracker.prom"
+        config.METRICS_PROMETHEUS_FILE = str(path)
+        with span("db.delete", rows=2):
+            pass
+
+        log_cycle_summary()
+
+        text = path.read_text()
+        assert "# TYPE cfb_tracker_stage_calls_total counter" in text
+        assert 'cfb_tracker_stage_calls_total{stage="db.delete"} 1' in text
+        assert not (tmp_path / "cfb_tracker.prom.tmp").exists()
+
+    def test_gauges(self, config):
+        """Should log and export labelled gauges, replacing earlier values."""
+        set_gauge("queue_depth", "queue", {"social-posts": 7, "social-posts-low": 2})
+        set_gauge("queue_depth", "queue", {"social-posts": 3})
+
+        assert cycle_summary()["gauges"] == {"queue_depth": {"social-posts": 3}}
+        text = prometheus_text()
+        assert 'cfb_tracker_queue_depth{queue="social-posts"} 3' in text
+        assert "social-posts-low" not in text
@@ -1,8 +1,15 @@
 """Tests for the normalizer module."""
 
+import random
+
+import pytest
+
 from cfb_tracker.normalizer import (
+    cache_stats,
+    clear_caches,
     generate_id,
     get_name_key,
+    normalize_batch,
     normalize_name,
     normalize_position,
 )
@@ -164,3 +171,85 @@ class TestGenerateId:
         id1 = generate_id("Kensly Foustin")
         id2 = generate_id("Kensly Ladour-Foustin")
         assert id1 == id2
+
+
+class TestCaches:
+    """Tests for the memoized normalization caches."""
+
+    def test_repeat_lookups_hit_cache(self):
+        """Should serve repeated names from the cache and count hits and misses."""
+        clear_caches()
+
+        first = generate_id("Deuce Knight")
+        second = generate_id("Deuce Knight")
+
+        stats = cache_stats()
+        assert first == second
+        assert stats["generate_id"] == {"hits": 1, "misses": 1, "size": 1}
+        assert stats["get_name_key"]["misses"] == 1
+        assert stats["normalize_name"]["misses"] == 1
+
+    def test_batch_path_counts_in_stats(self):
+        """Should memoize batch ids so the per-cycle cache stats cover the fetcher's path."""
+        clear_caches()
+
+        normalize_batch(["Deuce Knight", "Jane Doe"], [])
+        normalize_batch(["Deuce Knight"], [])
+
+        assert cache_stats()["normalize_batch"] == {"hits": 1, "misses": 2, "size": 2}
+
+    def test_clear_resets_counters(self):
+        """Should empty every cache and zero its counters."""
+        generate_id("Deuce Knight")
+
+        clear_caches()
+
+        assert all(entry == {"hits": 0, "misses": 0, "size": 0} for entry in cache_stats().values())
+
+
+def _synthetic_roster(size: int) -> tuple[list[str], list[str]]:
+    rng = random.Random(2026)  # noqa: S311
+    first = ["John", "Deuce", "Kensly", "José", "D'Andre", "Ty", "Marcus", "Zion"]
+    last = ["Smith", "Knight", "Ladour-Foustin", "Núñez", "O'Neil", "Jackson Jr.", "Williams III"]
+    positions = ["Quarterback", "Wide Receiver", "EDGE", "athlete", "CB", "Offensive Tackle"]
+    names = [f"{rng.choice(first)}{i} {rng.choice(last)}" for i in range(size)]
+    return names, [rng.choice(positions) for _ in names]
+
+
+class TestNormalizeBatch:
+    """Tests for normalize_batch function."""
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "John Smith",
+            "  José  Núñez Jr. ",
+            "Kensly Ladour-Foustin",
+            "D'Andre O'Neil III",
+            "Madonna .",
+            ". ",
+            "",
+            "Ann\tMarie",
+        ],
+    )
+    def test_matches_per_item_path(self, name):
+        """Should produce exactly the ids generate_id does, including edge cases."""
+        ids, _ = normalize_batch([name], [])
+
+        assert ids == [generate_id(name)]
+
+    def test_preserves_order_and_duplicates(self):
+        """Should return one id and position per input, in order."""
+        ids, positions = normalize_batch(["John Smith", "Jane Doe", "John Smith"], ["quarterback", "CB", "quarterback"])
+
+        assert ids == [generate_id("John Smith"), generate_id("Jane Doe"), generate_id("John Smith")]
+        assert positions == ["QB", "CB", "QB"]
+
+    def test_matches_per_item_path_on_10k_roster(self):
+        """Should match the per-item path on a cold 10k-name roster (timings live in benchmarks/)."""
+        names, positions = _synthetic_roster(10_000)
+        clear_caches()
+        expected = [generate_id(n) for n in names], [normalize_position(p) for p in positions]
+        clear_caches()
+
+        assert normalize_batch(names, positions) == expected
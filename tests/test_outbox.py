@@ -0,0 +1,84 @@
+"""Tests for the outbox module - relaying outbox events to the queue."""
+
+from unittest.mock import MagicMock, patch
+
+from cfb_tracker import outbox as outbox_module
+from cfb_tracker.queue import EventBatch
+
+
+def _rows(*ids):
+    return [{"id": i, "payload": {"event_type": "new_player", "player": {"entry_id": str(i)}}} for i in ids]
+
+
+class TestRelayOutbox:
+    """Tests for relay_outbox function."""
+
+    def test_relays_and_marks_pending_events(self, mock_config):
+        """Should enqueue each pending payload and stamp the ones that reached the queue."""
+        mock_db = MagicMock()
+        mock_db.fetch_outbox.side_effect = [_rows(1, 2)]
+        batch = MagicMock()
+        batch.flush.return_value = [True, True]
+
+        with (
+            patch.object(outbox_module, "config", mock_config),
+            patch.object(outbox_module, "db", mock_db),
+            patch.object(outbox_module, "EventBatch", return_value=batch),
+        ):
+            relayed = outbox_module.relay_outbox()
+
+        assert relayed == 2
+        assert [c[0][0] for c in batch.add_payload.call_args_list] == [r["payload"] for r in _rows(1, 2)]
+        mock_db.mark_outbox_enqueued.assert_called_once_with([1, 2])
+
+    def test_drains_in_batches(self, mock_config):
+        """Should keep reading full batches until the outbox is empty."""
+        mock_db = MagicMock()
+        mock_db.fetch_outbox.side_effect = [_rows(1, 2), _rows(3, 4), []]
+        batch = MagicMock()
+        batch.flush.return_value = [True, True]
+
+        with (
+            patch.object(outbox_module, "config", mock_config),
+            patch.object(outbox_module, "db", mock_db),
+            patch.object(outbox_module, "EventBatch", return_value=batch),
+        ):
+            relayed = outbox_module.relay_outbox(batch_size=2)
+
+        assert relayed == 4
+        assert mock_db.fetch_outbox.call_count == 3
+
+    def test_leaves_failed_events_pending(self, mock_config):
+        """Should only stamp delivered events and stop when the queue rejects some."""
+        mock_db = MagicMock()
+        mock_db.fetch_outbox.side_effect = [_rows(1, 2), _rows(3, 4)]
+        batch = MagicMock()
+        batch.flush.return_value = [True, False]
+
+        with (
+            patch.object(outbox_module, "config", mock_config),
+            patch.object(outbox_module, "db", mock_db),
+            patch.object(outbox_module, "EventBatch", return_value=batch),
+        ):
+            relayed = outbox_module.relay_outbox(batch_size=2)
+
+        assert relayed == 1
+        mock_db.mark_outbox_enqueued.assert_called_once_with([1])
+        assert mock_db.fetch_outbox.call_count == 1
+
+
+class TestOutboxEvents:
+    """Tests for outbox_events function."""
+
+    def test_builds_keyed_payloads_and_empties_batch(self, sample_recruit, mock_config):
+        """Should turn collected events into {event_key, payload} rows."""
+        batch = EventBatch()
+        batch.add(event_type="new_player", table="recruits", player_data=sample_recruit, team="Auburn Tigers")
+
+        with patch("cfb_tracker.queue.config", mock_config):
+            rows = outbox_module.outbox_events(batch)
+
+        assert len(rows) == 1
+        assert rows[0]["payload"]["player"]["entry_id"] == sample_recruit["entry_id"]
+        assert len(rows[0]["event_key"]) == 32
+        assert len(batch) == 0
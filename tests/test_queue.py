@@ -1,5 +1,6 @@
 """Tests for the queue module - Redis queue management."""
 
+from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -11,9 +12,11 @@ from cfb_tracker import queue as queue_module
 def reset_queue_state():
     """Reset queue module state before each test."""
     queue_module._queue = None
+    queue_module._lanes = {}
     queue_module._redis_available = False
     yield
     queue_module._queue = None
+    queue_module._lanes = {}
     queue_module._redis_available = False
 
 
@@ -47,7 +50,9 @@ class TestInitQueue:
         assert result is True
         assert queue_module._redis_available is True
         mock_redis_cls.from_url.assert_called_once_with(mock_config.REDIS_URL, socket_connect_timeout=5)
-        mock_queue_cls.assert_called_once_with("social-posts", connection=mock_redis_conn)
+        for name in ("social-posts-high", "social-posts", "social-posts-low"):
+            mock_queue_cls.assert_any_call(name, connection=mock_redis_conn)
+        assert queue_module._queue is queue_module._lanes["normal"]
 
     def test_init_with_redis_connection_error(self, mock_config):
         """Should return False when Redis connection fails."""
@@ -259,3 +264,424 @@ class TestEnqueueEvent:
         payload = call_args[0][1]
 
         assert payload["player"]["player_url"] is None
+
+    def test_enqueue_uses_explicit_team(self, sample_recruit, mock_config):
+        """Should tag the payload with an explicit team over the configured TEAM."""
+        mock_queue = MagicMock()
+        mock_queue.enqueue.return_value = MagicMock(id="test-job-123")
+
+        queue_module._redis_available = True
+        queue_module._queue = mock_queue
+
+        with patch.object(queue_module, "config", mock_config):
+            queue_module.enqueue_event(
+                event_type="new_player",
+                table="recruits",
+                player_data=sample_recruit,
+                team="Auburn Tigers",
+            )
+
+        payload = mock_queue.enqueue.call_args[0][1]
+        assert payload["team"] == "Auburn Tigers"
+
+
+class TestEventBatch:
+    """Tests for batched, pipelined enqueueing."""
+
+    def test_flush_without_redis_reports_failure(self, sample_recruit):
+        """Should report every event as not enqueued when Redis is unavailable."""
+        batch = queue_module.EventBatch()
+        batch.add(event_type="new_player", table="recruits", player_data=sample_recruit)
+        batch.add(event_type="player_removed", table="recruits", player_data=sample_recruit)
+
+        assert batch.flush() == [False, False]
+
+    def test_flush_sends_one_enqueue_many(self, sample_recruit, sample_portal_incoming, mock_config):
+        """Should enqueue all collected events in a single enqueue_many call."""
+        mock_queue = MagicMock()
+        mock_queue.connection.pipeline.return_value.execute.return_value = [True, True]
+        queue_module._redis_available = True
+        queue_module._queue = mock_queue
+
+        batch = queue_module.EventBatch()
+        batch.add(event_type="new_player", table="recruits", player_data=sample_recruit, team="Auburn Tigers")
+        batch.add(
+            event_type="status_change",
+            table="portal",
+            player_data=sample_portal_incoming,
+            old_status="entered",
+            new_status="committed",
+        )
+
+        with (
+            patch.object(queue_module, "config", mock_config),
+            patch.object(queue_module.Queue, "prepare_data", create=True) as mock_prepare,
+        ):
+            results = batch.flush()
+
+        assert results == [True, True]
+        mock_queue.enqueue_many.assert_called_once()
+        assert len(mock_queue.enqueue_many.call_args[0][0]) == 2
+        payloads = [c[1]["args"][0] for c in mock_prepare.call_args_list]
+        assert payloads[0]["team"] == "Auburn Tigers"
+        assert payloads[1]["new_status"] == "committed"
+        assert payloads[1]["player"]["direction"] == "incoming"
+        assert len(batch) == 0
+
+    def test_flush_reports_failure_when_pipeline_fails(self, sample_recruit, mock_config):
+        """Should report every event as failed when enqueue_many raises."""
+        mock_queue = MagicMock()
+        mock_queue.enqueue_many.side_effect = Exception("Redis down")
+        queue_module._redis_available = True
+        queue_module._queue = mock_queue
+
+        batch = queue_module.EventBatch()
+        batch.add(event_type="new_player", table="recruits", player_data=sample_recruit)
+
+        with (
+            patch.object(queue_module, "config", mock_config),
+            patch.object(queue_module.Queue, "prepare_data", create=True),
+        ):
+            assert batch.flush() == [False]
+
+    def test_flush_empty_batch(self):
+        """Should do nothing when no events were collected."""
+        assert queue_module.EventBatch().flush() == []
+
+
+class TestDeduplication:
+    """Tests for dropping duplicate events before they reach RQ."""
+
+    def _live_queue(self):
+        mock_queue = MagicMock()
+        mock_queue.enqueue.return_value = MagicMock(id="job")
+        queue_module._redis_available = True
+        queue_module._queue = mock_queue
+        return mock_queue
+
+    def test_duplicate_event_is_dropped(self, sample_recruit, mock_config):
+        """Should skip RQ when the dedup key was already claimed, reporting success."""
+        mock_queue = self._live_queue()
+        mock_queue.connection.set.return_value = None  # SET NX lost
+
+        with patch.object(queue_module, "config", mock_config):
+            result = queue_module.enqueue_event(event_type="new_player", table="recruits", player_data=sample_recruit)
+
+        assert result is True
+        mock_queue.enqueue.assert_not_called()
+
+    def test_claims_key_with_ttl_and_derives_job_id(self, sample_recruit, mock_config):
+        """Should SET NX the event key with the configured TTL and reuse it as the job id."""
+        mock_queue = self._live_queue()
+
+        with patch.object(queue_module, "config", mock_config):
+            queue_module.enqueue_event(event_type="new_player", table="recruits", player_data=sample_recruit)
+
+        key = mock_queue.connection.set.call_args[0][0]
+        assert key.startswith("cfb-tracker:dedup:")
+        assert mock_queue.connection.set.call_args[1] == {"nx": True, "ex": 21600}
+        assert mock_queue.enqueue.call_args[1]["job_id"] == "social-post-" + key.rsplit(":", 1)[1]
+
+    def test_releases_claim_when_enqueue_fails(self, sample_recruit, mock_config):
+        """Should delete the dedup key so the next run can retry the event."""
+        mock_queue = self._live_queue()
+        mock_queue.enqueue.side_effect = Exception("Queue error")
+
+        with patch.object(queue_module, "config", mock_config):
+            result = queue_module.enqueue_event(event_type="new_player", table="recruits", player_data=sample_recruit)
+
+        assert result is False
+        mock_queue.connection.delete.assert_called_once()
+
+    def test_disabled_with_zero_ttl(self, sample_recruit, mock_config):
+        """Should not touch dedup keys when EVENT_DEDUP_TTL_SECONDS is 0."""
+        mock_config.EVENT_DEDUP_TTL_SECONDS = 0
+        mock_queue = self._live_queue()
+
+        with patch.object(queue_module, "config", mock_config):
+            queue_module.enqueue_event(event_type="new_player", table="recruits", player_data=sample_recruit)
+
+        mock_queue.connection.set.assert_not_called()
+        mock_queue.enqueue.assert_called_once()
+
+    def test_batch_drops_duplicates(self, sample_recruit, mock_config):
+        """Should only enqueue batch events whose keys were newly claimed."""
+        mock_queue = self._live_queue()
+        mock_queue.connection.pipeline.return_value.execute.return_value = [True, None]
+
+        batch = queue_module.EventBatch()
+        batch.add(event_type="new_player", table="recruits", player_data=sample_recruit)
+        batch.add(event_type="player_removed", table="recruits", player_data=sample_recruit)
+
+        with (
+            patch.object(queue_module, "config", mock_config),
+            patch.object(queue_module.Queue, "prepare_data", create=True),
+        ):
+            results = batch.flush()
+
+        assert results == [True, True]
+        assert len(mock_queue.enqueue_many.call_args[0][0]) == 1
+
+    def _claims(self, mock_queue) -> set:
+        """Back SET NX and DEL with an in-memory set of claimed keys."""
+        claimed: set[str] = set()
+        pending: list[str] = []
+
+        def set_nx(key, value, nx, ex):
+            if key in claimed:
+                return None
+            claimed.add(key)
+            return True
+
+        def execute():
+            results = [set_nx(key, 1, nx=True, ex=None) for key in pending]
+            pending.clear()
+            return results
+
+        connection = mock_queue.connection
+        connection.set.side_effect = set_nx
+        connection.pipeline.return_value.set.side_effect = lambda key, *args, **kwargs: pending.append(key)
+        connection.pipeline.return_value.execute.side_effect = execute
+        connection.delete.side_effect = lambda *keys: claimed.difference_update(keys)
+        return claimed
+
+    def _digest(self, sample_recruit, mock_config):
+        with patch.object(queue_module, "config", mock_config):
+            events = [
+                queue_module.build_payload("new_player", "recruits", sample_recruit, team="Auburn Tigers"),
+                queue_module.build_payload("player_removed", "recruits", {"entry_id": "b"}, team="Auburn Tigers"),
+            ]
+        return {"event_type": "digest", "table": "digest", "team": "Auburn Tigers", "events": events}
+
+    def _flush(self, mock_config, *payloads):
+        batch = queue_module.EventBatch(coalesce=False)
+        for payload in payloads:
+            batch.add_payload(payload)
+        with (
+            patch.object(queue_module, "config", mock_config),
+            patch.object(queue_module.Queue, "prepare_data", create=True),
+        ):
+            return batch.flush()
+
+    def test_digested_event_re_emitted_is_dropped(self, sample_recruit, mock_config):
+        """Should not post an event again on its own once a digest covered it."""
+        mock_queue = self._live_queue()
+        self._claims(mock_queue)
+        digest = self._digest(sample_recruit, mock_config)
+
+        assert self._flush(mock_config, digest) == [True]
+        assert self._flush(mock_config, digest["events"][0]) == [True]
+
+        mock_queue.enqueue_many.assert_called_once()
+
+    def test_failed_digest_releases_member_claims(self, sample_recruit, mock_config):
+        """Should release the digest's key and its members' keys when the enqueue fails."""
+        mock_queue = self._live_queue()
+        mock_queue.enqueue_many.side_effect = Exception("Queue error")
+        claimed = self._claims(mock_queue)
+
+        assert self._flush(mock_config, self._digest(sample_recruit, mock_config)) == [False]
+
+        assert claimed == set()
+
+    def test_event_key_distinguishes_transitions(self, mock_config):
+        """Should give a flip back to a status a different key than the original event."""
+        with patch.object(queue_module, "config", mock_config):
+            first = queue_module.build_payload(
+                "status_change", "recruits", {"entry_id": "a"}, "uncommitted", "committed"
+            )
+            replay = queue_module.build_payload(
+                "status_change", "recruits", {"entry_id": "a"}, "uncommitted", "committed"
+            )
+            recommit = queue_module.build_payload(
+                "status_change", "recruits", {"entry_id": "a"}, "decommitted", "committed"
+            )
+
+        assert queue_module.event_key(first) == queue_module.event_key(replay)
+        assert queue_module.event_key(first) != queue_module.event_key(recommit)
+
+
+class TestPriorityLanes:
+    """Tests for routing events to priority queue lanes."""
+
+    @pytest.mark.parametrize(
+        ("event_type", "table", "player", "lane"),
+        [
+            ("new_player", "recruits", {"stars": 5}, "high"),
+            ("status_change", "recruits", {"stars": 3, "rating": 0.91}, "high"),
+            ("new_player", "recruits", {"stars": 3, "rating": 0.85}, "normal"),
+            ("new_player", "recruits", {"stars": None}, "normal"),
+            ("new_player", "recruits", {"stars": 2}, "low"),
+            ("new_player", "portal", {"direction": "incoming"}, "high"),
+            ("new_player", "portal", {"direction": "outgoing"}, "normal"),
+            ("player_removed", "recruits", {"stars": 5}, "low"),
+            ("player_updated", "portal", {"direction": "incoming"}, "low"),
+        ],
+    )
+    def test_event_priority(self, mock_config, event_type, table, player, lane):
+        """Should rank events by type, stars/rating and portal direction."""
+        payload = {"event_type": event_type, "table": table, "player": player}
+
+        with patch.object(queue_module, "config", mock_config):
+            assert queue_module.event_priority(payload) == lane
+
+    def test_enqueue_event_uses_lane_queue(self, sample_recruit, mock_config):
+        """Should enqueue a high-value event on the high lane."""
+        lanes = {"high": MagicMock(), "normal": MagicMock(), "low": MagicMock()}
+        queue_module._lanes = lanes
+        queue_module._queue = lanes["normal"]
+        queue_module._redis_available = True
+
+        with patch.object(queue_module, "config", mock_config):
+            assert queue_module.enqueue_event("new_player", "recruits", {**sample_recruit, "stars": 5}) is True
+
+        lanes["high"].enqueue.assert_called_once()
+        lanes["normal"].enqueue.assert_not_called()
+
+    def test_flush_splits_lanes_in_one_pipeline(self, sample_recruit, mock_config):
+        """Should enqueue each lane's jobs on its queue within one pipeline."""
+        lanes = {"high": MagicMock(), "normal": MagicMock(), "low": MagicMock()}
+        queue_module._lanes = lanes
+        queue_module._queue = lanes["normal"]
+        queue_module._redis_available = True
+        pipe = lanes["normal"].connection.pipeline.return_value.__enter__.return_value
+        pipe.execute.return_value = [True, True]
+
+        batch = queue_module.EventBatch()
+        batch.add(event_type="new_player", table="recruits", player_data={**sample_recruit, "stars": 5})
+        batch.add(event_type="player_removed", table="recruits", player_data=sample_recruit)
+
+        with (
+            patch.object(queue_module, "config", mock_config),
+            patch.object(queue_module, "_claim", return_value=[True, True]),
+            patch.object(queue_module.Queue, "prepare_data", create=True),
+        ):
+            assert batch.flush() == [True, True]
+
+        lanes["high"].enqueue_many.assert_called_once()
+        lanes["low"].enqueue_many.assert_called_once()
+        assert lanes["high"].enqueue_many.call_args[1] == {"pipeline": pipe}
+        lanes["normal"].enqueue_many.assert_not_called()
+        pipe.execute.assert_called_once()
+
+    def test_queue_depths(self):
+        """Should report the waiting job count per lane queue."""
+        queue_module._lanes = {lane: MagicMock(count=depth) for lane, depth in (("high", 1), ("normal", 4), ("low", 9))}
+        for lane, queue in queue_module._lanes.items():
+            queue.name = queue_module.LANE_QUEUES[lane]
+        queue_module._redis_available = True
+
+        assert queue_module.queue_depths() == {"social-posts-high": 1, "social-posts": 4, "social-posts-low": 9}
+
+    def test_queue_depths_without_redis(self):
+        """Should report nothing when Redis is unavailable."""
+        assert queue_module.queue_depths() == {}
+
+
+class TestCoalescing:
+    """Tests for holding events in the coalescing buffer instead of enqueueing."""
+
+    def test_flush_holds_events_when_window_set(self, sample_recruit, mock_config):
+        """Should hand built payloads to the coalescing buffer."""
+        mock_config.COALESCE_WINDOW_SECONDS = 300
+        mock_queue = MagicMock()
+        queue_module._queue = mock_queue
+        queue_module._redis_available = True
+
+        batch = queue_module.EventBatch()
+        batch.add(event_type="new_player", table="recruits", player_data=sample_recruit)
+
+        with (
+            patch.object(queue_module, "config", mock_config),
+            patch.object(queue_module.coalesce, "hold") as mock_hold,
+        ):
+            assert batch.flush() == [True]
+
+        flush_queue, payloads = mock_hold.call_args[0]
+        assert flush_queue is mock_queue
+        assert payloads[0]["event_type"] == "new_player"
+        mock_queue.enqueue_many.assert_not_called()
+
+    def test_flush_enqueues_when_hold_fails(self, sample_recruit, mock_config):
+        """Should fall back to enqueueing immediately when the buffer is unavailable."""
+        mock_config.COALESCE_WINDOW_SECONDS = 300
+        mock_queue = MagicMock()
+        queue_module._queue = mock_queue
+        queue_module._redis_available = True
+
+        batch = queue_module.EventBatch()
+        batch.add(event_type="new_player", table="recruits", player_data=sample_recruit)
+
+        with (
+            patch.object(queue_module, "config", mock_config),
+            patch.object(queue_module.coalesce, "hold", side_effect=Exception("Redis down")),
+            patch.object(queue_module, "_claim", return_value=[True]),
+            patch.object(queue_module.Queue, "prepare_data", create=True),
+        ):
+            assert batch.flush() == [True]
+
+        mock_queue.enqueue_many.assert_called_once()
+
+    def test_digest_key_and_priority(self, mock_config):
+        """Should key a digest on its events and rank it by its most urgent one."""
+        events = [
+            {"event_type": "player_removed", "table": "recruits", "team": "T", "player": {"entry_id": "a"}},
+            {"event_type": "new_player", "table": "portal", "team": "T", "player": {"direction": "incoming"}},
+        ]
+        digest = {"event_type": "digest", "table": "digest", "team": "T", "events": events}
+
+        with patch.object(queue_module, "config", mock_config):
+            assert queue_module.event_priority(digest) == "high"
+        assert queue_module.event_key(digest) == queue_module.event_key({**digest, "events": events[::-1]})
+
+
+class TestRescheduleCurrentJob:
+    """Tests for reschedule_current_job."""
+
+    def test_enqueues_payload_at_time_on_origin_queue(self):
+        """Should schedule the payload on the running job's queue."""
+        at = datetime(2026, 12, 3, 12, tzinfo=timezone.utc)
+        job = MagicMock(origin="social-posts")
+        mock_queue = MagicMock()
+        mock_queue.enqueue_at.return_value.id = "job-2"
+
+        with (
+            patch.object(queue_module, "get_current_job", return_value=job),
+            patch.object(queue_module, "Queue", return_value=mock_queue) as mock_queue_cls,
+        ):
+            job_id = queue_module.reschedule_current_job({"event_type": "new_player"}, at)
+
+        assert job_id == "job-2"
+        mock_queue_cls.assert_called_once_with("social-posts", connection=job.connection)
+        args = mock_queue.enqueue_at.call_args[0]
+        assert args == (at, queue_module.JOB_FUNC, {"event_type": "new_player"})
+
+    def test_outside_job_returns_none(self):
+        """Should do nothing when not running inside an RQ job."""
+        with patch.object(queue_module, "get_current_job", return_value=None):
+            assert queue_module.reschedule_current_job({}, datetime.now(timezone.utc)) is None
+
+
+class TestBuildPayload:
+    """Tests for build_payload."""
+
+    def test_removed_event_has_no_status_fields(self, sample_portal_outgoing, mock_config):
+        """Should omit status fields for player_removed events."""
+        with patch.object(queue_module, "config", mock_config):
+            payload = queue_module.build_payload("player_removed", "portal", sample_portal_outgoing)
+
+        assert "status" not in payload
+        assert "new_status" not in payload
+        assert payload["team"] == mock_config.TEAM
+
+    def test_player_updated_carries_changes(self, sample_recruit, mock_config):
+        """Should include the changed fields and key on them for dedup."""
+        changes = {"stars": {"old": 4, "new": 5}}
+        with patch.object(queue_module, "config", mock_config):
+            payload = queue_module.build_payload("player_updated", "recruits", sample_recruit, changes=changes)
+            other = queue_module.build_payload(
+                "player_updated", "recruits", sample_recruit, changes={"stars": {"old": 5, "new": 4}}
+            )
+
+        assert payload["changes"] == changes
+        assert queue_module.event_key(payload) != queue_module.event_key(other)
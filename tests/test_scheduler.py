@@ -0,0 +1,126 @@
+"""Tests for the scheduler module - adaptive polling intervals."""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from cfb_tracker import scheduler as scheduler_module
+from cfb_tracker.scheduler import AdaptiveScheduler, HotWindow, parse_hot_windows
+
+PAIRS = [("Auburn Tigers", "recruits"), ("Auburn Tigers", "portal")]
+JULY = datetime(2026, 7, 15, 12).timestamp()
+SIGNING_DAY = datetime(2026, 12, 3, 12).timestamp()
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def config(mock_config):
+    mock_config.CYCLE_JITTER_SECONDS = 0
+    with patch.object(scheduler_module, "config", mock_config):
+        yield mock_config
+
+
+class TestParseHotWindows:
+    """Tests for parse_hot_windows function."""
+
+    def test_parses_ranges_and_table_prefix(self):
+        """Should parse plain and table-scoped windows."""
+        windows = parse_hot_windows("12-03:12-05, portal@12-09:12-28")
+
+        assert windows == [
+            HotWindow(start=(12, 3), end=(12, 5)),
+            HotWindow(start=(12, 9), end=(12, 28), table="portal"),
+        ]
+
+    def test_empty_spec(self):
+        """Should return no windows when unset."""
+        assert parse_hot_windows(None) == []
+
+    @pytest.mark.parametrize("spec", ["12-03", "13-01:13-02", "portal@12-40:12-41"])
+    def test_rejects_malformed(self, spec):
+        """Should raise ValueError for malformed windows."""
+        with pytest.raises(ValueError, match="Invalid HOT_WINDOWS"):
+            parse_hot_windows(spec)
+
+    def test_window_wrapping_new_year(self):
+        """Should match dates on both sides of a window that wraps the year."""
+        window = HotWindow(start=(12, 15), end=(1, 10))
+
+        assert window.contains(datetime(2026, 12, 20).date(), "portal")
+        assert window.contains(datetime(2027, 1, 5).date(), "portal")
+        assert not window.contains(datetime(2027, 2, 1).date(), "portal")
+
+
+class TestAdaptiveScheduler:
+    """Tests for AdaptiveScheduler class."""
+
+    def test_everything_due_at_start(self, config):
+        """Should report every pair due on the first tick, then none."""
+        scheduler = AdaptiveScheduler(PAIRS, clock=FakeClock(JULY))
+
+        assert scheduler.take_due() == set(PAIRS)
+        assert scheduler.take_due() == set()
+        assert scheduler.seconds_until_next() == 600
+
+    def test_changes_shorten_interval_to_min(self, config):
+        """Should halve the interval after changes, stopping at POLL_MIN_SECONDS."""
+        scheduler = AdaptiveScheduler(PAIRS, clock=FakeClock(JULY))
+
+        for _ in range(5):
+            scheduler.observe("Auburn Tigers", "recruits", {"upserted": 3, "deleted": 0})
+
+        assert scheduler.interval("Auburn Tigers", "recruits") == 120
+        assert scheduler.interval("Auburn Tigers", "portal") == 600
+
+    def test_quiet_syncs_back_off_to_max(self, config):
+        """Should stretch the interval after unchanged syncs, stopping at POLL_MAX_SECONDS."""
+        scheduler = AdaptiveScheduler(PAIRS, clock=FakeClock(JULY))
+
+        scheduler.observe("Auburn Tigers", "portal", {"upserted": 0, "deleted": 0, "skipped": True})
+        assert scheduler.interval("Auburn Tigers", "portal") == 900
+
+        for _ in range(10):
+            scheduler.observe("Auburn Tigers", "portal", {"upserted": 0, "deleted": 0})
+        assert scheduler.interval("Auburn Tigers", "portal") == 3600
+
+    def test_hot_window_caps_interval(self, config):
+        """Should poll at most POLL_HOT_MAX_SECONDS apart inside a hot window."""
+        config.HOT_WINDOWS = "recruits@12-03:12-05"
+        scheduler = AdaptiveScheduler(PAIRS, clock=FakeClock(SIGNING_DAY))
+
+        scheduler.observe("Auburn Tigers", "recruits", {"upserted": 0, "deleted": 0})
+        scheduler.observe("Auburn Tigers", "portal", {"upserted": 0, "deleted": 0})
+
+        assert scheduler.interval("Auburn Tigers", "recruits") == 300
+        assert scheduler.interval("Auburn Tigers", "portal") == 900
+
+    def test_observe_reschedules_from_now(self, config):
+        """Should make a pair due one interval after its last observed sync."""
+        clock = FakeClock(JULY)
+        scheduler = AdaptiveScheduler(PAIRS[:1], clock=clock)
+        scheduler.take_due()
+
+        clock.now += 100
+        scheduler.observe("Auburn Tigers", "recruits", {"upserted": 1, "deleted": 0})
+
+        clock.now += 299
+        assert scheduler.take_due() == set()
+        clock.now += 1
+        assert scheduler.take_due() == {("Auburn Tigers", "recruits")}
+
+    def test_unobserved_pair_is_not_retried_immediately(self, config):
+        """Should keep a failed (unobserved) pair on its interval instead of re-running it."""
+        clock = FakeClock(JULY)
+        scheduler = AdaptiveScheduler(PAIRS, clock=clock)
+        scheduler.take_due()
+
+        clock.now += 1
+        assert scheduler.take_due() == set()
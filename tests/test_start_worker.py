@@ -0,0 +1,24 @@
+"""Tests for the worker command-line entry point."""
+
+from unittest.mock import patch
+
+from cfb_tracker import start_worker as start_worker_module
+from cfb_tracker.queue import PRIORITY_QUEUES
+
+
+class TestMain:
+    """Tests for main function."""
+
+    def test_defaults_to_priority_queues(self):
+        """Should listen on every lane in priority order and keep waiting for jobs."""
+        with patch.object(start_worker_module, "run_worker", return_value=True) as mock_run:
+            assert start_worker_module.main([]) is True
+
+        mock_run.assert_called_once_with(PRIORITY_QUEUES, burst=False)
+
+    def test_passes_queues_and_burst(self):
+        """Should run only the named queues, in the order given."""
+        with patch.object(start_worker_module, "run_worker") as mock_run:
+            start_worker_module.main(["social-posts-low", "social-posts", "--burst"])
+
+        mock_run.assert_called_once_with(("social-posts-low", "social-posts"), burst=True)
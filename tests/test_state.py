@@ -0,0 +1,131 @@
+"""Tests for the state module - local sync state in SQLite."""
+
+import time
+from unittest.mock import patch
+
+from cfb_tracker import state as state_module
+
+
+class TestFingerprints:
+    """Tests for fingerprint persistence."""
+
+    def test_missing_fingerprint_is_none(self):
+        """Should return None for a team/table that was never synced."""
+        assert state_module.get_fingerprint("Auburn Tigers", "recruits") is None
+
+    def test_round_trip(self):
+        """Should return the last fingerprint set for a team/table."""
+        state_module.set_fingerprint("Auburn Tigers", "recruits", "fp-1")
+        state_module.set_fingerprint("Auburn Tigers", "recruits", "fp-2")
+
+        assert state_module.get_fingerprint("Auburn Tigers", "recruits") == "fp-2"
+
+    def test_scoped_by_team_and_table(self):
+        """Should keep fingerprints separate per team and per table."""
+        state_module.set_fingerprint("Auburn Tigers", "recruits", "fp-1")
+
+        assert state_module.get_fingerprint("Auburn Tigers", "portal") is None
+        assert state_module.get_fingerprint("LSU Tigers", "recruits") is None
+
+    def test_persists_to_state_path(self, mock_config, tmp_path):
+        """Should survive a reopen when STATE_PATH points at a file."""
+        mock_config.STATE_PATH = str(tmp_path / "state.db")
+
+        with patch.object(state_module, "config", mock_config):
+            state_module.reset()
+            state_module.set_fingerprint("Auburn Tigers", "recruits", "fp-1")
+            state_module.reset()
+            result = state_module.get_fingerprint("Auburn Tigers", "recruits")
+
+        assert result == "fp-1"
+
+
+class TestSnapshots:
+    """Tests for the last-synced snapshot store."""
+
+    def test_missing_snapshot_is_none(self):
+        """Should distinguish a never-reconciled table from an empty one."""
+        assert state_module.load_snapshot("Auburn Tigers", "recruits") is None
+
+        state_module.save_snapshot("Auburn Tigers", "recruits", [])
+
+        assert state_module.load_snapshot("Auburn Tigers", "recruits") == []
+
+    def test_save_replaces_previous_snapshot(self, sample_recruit):
+        """Should drop rows that are not in the new full read."""
+        state_module.save_snapshot("Auburn Tigers", "recruits", [{**sample_recruit, "entry_id": "old"}])
+        state_module.save_snapshot("Auburn Tigers", "recruits", [sample_recruit])
+
+        snapshot = state_module.load_snapshot("Auburn Tigers", "recruits")
+
+        assert [r["entry_id"] for r in snapshot] == [sample_recruit["entry_id"]]
+
+    def test_apply_upserts_and_deletes(self, sample_recruit):
+        """Should mirror incremental writes into the snapshot."""
+        state_module.save_snapshot("Auburn Tigers", "recruits", [{**sample_recruit, "entry_id": "gone"}])
+        state_module.apply_upserts("Auburn Tigers", "recruits", [{**sample_recruit, "status": "signed"}])
+        state_module.apply_deletes("Auburn Tigers", "recruits", ["gone"])
+
+        snapshot = state_module.load_snapshot("Auburn Tigers", "recruits")
+
+        assert len(snapshot) == 1
+        assert snapshot[0]["status"] == "signed"
+
+    def test_needs_reconciliation(self):
+        """Should require a full read when missing, stale or disabled."""
+        assert state_module.needs_reconciliation("Auburn Tigers", "recruits", 3600) is True
+
+        state_module.save_snapshot("Auburn Tigers", "recruits", [])
+
+        assert state_module.needs_reconciliation("Auburn Tigers", "recruits", 3600) is False
+        assert state_module.needs_reconciliation("Auburn Tigers", "recruits", 0) is True
+        with patch.object(state_module.time, "time", return_value=time.time() + 7200):
+            assert state_module.needs_reconciliation("Auburn Tigers", "recruits", 3600) is True
+
+
+class TestRecordHash:
+    """Tests for per-row content hashes."""
+
+    def test_ignores_database_managed_columns(self, sample_recruit):
+        """Should hash the same with or without id/team_id/updated_at."""
+        stored = {**sample_recruit, "id": 7, "team_id": "Auburn Tigers", "updated_at": "2026-01-01T00:00:00Z"}
+
+        assert state_module.record_hash(stored) == state_module.record_hash(sample_recruit)
+
+    def test_changes_with_content(self, sample_recruit):
+        """Should change when a scraped field changes."""
+        assert state_module.record_hash(sample_recruit) != state_module.record_hash({**sample_recruit, "stars": 5})
+
+
+class TestRecordHashFields:
+    """Tests for record_hash restricted to tracked fields."""
+
+    def test_ignores_untracked_fields(self, sample_recruit):
+        """Should only change when a listed field changes."""
+        fields = ("name", "status")
+
+        assert state_module.record_hash(sample_recruit, fields) == state_module.record_hash(
+            {**sample_recruit, "stars": 5}, fields
+        )
+        assert state_module.record_hash(sample_recruit, fields) != state_module.record_hash(
+            {**sample_recruit, "status": "signed"}, fields
+        )
+
+
+class TestEntryIds:
+    """Tests for entry_id assignment persistence."""
+
+    def test_round_trip(self):
+        """Should return saved assignments for the same team/table only."""
+        state_module.save_entry_ids("Auburn Tigers", "recruits", {"url:a": "id-a", "url:b": "id-b"})
+
+        assert state_module.load_entry_ids("Auburn Tigers", "recruits") == {"url:a": "id-a", "url:b": "id-b"}
+        assert state_module.load_entry_ids("Auburn Tigers", "portal") == {}
+
+    def test_delete(self):
+        """Should forget only the given identities."""
+        state_module.save_entry_ids("Auburn Tigers", "recruits", {"url:a": "id-a", "url:b": "id-b"})
+
+        state_module.delete_entry_ids("Auburn Tigers", "recruits", ["url:a"])
+
+        assert state_module.load_entry_ids("Auburn Tigers", "recruits") == {"url:b": "id-b"}
@@ -1,10 +1,22 @@
 """Tests for the sync module - database synchronization and event queueing."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+
+from cfb_tracker import state
 from cfb_tracker import sync as sync_module
 
 
+def _batch_of(mock_add):
+    """EventBatch stand-in whose add() calls are recorded on mock_add."""
+    batch = MagicMock()
+    batch.add = mock_add
+    batch.flush.return_value = []
+    return batch
+
+
 class TestSyncTable:
     """Tests for sync_table function."""
 
@@ -18,7 +30,7 @@ class TestSyncTable:
 
         with (
             patch.object(sync_module, "db", mock_db),
-            patch.object(sync_module, "enqueue_event", mock_enqueue),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(mock_enqueue)),
         ):
             result = sync_module.sync_table("recruits", fresh_records)
 
@@ -30,6 +42,7 @@ class TestSyncTable:
             event_type="new_player",
             table="recruits",
             player_data=sample_recruit,
+            team=None,
         )
 
     def test_sync_status_change(self, sample_recruit):
@@ -43,7 +56,7 @@ class TestSyncTable:
 
         with (
             patch.object(sync_module, "db", mock_db),
-            patch.object(sync_module, "enqueue_event", mock_enqueue),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(mock_enqueue)),
         ):
             result = sync_module.sync_table("recruits", [new_record])
 
@@ -54,6 +67,7 @@ class TestSyncTable:
             player_data=new_record,
             old_status="uncommitted",
             new_status="committed",
+            team=None,
         )
 
     def test_sync_no_changes(self, sample_recruit):
@@ -64,7 +78,7 @@ class TestSyncTable:
 
         with (
             patch.object(sync_module, "db", mock_db),
-            patch.object(sync_module, "enqueue_event", mock_enqueue),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(mock_enqueue)),
         ):
             result = sync_module.sync_table("recruits", [sample_recruit])
 
@@ -86,16 +100,17 @@ class TestSyncTable:
 
         with (
             patch.object(sync_module, "db", mock_db),
-            patch.object(sync_module, "enqueue_event", mock_enqueue),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(mock_enqueue)),
         ):
             result = sync_module.sync_table("recruits", fresh_records)
 
         assert result["deleted"] == 1
-        mock_db.delete_records.assert_called_once_with("recruits", ["old-id"])
+        mock_db.delete_records.assert_called_once_with("recruits", ["old-id"], team_id=None)
         mock_enqueue.assert_called_once_with(
             event_type="player_removed",
             table="recruits",
             player_data=existing_record,
+            team=None,
         )
 
     def test_sync_portal_deletion_enqueues_event(self, sample_portal_outgoing):
@@ -106,7 +121,7 @@ class TestSyncTable:
 
         with (
             patch.object(sync_module, "db", mock_db),
-            patch.object(sync_module, "enqueue_event", mock_enqueue),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(mock_enqueue)),
         ):
             result = sync_module.sync_table("portal", [])  # noqa: F841
 
@@ -114,6 +129,7 @@ class TestSyncTable:
             event_type="player_removed",
             table="portal",
             player_data=sample_portal_outgoing,
+            team=None,
         )
 
     def test_sync_multiple_deletions(self, sample_recruit):
@@ -127,7 +143,7 @@ class TestSyncTable:
 
         with (
             patch.object(sync_module, "db", mock_db),
-            patch.object(sync_module, "enqueue_event", mock_enqueue),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(mock_enqueue)),
         ):
             sync_module.sync_table("recruits", [])
 
@@ -147,7 +163,7 @@ class TestSyncTable:
 
         with (
             patch.object(sync_module, "db", mock_db),
-            patch.object(sync_module, "enqueue_event", mock_enqueue),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(mock_enqueue)),
         ):
             sync_module.sync_table("recruits", [record_without_timestamp])
 
@@ -157,38 +173,495 @@ class TestSyncTable:
         assert len(upserted_records) == 1
         assert "updated_at" in upserted_records[0]
 
+    def test_sync_threads_team_id(self, sample_recruit):
+        """Should scope reads, writes and events to the given team."""
+        stale_record = {**sample_recruit, "entry_id": "old-id"}
+
+        mock_db = MagicMock()
+        mock_db.get_all_records.return_value = [stale_record]
+        mock_enqueue = MagicMock()
+
+        with (
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(mock_enqueue)),
+        ):
+            sync_module.sync_table("recruits", [sample_recruit], team_id="Auburn Tigers")
+
+        mock_db.get_all_records.assert_called_once_with(
+            "recruits", team_id="Auburn Tigers", columns=sync_module.SYNC_COLUMNS["recruits"]
+        )
+        assert mock_db.upsert_records.call_args[1]["team_id"] == "Auburn Tigers"
+        mock_db.delete_records.assert_called_once_with("recruits", ["old-id"], team_id="Auburn Tigers")
+        assert all(c[1]["team"] == "Auburn Tigers" for c in mock_enqueue.call_args_list)
+
+
+class TestSyncTableFingerprint:
+    """Tests for skipping sync_table when the fetched payload is unchanged."""
+
+    def test_skips_when_fingerprint_matches(self, sample_recruit):
+        """Should not read, write or enqueue when the payload fingerprint matches."""
+        state.save_snapshot("Auburn Tigers", "recruits", [sample_recruit])
+        state.set_fingerprint("Auburn Tigers", "recruits", "fp-1")
+
+        mock_db = MagicMock()
+        mock_enqueue = MagicMock()
+
+        with (
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(mock_enqueue)),
+        ):
+            result = sync_module.sync_table("recruits", [sample_recruit], team_id="Auburn Tigers", fingerprint="fp-1")
+
+        assert result == {"upserted": 0, "deleted": 0, "skipped": True, "reconciled": False}
+        mock_db.get_all_records.assert_not_called()
+        mock_db.upsert_records.assert_not_called()
+        mock_enqueue.assert_not_called()
+
+    def test_due_reconciliation_overrides_skip(self, sample_recruit):
+        """Should re-read Supabase and repair drift when reconciliation is due, even if the payload matches."""
+        state.save_snapshot("Auburn Tigers", "recruits", [sample_recruit])
+        state.set_fingerprint("Auburn Tigers", "recruits", "fp-1")
+        edited = {**sample_recruit, "status": "manually edited"}
+
+        mock_db = MagicMock()
+        mock_db.get_all_records.return_value = [edited, {**sample_recruit, "entry_id": "added-by-hand"}]
+
+        with (
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(MagicMock())),
+            patch.object(sync_module.config, "SNAPSHOT_RECONCILE_SECONDS", 0),
+        ):
+            result = sync_module.sync_table(
+                "recruits", [dict(sample_recruit)], team_id="Auburn Tigers", fingerprint="fp-1"
+            )
+
+        assert result == {"upserted": 1, "deleted": 1, "skipped": False, "reconciled": True}
+        mock_db.delete_records.assert_called_once_with("recruits", ["added-by-hand"], team_id="Auburn Tigers")
+
+    def test_rpc_path_skips_without_reconciliation(self, sample_recruit):
+        """Should still skip on the fingerprint when syncing via RPC, which never reads the table."""
+        state.set_fingerprint("Auburn Tigers", "recruits", "fp-1")
+        mock_db = MagicMock()
+
+        with (
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module.config, "SYNC_VIA_RPC", True),
+            patch.object(sync_module.config, "OUTBOX_ENABLED", False),
+        ):
+            result = sync_module.sync_table("recruits", [sample_recruit], team_id="Auburn Tigers", fingerprint="fp-1")
+
+        assert result["skipped"] is True
+        mock_db.sync_via_rpc.assert_not_called()
+
+    def test_syncs_and_records_new_fingerprint(self, sample_recruit):
+        """Should sync and remember the fingerprint when the payload changed."""
+        state.set_fingerprint("Auburn Tigers", "recruits", "fp-old")
+
+        mock_db = MagicMock()
+        mock_db.get_all_records.return_value = []
+
+        with (
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(MagicMock())),
+        ):
+            result = sync_module.sync_table("recruits", [sample_recruit], team_id="Auburn Tigers", fingerprint="fp-new")
+
+        assert result["skipped"] is False
+        assert result["upserted"] == 1
+        assert state.get_fingerprint("Auburn Tigers", "recruits") == "fp-new"
+
+    def test_keeps_old_fingerprint_when_sync_fails(self, sample_recruit):
+        """Should not record the fingerprint if the database write fails."""
+        mock_db = MagicMock()
+        mock_db.get_all_records.return_value = []
+        mock_db.upsert_records.side_effect = Exception("write failed")
+
+        with (
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(MagicMock())),
+            pytest.raises(Exception, match="write failed"),
+        ):
+            sync_module.sync_table("recruits", [sample_recruit], team_id="Auburn Tigers", fingerprint="fp-new")
+
+        assert state.get_fingerprint("Auburn Tigers", "recruits") is None
+
+
+class TestSyncTableSnapshot:
+    """Tests for diffing against the local snapshot instead of Supabase."""
+
+    def test_second_sync_diffs_against_snapshot(self, sample_recruit):
+        """Should read Supabase once, then diff later runs locally."""
+        mock_db = MagicMock()
+        mock_db.get_all_records.return_value = [sample_recruit]
+
+        with (
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(MagicMock())),
+        ):
+            first = sync_module.sync_table("recruits", [dict(sample_recruit)], team_id="Auburn Tigers")
+            second = sync_module.sync_table("recruits", [dict(sample_recruit)], team_id="Auburn Tigers")
+
+        assert first["reconciled"] is True
+        assert second["reconciled"] is False
+        mock_db.get_all_records.assert_called_once()
+        mock_db.upsert_records.assert_not_called()
+
+    def test_snapshot_tracks_writes(self, sample_recruit):
+        """Should diff the next run against this run's upserts and deletes."""
+        stale = {**sample_recruit, "entry_id": "old-id"}
+        mock_db = MagicMock()
+        mock_db.get_all_records.return_value = [stale]
+        mock_enqueue = MagicMock()
+
+        with (
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(mock_enqueue)),
+        ):
+            sync_module.sync_table("recruits", [dict(sample_recruit)], team_id="Auburn Tigers")
+            mock_enqueue.reset_mock()
+            result = sync_module.sync_table(
+                "recruits", [{**sample_recruit, "status": "signed"}], team_id="Auburn Tigers"
+            )
+
+        assert result == {"upserted": 1, "deleted": 0, "skipped": False, "reconciled": False}
+        mock_enqueue.assert_called_once()
+        assert mock_enqueue.call_args[1]["old_status"] == "committed"
+        assert mock_enqueue.call_args[1]["new_status"] == "signed"
+
+    def test_reconciles_with_supabase_when_due(self, sample_recruit):
+        """Should re-read Supabase every run when SNAPSHOT_RECONCILE_SECONDS is 0."""
+        mock_db = MagicMock()
+        mock_db.get_all_records.return_value = [sample_recruit]
+
+        with (
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(MagicMock())),
+            patch.object(sync_module.config, "SNAPSHOT_RECONCILE_SECONDS", 0),
+        ):
+            sync_module.sync_table("recruits", [dict(sample_recruit)], team_id="Auburn Tigers")
+            result = sync_module.sync_table("recruits", [dict(sample_recruit)], team_id="Auburn Tigers")
+
+        assert result["reconciled"] is True
+        assert mock_db.get_all_records.call_count == 2
+
+
+class TestAsyncSyncTable:
+    """Tests for the asyncio variant of sync_table."""
+
+    def test_full_cycle_on_async_db(self, sample_recruit):
+        """Should diff, write and enqueue the same as sync_table."""
+        stale = {**sample_recruit, "entry_id": "old-id"}
+        mock_db = MagicMock()
+        mock_db.async_get_all_records = AsyncMock(return_value=[stale])
+        mock_db.async_upsert_records = AsyncMock()
+        mock_db.async_delete_records = AsyncMock()
+        mock_enqueue = MagicMock()
+
+        with (
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(mock_enqueue)),
+        ):
+            result = asyncio.run(
+                sync_module.async_sync_table("recruits", [dict(sample_recruit)], team_id="Auburn Tigers")
+            )
+
+        assert result == {"upserted": 1, "deleted": 1, "skipped": False, "reconciled": True}
+        mock_db.async_upsert_records.assert_awaited_once()
+        mock_db.async_delete_records.assert_awaited_once_with("recruits", ["old-id"], team_id="Auburn Tigers")
+        event_types = sorted(c[1]["event_type"] for c in mock_enqueue.call_args_list)
+        assert event_types == ["new_player", "player_removed"]
+        mock_db.get_all_records.assert_not_called()
+
+    def test_skips_when_fingerprint_matches(self, sample_recruit):
+        """Should skip without touching the async client when unchanged."""
+        state.save_snapshot("Auburn Tigers", "recruits", [sample_recruit])
+        state.set_fingerprint("Auburn Tigers", "recruits", "fp-1")
+        mock_db = MagicMock()
+        mock_db.async_get_all_records = AsyncMock()
+
+        with patch.object(sync_module, "db", mock_db):
+            result = asyncio.run(
+                sync_module.async_sync_table("recruits", [sample_recruit], team_id="Auburn Tigers", fingerprint="fp-1")
+            )
+
+        assert result["skipped"] is True
+        mock_db.async_get_all_records.assert_not_called()
+
 
 class TestEnqueueHelpers:
     """Tests for private enqueue helper functions."""
 
     def test_enqueue_new_player_handles_exception(self, sample_recruit):
         """Should log exception but not raise when enqueue fails."""
-        mock_enqueue = MagicMock(side_effect=Exception("Queue error"))
+        batch = _batch_of(MagicMock(side_effect=Exception("Queue error")))
 
-        with patch.object(sync_module, "enqueue_event", mock_enqueue):
-            # Should not raise
-            sync_module._enqueue_new_player_event("recruits", sample_recruit)
+        # Should not raise
+        sync_module._enqueue_new_player_event(batch, "recruits", sample_recruit)
 
     def test_enqueue_status_change_handles_exception(self, sample_recruit):
         """Should log exception but not raise when enqueue fails."""
-        mock_enqueue = MagicMock(side_effect=Exception("Queue error"))
-
-        with patch.object(sync_module, "enqueue_event", mock_enqueue):
-            # Should not raise
-            sync_module._enqueue_status_change_event(
-                "recruits",
-                sample_recruit,
-                old_status="uncommitted",
-                new_status="committed",
-            )
+        batch = _batch_of(MagicMock(side_effect=Exception("Queue error")))
+
+        # Should not raise
+        sync_module._enqueue_status_change_event(
+            batch,
+            "recruits",
+            sample_recruit,
+            old_status="uncommitted",
+            new_status="committed",
+        )
 
     def test_enqueue_player_removed_handles_exception(self, sample_recruit):
         """Should log exception but not raise when enqueue fails."""
-        mock_enqueue = MagicMock(side_effect=Exception("Queue error"))
+        batch = _batch_of(MagicMock(side_effect=Exception("Queue error")))
+
+        # Should not raise
+        sync_module._enqueue_player_removed_event(batch, "recruits", sample_recruit)
+
+    def test_flush_handles_exception(self):
+        """Should log exception but not raise when the batch flush fails."""
+        batch = MagicMock()
+        batch.flush.side_effect = Exception("Redis down")
+
+        # Should not raise
+        sync_module._flush_events(batch, "recruits")
+
+
+class TestSyncTableBatching:
+    """Tests for batched event enqueueing in sync_table."""
+
+    def test_flushes_after_each_write(self, sample_recruit):
+        """Should flush upsert events after the upsert and removal events after the delete."""
+        stale = {**sample_recruit, "entry_id": "old-id"}
+        mock_db = MagicMock()
+        mock_db.get_all_records.return_value = [stale]
+        batch = _batch_of(MagicMock())
+        calls = MagicMock()
+        calls.attach_mock(mock_db.upsert_records, "upsert")
+        calls.attach_mock(mock_db.delete_records, "delete")
+        calls.attach_mock(batch.flush, "flush")
+
+        with (
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module, "EventBatch", return_value=batch),
+        ):
+            sync_module.sync_table("recruits", [dict(sample_recruit)], team_id="Auburn Tigers")
+
+        assert [c[0] for c in calls.mock_calls] == ["upsert", "flush", "delete", "flush"]
+
+    def test_failed_upsert_sends_no_events(self, sample_recruit):
+        """Should not flush events for changes that never persisted."""
+        mock_db = MagicMock()
+        mock_db.get_all_records.return_value = []
+        mock_db.upsert_records.side_effect = Exception("write failed")
+        batch = _batch_of(MagicMock())
+
+        with (
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module, "EventBatch", return_value=batch),
+            pytest.raises(Exception, match="write failed"),
+        ):
+            sync_module.sync_table("recruits", [sample_recruit], team_id="Auburn Tigers")
+
+        batch.flush.assert_not_called()
+
+
+class TestSyncTableContentHash:
+    """Tests for field-level change detection in sync_table."""
+
+    def _sync(self, mock_config, existing, fresh, table="recruits"):
+        mock_db = MagicMock()
+        mock_db.get_all_records.return_value = existing
+        mock_enqueue = MagicMock()
+        with (
+            patch.object(sync_module, "config", mock_config),
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(mock_enqueue)),
+        ):
+            result = sync_module.sync_table(table, fresh)
+        return result, mock_db, mock_enqueue
+
+    def test_non_status_change_is_written_without_event(self, mock_config, sample_recruit):
+        """Should upsert a rating change but not post about it by default."""
+        result, mock_db, mock_enqueue = self._sync(
+            mock_config, [dict(sample_recruit)], [{**sample_recruit, "rating": 0.9700}]
+        )
+
+        assert result["upserted"] == 1
+        assert mock_db.upsert_records.call_args[0][1][0]["rating"] == 0.9700
+        mock_enqueue.assert_not_called()
+
+    def test_upserts_carry_content_hash(self, mock_config, sample_recruit):
+        """Should store the tracked-field hash with each written record."""
+        _, mock_db, _ = self._sync(mock_config, [], [dict(sample_recruit)])
+
+        written = mock_db.upsert_records.call_args[0][1][0]
+        assert written["content_hash"] == state.record_hash(sample_recruit, sync_module.TRACKED_FIELDS["recruits"])
+
+    def test_matching_stored_hash_skips_write(self, mock_config, sample_recruit):
+        """Should compare against the stored content_hash without needing the other columns."""
+        stored = {
+            "entry_id": sample_recruit["entry_id"],
+            "content_hash": state.record_hash(sample_recruit, sync_module.TRACKED_FIELDS["recruits"]),
+        }
+
+        result, mock_db, _ = self._sync(mock_config, [stored], [dict(sample_recruit)])
+
+        assert result["upserted"] == 0
+        mock_db.upsert_records.assert_not_called()
+
+    def test_event_fields_enqueue_player_updated(self, mock_config, sample_recruit):
+        """Should send player_updated for EVENT_FIELDS changes other than status."""
+        mock_config.EVENT_FIELDS = "status,stars"
+        fresh = {**sample_recruit, "stars": 5, "rating": 0.9900}
+
+        _, _, mock_enqueue = self._sync(mock_config, [dict(sample_recruit)], [fresh])
+
+        mock_enqueue.assert_called_once_with(
+            event_type="player_updated",
+            table="recruits",
+            player_data=fresh,
+            changes={"stars": {"old": 4, "new": 5}},
+            team=None,
+        )
+
+    def test_status_not_in_event_fields_is_silent(self, mock_config, sample_recruit):
+        """Should still write a status change but skip the event when status isn't an EVENT_FIELD."""
+        mock_config.EVENT_FIELDS = "stars"
+
+        result, _, mock_enqueue = self._sync(
+            mock_config, [{**sample_recruit, "status": "uncommitted"}], [dict(sample_recruit)]
+        )
+
+        assert result["upserted"] == 1
+        mock_enqueue.assert_not_called()
+
+    def test_changed_columns_only(self, mock_config, sample_recruit):
+        """Should write only changed columns of updated rows, separately from full new rows."""
+        mock_config.SYNC_CHANGED_COLUMNS_ONLY = True
+        newcomer = {**sample_recruit, "entry_id": "new-id", "name": "Jake Smith"}
+
+        _, mock_db, _ = self._sync(mock_config, [dict(sample_recruit)], [{**sample_recruit, "stars": 5}, newcomer])
+
+        writes = [c[0][1] for c in mock_db.upsert_records.call_args_list]
+        assert len(writes) == 2
+        partial = next(rows for rows in writes if rows[0]["entry_id"] == "abc123")
+        assert set(partial[0]) == {"entry_id", "stars", "content_hash", "updated_at"}
+        full = next(rows for rows in writes if rows[0]["entry_id"] == "new-id")
+        assert full[0]["name"] == "Jake Smith"
+
+
+class TestSyncTableRpc:
+    """Tests for the SYNC_VIA_RPC path of sync_table."""
+
+    def test_single_rpc_and_events_from_response(self, mock_config, sample_recruit):
+        """Should skip reads and table writes, enqueueing events from the RPC response."""
+        mock_config.SYNC_VIA_RPC = True
+        changed = {**sample_recruit, "entry_id": "changed", "status": "committed"}
+        new = {**sample_recruit, "entry_id": "new"}
+        removed = {**sample_recruit, "entry_id": "gone", "team_id": "Auburn Tigers"}
+        mock_db = MagicMock()
+        mock_db.sync_via_rpc.return_value = {
+            "upserted": [
+                {"entry_id": "changed", "old": {**changed, "status": "uncommitted"}},
+                {"entry_id": "new", "old": None},
+            ],
+            "deleted": [removed],
+        }
+        mock_enqueue = MagicMock()
+
+        with (
+            patch.object(sync_module, "config", mock_config),
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(mock_enqueue)),
+        ):
+            result = sync_module.sync_table("recruits", [changed, new], team_id="Auburn Tigers")
+
+        assert result == {"upserted": 2, "deleted": 1, "skipped": False, "reconciled": False}
+        mock_db.get_all_records.assert_not_called()
+        mock_db.upsert_records.assert_not_called()
+        mock_db.delete_records.assert_not_called()
+        sent = mock_db.sync_via_rpc.call_args[0][1]
+        assert all("content_hash" in r and "updated_at" in r for r in sent)
+        events = sorted(c[1]["event_type"] for c in mock_enqueue.call_args_list)
+        assert events == ["new_player", "player_removed", "status_change"]
+
+    def test_failed_rpc_sends_no_events(self, mock_config, sample_recruit):
+        """Should not enqueue anything when the transaction fails."""
+        mock_config.SYNC_VIA_RPC = True
+        mock_db = MagicMock()
+        mock_db.sync_via_rpc.side_effect = Exception("rpc failed")
+        batch = _batch_of(MagicMock())
+
+        with (
+            patch.object(sync_module, "config", mock_config),
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module, "EventBatch", return_value=batch),
+            pytest.raises(Exception, match="rpc failed"),
+        ):
+            sync_module.sync_table("recruits", [sample_recruit], team_id="Auburn Tigers")
+
+        batch.flush.assert_not_called()
+
+    def test_async_variant(self, mock_config, sample_recruit):
+        """Should use the async RPC on the async path."""
+        mock_config.SYNC_VIA_RPC = True
+        mock_db = MagicMock()
+        mock_db.async_sync_via_rpc = AsyncMock(return_value={"upserted": [], "deleted": []})
+
+        with (
+            patch.object(sync_module, "config", mock_config),
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(MagicMock())),
+        ):
+            result = asyncio.run(sync_module.async_sync_table("recruits", [sample_recruit], team_id="Auburn Tigers"))
+
+        assert result["upserted"] == 0
+        mock_db.async_sync_via_rpc.assert_awaited_once()
+
+
+class TestSyncTableOutbox:
+    """Tests for the OUTBOX_ENABLED path of sync_table."""
+
+    def test_writes_changes_and_events_in_one_call(self, mock_config, sample_recruit):
+        """Should hand upserts, deletes and outbox events to apply_sync without touching Redis."""
+        mock_config.OUTBOX_ENABLED = True
+        stale = {**sample_recruit, "entry_id": "old-id"}
+        new = {**sample_recruit, "entry_id": "new-id"}
+        mock_db = MagicMock()
+        mock_db.get_all_records.return_value = [stale]
+        batch_cls = MagicMock()
+
+        with (
+            patch.object(sync_module, "config", mock_config),
+            patch.object(sync_module, "db", mock_db),
+            patch.object(sync_module, "EventBatch", batch_cls),
+            patch.object(sync_module, "outbox_events", return_value=[{"event_key": "k", "payload": {}}]),
+        ):
+            result = sync_module.sync_table("recruits", [new], team_id="Auburn Tigers")
+
+        assert result["upserted"] == 1
+        assert result["deleted"] == 1
+        mock_db.apply_sync.assert_called_once_with(
+            "recruits", [new], ["old-id"], [{"event_key": "k", "payload": {}}], "Auburn Tigers"
+        )
+        mock_db.upsert_records.assert_not_called()
+        mock_db.delete_records.assert_not_called()
+        batch_cls.return_value.flush.assert_not_called()
+
+    def test_no_changes_no_write(self, mock_config, sample_recruit):
+        """Should not call apply_sync when nothing changed."""
+        mock_config.OUTBOX_ENABLED = True
+        mock_db = MagicMock()
+        mock_db.get_all_records.return_value = [dict(sample_recruit)]
+
+        with (
+            patch.object(sync_module, "config", mock_config),
+            patch.object(sync_module, "db", mock_db),
+        ):
+            sync_module.sync_table("recruits", [dict(sample_recruit)], team_id="Auburn Tigers")
 
-        with patch.object(sync_module, "enqueue_event", mock_enqueue):
-            # Should not raise
-            sync_module._enqueue_player_removed_event("recruits", sample_recruit)
+        mock_db.apply_sync.assert_not_called()
 
 
 class TestSyncTableIntegration:
@@ -215,7 +688,7 @@ class TestSyncTableIntegration:
 
         with (
             patch.object(sync_module, "db", mock_db),
-            patch.object(sync_module, "enqueue_event", mock_enqueue),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(mock_enqueue)),
         ):
             result = sync_module.sync_table("recruits", fresh_records)
 
@@ -224,7 +697,7 @@ class TestSyncTableIntegration:
 
         # Should delete 1 record
         assert result["deleted"] == 1
-        mock_db.delete_records.assert_called_once_with("recruits", ["delete"])
+        mock_db.delete_records.assert_called_once_with("recruits", ["delete"], team_id=None)
 
         # Should have 3 events: new_player, status_change, player_removed
         assert mock_enqueue.call_count == 3
@@ -248,7 +721,7 @@ class TestSyncTableIntegration:
 
         with (
             patch.object(sync_module, "db", mock_db),
-            patch.object(sync_module, "enqueue_event", mock_enqueue),
+            patch.object(sync_module, "EventBatch", return_value=_batch_of(mock_enqueue)),
         ):
             result = sync_module.sync_table("recruits", fresh_records)
 
@@ -0,0 +1,87 @@
+"""Tests for the teams module - single and multi-team configuration."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from cfb_tracker import teams as teams_module
+from cfb_tracker.teams import Team
+
+
+class TestLoadTeams:
+    """Tests for load_teams function."""
+
+    def test_single_team_from_config(self, mock_config):
+        """Should fall back to TEAM / TEAM_247_NAME / TEAM_247_YEAR."""
+        mock_config.TEAMS = None
+        mock_config.TEAMS_FILE = None
+
+        with patch.object(teams_module, "config", mock_config):
+            result = teams_module.load_teams()
+
+        assert result == [Team(team_id="Test Tigers", name_247="test", year=2026)]
+
+    def test_returns_empty_when_nothing_configured(self, mock_config):
+        """Should return no teams when neither TEAMS nor TEAM is set."""
+        mock_config.TEAMS = None
+        mock_config.TEAMS_FILE = None
+        mock_config.TEAM = None
+
+        with patch.object(teams_module, "config", mock_config):
+            assert teams_module.load_teams() == []
+
+    def test_teams_from_env_json(self, mock_config):
+        """Should parse TEAMS and default missing years to TEAM_247_YEAR."""
+        mock_config.TEAMS_FILE = None
+        mock_config.TEAMS = json.dumps([
+            {"team": "Auburn Tigers", "team_247_name": "auburn", "team_247_year": 2027},
+            {"team": "LSU Tigers", "team_247_name": "lsu"},
+        ])
+
+        with patch.object(teams_module, "config", mock_config):
+            result = teams_module.load_teams()
+
+        assert result == [
+            Team(team_id="Auburn Tigers", name_247="auburn", year=2027),
+            Team(team_id="LSU Tigers", name_247="lsu", year=2026),
+        ]
+
+    def test_teams_file_takes_precedence(self, mock_config, tmp_path):
+        """Should read TEAMS_FILE before TEAMS."""
+        teams_file = tmp_path / "teams.json"
+        teams_file.write_text(json.dumps([{"team": "Auburn Tigers", "team_247_name": "auburn"}]))
+        mock_config.TEAMS_FILE = str(teams_file)
+        mock_config.TEAMS = json.dumps([{"team": "LSU Tigers", "team_247_name": "lsu"}])
+
+        with patch.object(teams_module, "config", mock_config):
+            result = teams_module.load_teams()
+
+        assert [t.team_id for t in result] == ["Auburn Tigers"]
+
+    def test_rejects_incomplete_entry(self, mock_config):
+        """Should raise ValueError when an entry lacks team_247_name."""
+        mock_config.TEAMS_FILE = None
+        mock_config.TEAMS = json.dumps([{"team": "Auburn Tigers"}])
+
+        with patch.object(teams_module, "config", mock_config), pytest.raises(ValueError, match="team_247_name"):
+            teams_module.load_teams()
+
+    def test_rejects_non_object_entry(self, mock_config):
+        """Should raise ValueError, not AttributeError, for an entry that is not an object."""
+        mock_config.TEAMS_FILE = None
+        mock_config.TEAMS = json.dumps(["auburn"])
+
+        with patch.object(teams_module, "config", mock_config), pytest.raises(ValueError, match="JSON object"):
+            teams_module.load_teams()
+
+    def test_rejects_duplicate_teams(self, mock_config):
+        """Should raise ValueError when the same team is listed twice."""
+        mock_config.TEAMS_FILE = None
+        mock_config.TEAMS = json.dumps([
+            {"team": "Auburn Tigers", "team_247_name": "auburn"},
+            {"team": "Auburn Tigers", "team_247_name": "auburn"},
+        ])
+
+        with patch.object(teams_module, "config", mock_config), pytest.raises(ValueError, match="Duplicate"):
+            teams_module.load_teams()
@@ -95,6 +95,73 @@ class TestInitTwitter:
 
         assert result is False
 
+    def test_init_attaches_pooled_session(self, mock_config):
+        """Should give the client one keep-alive session and close any earlier one."""
+        mock_config.X_API_KEY = "api_key"
+        mock_config.X_API_SECRET = "api_secret"  # noqa: S105
+        mock_config.X_ACCESS_TOKEN = "access_token"  # noqa: S105
+        mock_config.X_ACCESS_TOKEN_SECRET = "access_token_secret"  # noqa: S105
+
+        from cfb_tracker import twitter as twitter_module
+
+        old_session = MagicMock()
+        with (
+            patch.object(twitter_module, "config", mock_config),
+            patch.object(twitter_module, "tweepy") as mock_tweepy,
+            patch.object(twitter_module, "_session", old_session),
+        ):
+            twitter_module.init_twitter()
+            session = twitter_module._session
+
+        old_session.close.assert_called_once()
+        assert mock_tweepy.Client.return_value.session is session
+        assert isinstance(session.get_adapter("https://api.x.com/2/tweets"), twitter_module._TimeoutHTTPAdapter)
+
+
+class TestBuildSession:
+    """Tests for the pooled X HTTP session."""
+
+    def test_pool_timeouts_and_retries(self, mock_config):
+        """Should size the pool and apply configured timeouts and connect retries."""
+        from cfb_tracker import twitter as twitter_module
+
+        mock_config.X_HTTP_POOL_SIZE = 8
+        with patch.object(twitter_module, "config", mock_config):
+            adapter = twitter_module._build_session().get_adapter("https://api.x.com/2/tweets")
+
+        assert adapter._pool_maxsize == 8
+        assert adapter.timeout == (5, 30)
+        assert adapter.max_retries.connect == 2
+        assert adapter.max_retries.status == 0
+
+    def test_default_timeout_applied(self, mock_config):
+        """Should add the default timeout to requests sent without one."""
+        from requests.adapters import HTTPAdapter
+
+        from cfb_tracker import twitter as twitter_module
+
+        adapter = twitter_module._TimeoutHTTPAdapter(timeout=(5, 30))
+        with patch.object(HTTPAdapter, "send") as mock_send:
+            adapter.send(MagicMock())
+            adapter.send(MagicMock(), timeout=1)
+
+        assert mock_send.call_args_list[0][1]["timeout"] == (5, 30)
+        assert mock_send.call_args_list[1][1]["timeout"] == 1
+
+    def test_retries_reset_but_not_read_timeout(self, mock_config):
+        """Should re-send a POST after a connection reset but never after a read timeout."""
+        from urllib3.exceptions import MaxRetryError, ProtocolError, ReadTimeoutError
+
+        from cfb_tracker import twitter as twitter_module
+
+        with patch.object(twitter_module, "config", mock_config):
+            retry = twitter_module._build_session().get_adapter("https://api.x.com").max_retries
+
+        reset = ProtocolError("Connection aborted.", ConnectionResetError())
+        assert retry.increment("POST", "/2/tweets", error=reset).read == 1
+        with pytest.raises(MaxRetryError):
+            retry.increment("POST", "/2/tweets", error=ReadTimeoutError(None, "/2/tweets", "timed out"))
+
 
 class TestPostTweet:
     """Tests for post_tweet function."""
@@ -159,3 +226,133 @@ class TestIsEnabled:
         twitter_module._twitter_enabled = True
 
         assert twitter_module.is_enabled() is True
+
+
+@pytest.fixture
+def limiter(mock_config):
+    """Twitter module with mock config and a mock Redis for the rate limiter."""
+    from cfb_tracker import twitter as twitter_module
+
+    redis = MagicMock()
+    redis.eval.return_value = 0
+    with patch.object(twitter_module, "config", mock_config):
+        twitter_module._redis, twitter_module._redis_checked = redis, True
+        twitter_module._twitter_enabled = True
+        twitter_module._client = MagicMock()
+        yield twitter_module, redis
+    twitter_module._redis, twitter_module._redis_checked = None, False
+
+
+class TestAcquirePostSlot:
+    """Tests for acquire_post_slot function."""
+
+    def test_takes_slot_from_both_windows(self, limiter):
+        """Should run the bucket script over the 15-minute and 24-hour windows."""
+        twitter_module, redis = limiter
+
+        assert twitter_module.acquire_post_slot() == 0.0
+
+        args = redis.eval.call_args[0]
+        assert args[1:4] == (2, "cfb_tracker:x-rate-limit:15m", "cfb_tracker:x-rate-limit:24h")
+        assert args[4:] == (100, 900_000, 17, 86_400_000)
+
+    def test_returns_seconds_until_slot(self, limiter):
+        """Should convert the script's wait to seconds."""
+        twitter_module, redis = limiter
+        redis.eval.return_value = 1500
+
+        assert twitter_module.acquire_post_slot() == 1.5
+
+    def test_skips_disabled_windows(self, limiter, mock_config):
+        """Should leave out windows configured as 0."""
+        twitter_module, redis = limiter
+        mock_config.X_POSTS_PER_24_HOURS = 0
+
+        twitter_module.acquire_post_slot()
+
+        assert redis.eval.call_args[0][1:3] == (1, "cfb_tracker:x-rate-limit:15m")
+
+    def test_fails_open_without_redis(self, limiter):
+        """Should allow posting when the limiter cannot reach Redis."""
+        twitter_module, redis = limiter
+        redis.eval.side_effect = Exception("Connection refused")
+
+        assert twitter_module.acquire_post_slot() == 0.0
+
+
+class TestResyncRateLimits:
+    """Tests for resync_rate_limits function."""
+
+    def test_blocks_exhausted_window_until_reset(self, limiter):
+        """Should push X's remaining quota and reset into the buckets."""
+        twitter_module, redis = limiter
+        headers = {
+            "x-rate-limit-remaining": "0",
+            "x-rate-limit-reset": "1000120",
+            "x-user-limit-24hour-remaining": "5",
+            "x-user-limit-24hour-reset": "1050000",
+            "x-app-limit-24hour-remaining": "40",
+            "x-app-limit-24hour-reset": "1060000",
+        }
+
+        with patch.object(twitter_module.time, "time", return_value=1_000_000):
+            retry_after = twitter_module.resync_rate_limits(headers)
+
+        assert retry_after == 120
+        args = redis.eval.call_args[0]
+        assert args[1:4] == (2, "cfb_tracker:x-rate-limit:15m", "cfb_tracker:x-rate-limit:24h")
+        # The tighter user quota binds the 24-hour window
+        assert args[4:] == (0, 1_000_120_000, 900_000, 5, 1_050_000_000, 86_400_000)
+
+    def test_default_retry_without_headers(self, limiter):
+        """Should fall back to DEFAULT_RETRY_SECONDS when X sends no limits."""
+        twitter_module, redis = limiter
+
+        assert twitter_module.resync_rate_limits({}) == twitter_module.DEFAULT_RETRY_SECONDS
+        redis.eval.assert_not_called()
+
+
+class TestPostTweetRateLimited:
+    """Tests for post_tweet under the rate limiter."""
+
+    def test_waits_for_short_delay(self, limiter):
+        """Should sleep and post when a slot opens within the max wait."""
+        twitter_module, _ = limiter
+        twitter_module._client.create_tweet.return_value.data = {"id": "1"}
+
+        with (
+            patch.object(twitter_module, "acquire_post_slot", side_effect=[2.0, 0.0]),
+            patch.object(twitter_module.time, "sleep") as mock_sleep,
+        ):
+            result = twitter_module.post_tweet("Test message")
+
+        mock_sleep.assert_called_once_with(2.0)
+        assert result == {"id": "1"}
+
+    def test_raises_for_long_delay(self, limiter):
+        """Should raise RateLimitedError without calling X when no slot is near."""
+        twitter_module, _ = limiter
+
+        with (
+            patch.object(twitter_module, "acquire_post_slot", return_value=600.0),
+            pytest.raises(twitter_module.RateLimitedError) as exc_info,
+        ):
+            twitter_module.post_tweet("Test message")
+
+        assert exc_info.value.retry_after == 600.0
+        twitter_module._client.create_tweet.assert_not_called()
+
+    def test_429_resyncs_and_raises(self, limiter):
+        """Should resync from the 429's headers and report when to retry."""
+        twitter_module, _ = limiter
+        response = MagicMock(headers={"x-rate-limit-remaining": "0"})
+        twitter_module._client.create_tweet.side_effect = twitter_module.tweepy.TooManyRequests(response)
+
+        with (
+            patch.object(twitter_module, "resync_rate_limits", return_value=300.0) as mock_resync,
+            pytest.raises(twitter_module.RateLimitedError) as exc_info,
+        ):
+            twitter_module.post_tweet("Test message")
+
+        mock_resync.assert_called_once_with(response.headers)
+        assert exc_info.value.retry_after == 300.0
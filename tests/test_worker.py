@@ -1,11 +1,19 @@
 """Tests for the worker module - social media message generation."""
 
+from datetime import datetime, timezone
+from unittest.mock import call, patch
+
+import pytest
+
+from cfb_tracker import worker as worker_module
+from cfb_tracker.twitter import RateLimitedError
 from cfb_tracker.worker import (
     EMOJI_COMMITTED,
     EMOJI_DECOMMITTED,
     EMOJI_PORTAL_ENTER,
     EMOJI_PORTAL_WITHDRAW,
     EMOJI_SIGNED,
+    EMOJI_UPDATED,
     _build_message,
     _format_stars,
     _format_url_line,
@@ -308,6 +316,62 @@ class TestBuildMessagePortalIncoming:
         assert "https://example.com" in result
 
 
+class TestBuildMessagePlayerUpdated:
+    """Tests for player_updated messages."""
+
+    def test_recruit_changes(self):
+        player = {
+            "name": "John Smith",
+            "position": "QB",
+            "stars": 5,
+            "player_url": "https://247sports.com/player/john-smith",
+        }
+        data = {"changes": {"stars": {"old": 4, "new": 5}, "rating": {"old": 0.91, "new": 0.95}}}
+
+        result = _build_message("player_updated", "recruits", "Auburn Tigers", player, {**data, "status": "committed"})
+
+        assert result == (
+            f"{EMOJI_UPDATED}\nAuburn Tigers recruit update: QB John Smith - "
+            "stars: 4 \u2192 5, rating: 0.91 \u2192 0.95"
+            "\n\nhttps://247sports.com/player/john-smith"
+        )
+
+    def test_portal_cleared_field(self):
+        player = {"name": "Jane Doe", "position": "WR", "direction": "incoming", "source_school": None}
+        data = {"changes": {"source_school": {"old": "Georgia", "new": None}}}
+
+        result = _build_message("player_updated", "portal", "Auburn Tigers", player, data)
+
+        assert result == (
+            f"{EMOJI_UPDATED}\nAuburn Tigers portal update: WR Jane Doe - source_school: Georgia \u2192 none"
+        )
+
+    def test_posted_by_process_social_post(self):
+        """Should post the changes rather than the generic fallback."""
+        payload = {
+            "event_type": "player_updated",
+            "table": "recruits",
+            "team": "Auburn Tigers",
+            "player": {"name": "John Smith", "position": "QB", "stars": 5},
+            "changes": {"stars": {"old": 4, "new": 5}},
+        }
+
+        with patch.object(worker_module, "post_tweet", return_value={"id": "1"}) as post:
+            result = worker_module.process_social_post(payload)
+
+        post.assert_called_once_with(
+            f"{EMOJI_UPDATED}\nAuburn Tigers recruit update: QB John Smith - stars: 4 \u2192 5"
+        )
+        assert result["success"] is True
+
+    def test_without_changes_falls_back(self):
+        player = {"name": "John Smith", "position": "QB"}
+
+        result = _build_message("player_updated", "recruits", "Auburn Tigers", player, {"changes": {}})
+
+        assert result == "Player update: John Smith (QB) - Auburn Tigers"
+
+
 class TestBuildMessageFallback:
     """Tests for fallback message handling."""
 
@@ -351,3 +415,132 @@ class TestEmojiConstants:
 
     def test_portal_withdraw_emoji(self):
         assert EMOJI_PORTAL_WITHDRAW == "\u21a9\ufe0f"  # ↩️
+
+    def test_updated_emoji(self):
+        assert EMOJI_UPDATED == "\U0001f504"  # 🔄
+
+
+PAYLOAD = {
+    "event_type": "new_player",
+    "table": "recruits",
+    "team": "Auburn Tigers",
+    "status": "committed",
+    "player": {"name": "John Smith", "position": "QB", "stars": 4},
+}
+
+
+class TestProcessSocialPostRateLimited:
+    """Tests for process_social_post when X's write limit is reached."""
+
+    def test_reschedules_for_next_slot(self):
+        """Should re-enqueue the job for when a slot opens instead of failing."""
+        with (
+            patch.object(worker_module, "post_tweet", side_effect=RateLimitedError(120)),
+            patch.object(worker_module, "reschedule_current_job", return_value="job-2") as mock_reschedule,
+        ):
+            result = worker_module.process_social_post(PAYLOAD)
+
+        payload, retry_at = mock_reschedule.call_args[0]
+        assert payload == PAYLOAD
+        assert 100 < (retry_at - datetime.now(timezone.utc)).total_seconds() <= 120
+        assert result["success"] is False
+        assert result["rescheduled_at"] == retry_at.isoformat()
+
+    def test_raises_outside_rq(self):
+        """Should propagate the error when the job cannot be rescheduled."""
+        with (
+            patch.object(worker_module, "post_tweet", side_effect=RateLimitedError(120)),
+            patch.object(worker_module, "reschedule_current_job", return_value=None),
+            pytest.raises(RateLimitedError),
+        ):
+            worker_module.process_social_post(PAYLOAD)
+
+
+class TestProcessDigest:
+    """Tests for posting coalesced digests."""
+
+    EVENTS = (
+        {"event_type": "new_player", "table": "recruits", "status": "committed", "player": {"name": "A", "stars": 4}},
+        {"event_type": "player_removed", "table": "portal", "player": {"name": "B", "direction": "outgoing"}},
+    )
+
+    def test_posts_thread(self):
+        """Should post the digest, replying to the previous post for each part."""
+        digest = {"event_type": "digest", "team": "Auburn Tigers", "events": list(self.EVENTS)}
+
+        with (
+            patch.object(worker_module, "DIGEST_MAX_CHARS", 60),
+            patch.object(worker_module, "post_tweet", side_effect=[{"id": "1"}, {"id": "2"}, {"id": "3"}]) as post,
+        ):
+            result = worker_module.process_social_post(digest)
+
+        assert result["success"] is True
+        assert post.call_args_list[0][0][0].startswith("Auburn Tigers update (2)")
+        assert [c[1]["reply_to"] for c in post.call_args_list] == [None, *result["tweet_ids"][:-1]]
+        assert "has committed to the Auburn Tigers" in result["message"]
+
+    def test_lists_field_updates(self):
+        """Should show a player_updated event's changes on its digest line."""
+        update = {
+            "event_type": "player_updated",
+            "table": "recruits",
+            "status": "committed",
+            "player": {"name": "C", "position": "QB", "player_url": "https://247sports.com/player/c"},
+            "changes": {"stars": {"old": 3, "new": 4}},
+        }
+        digest = {"event_type": "digest", "team": "Auburn Tigers", "events": [*self.EVENTS, update]}
+
+        with patch.object(worker_module, "post_tweet", return_value={"id": "1"}):
+            result = worker_module.process_social_post(digest)
+
+        lines = result["message"].split("\n")
+        assert f"{EMOJI_UPDATED} Auburn Tigers recruit update: QB C - stars: 3 \u2192 4" in lines
+        assert "https://" not in result["message"]
+
+    def test_reschedules_rest_of_thread(self):
+        """Should reschedule the unsent parts, replying to the last posted tweet."""
+        digest = {"event_type": "digest", "team": "Auburn Tigers", "events": list(self.EVENTS), "parts": ["p1", "p2"]}
+
+        with (
+            patch.object(worker_module, "post_tweet", side_effect=[{"id": "1"}, RateLimitedError(60)]),
+            patch.object(worker_module, "reschedule_current_job", return_value="job-2") as mock_reschedule,
+        ):
+            result = worker_module.process_social_post(digest)
+
+        rescheduled = mock_reschedule.call_args[0][0]
+        assert rescheduled["parts"] == ["p2"]
+        assert rescheduled["reply_to"] == "1"
+        assert result["success"] is False
+
+
+class TestRunWorker:
+    """Tests for the non-forking worker entry point."""
+
+    def test_runs_simple_worker_on_priority_queues(self, mock_config):
+        """Should listen on every lane in priority order, in-process, with the scheduler."""
+        with (
+            patch.object(worker_module, "config", mock_config),
+            patch.object(worker_module, "Redis") as mock_redis_cls,
+            patch.object(worker_module, "Queue") as mock_queue_cls,
+            patch.object(worker_module, "SimpleWorker") as mock_worker_cls,
+        ):
+            mock_worker_cls.return_value.work.return_value = True
+
+            assert worker_module.run_worker(burst=True) is True
+
+        connection = mock_redis_cls.from_url.return_value
+        mock_redis_cls.from_url.assert_called_once_with(mock_config.REDIS_URL)
+        assert mock_queue_cls.call_args_list == [
+            call("social-posts-high", connection=connection),
+            call("social-posts", connection=connection),
+            call("social-posts-low", connection=connection),
+        ]
+        mock_worker_cls.assert_called_once_with([mock_queue_cls.return_value] * 3, connection=connection)
+        mock_worker_cls.return_value.work.assert_called_once_with(with_scheduler=True, burst=True)
+
+    def test_requires_redis_url(self, mock_config):
+        """Should exit when REDIS_URL is not configured."""
+        mock_config.REDIS_URL = None
+
+        with patch.object(worker_module, "config", mock_config), pytest.raises(SystemExit):
+            worker_module.run_worker()